@@ -13,13 +13,26 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.core.config import settings  # noqa: E402
 from app.db.database import Base  # noqa: E402
 from app.db import models  # noqa: F401,E402
+from app.services.search import search_table_names  # noqa: E402
 
 target_metadata = Base.metadata
 
+# El índice de búsqueda (FTS5 / tsvector) se crea con SQL propio en su
+# revisión: autogenerate no debe proponer borrarlo
+SEARCH_TABLES = search_table_names()
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table":
+        return name not in SEARCH_TABLES
+    table = getattr(obj, "table", None)
+    return table is None or table.name not in SEARCH_TABLES
+
 # Override URL from environment if provided
-DB_URL = os.getenv("DB_URL", "sqlite:///./app.db")
+DB_URL = settings.db_url
 config.set_main_option("sqlalchemy.url", DB_URL)
 
 
@@ -32,6 +45,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -51,6 +65,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,34 @@
+"""query indexes
+
+Revision ID: b3e1f0a7c2d4
+Revises: 6cc9dca5ac95
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b3e1f0a7c2d4'
+down_revision = '6cc9dca5ac95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_pets_owner_id', 'pets', ['owner_id'])
+    op.create_index('ix_clinical_records_pet_visit', 'clinical_records', ['pet_id', 'visit_date'])
+    op.create_index('ix_appointments_date', 'appointments', ['appointment_date'])
+    op.create_index('ix_appointments_status_date', 'appointments', ['status', 'appointment_date'])
+    op.create_index('ix_appointments_pet_date', 'appointments', ['pet_id', 'appointment_date'])
+    op.create_index('ix_vaccinations_due_date', 'vaccinations', ['due_date'])
+    op.create_index('ix_vaccinations_pet_due', 'vaccinations', ['pet_id', 'due_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vaccinations_pet_due', table_name='vaccinations')
+    op.drop_index('ix_vaccinations_due_date', table_name='vaccinations')
+    op.drop_index('ix_appointments_pet_date', table_name='appointments')
+    op.drop_index('ix_appointments_status_date', table_name='appointments')
+    op.drop_index('ix_appointments_date', table_name='appointments')
+    op.drop_index('ix_clinical_records_pet_visit', table_name='clinical_records')
+    op.drop_index('ix_pets_owner_id', table_name='pets')
@@ -0,0 +1,36 @@
+"""appointment daily stats
+
+Revision ID: c7d2a9e4b1f3
+Revises: b3e1f0a7c2d4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2a9e4b1f3'
+down_revision = 'b3e1f0a7c2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'appointment_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'status'),
+    )
+    # Backfill desde los turnos existentes
+    op.execute(
+        "INSERT INTO appointment_daily_stats (day, status, total) "
+        "SELECT date(appointment_date), COALESCE(status, 'scheduled'), COUNT(*) "
+        "FROM appointments "
+        "GROUP BY date(appointment_date), COALESCE(status, 'scheduled')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('appointment_daily_stats')
@@ -0,0 +1,35 @@
+"""full-text search index
+
+Revision ID: e4a8c1d5f2b7
+Revises: c7d2a9e4b1f3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+from app.services.search import INDEXES, index_ddl, rebuild_search_index, search_supported
+
+# revision identifiers, used by Alembic.
+revision = 'e4a8c1d5f2b7'
+down_revision = 'c7d2a9e4b1f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tablas FTS5 (SQLite) o tsvector + GIN (Postgres): no van en la metadata
+    bind = op.get_bind()
+    if not search_supported(bind.dialect.name):
+        # Otros motores: las búsquedas usan ILIKE, no hay tablas que crear
+        return
+    for index in INDEXES.values():
+        for statement in index_ddl(index, bind.dialect.name):
+            op.execute(text(statement))
+    # Backfill desde dueños, mascotas y récords existentes
+    rebuild_search_index(bind)
+
+
+def downgrade() -> None:
+    for index in INDEXES.values():
+        op.execute(f"DROP TABLE IF EXISTS {index.table}")
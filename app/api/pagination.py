@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+# Paginación por keyset (cursor): cada página se pide "después de" (o "antes
+# de") la última fila vista según (clave de orden, id). A diferencia de
+# OFFSET, el costo no crece con la profundidad de la página y usa el índice.
+# El parámetro `page` (OFFSET) se sigue aceptando, marcado como obsoleto: las
+# respuestas incluyen los cursores para pasar a la paginación por cursor.
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+    # True si se pidió con el parámetro obsoleto `page` (OFFSET)
+    offset: bool = False
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _load(value: Any, column: ColumnElement) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(direction: str, sort_value: Any, row_id: int) -> str:
+    raw = json.dumps([direction, _dump(sort_value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_col: ColumnElement):
+    """Devuelve (direction, sort_value, id); 400 si el cursor no es válido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return direction, _load(sort_value, sort_col), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Cursor inválido") from e
+
+
+def _boundary(row: Any, direction: str, sort_col: ColumnElement, id_col: ColumnElement) -> str:
+    return encode_cursor(direction, getattr(row, sort_col.key), getattr(row, id_col.key))
+
+
+def _offset_page(
+    query: Query,
+    sort_col: ColumnElement,
+    id_col: ColumnElement,
+    page_size: int,
+    page: int,
+    descending: bool,
+) -> Page:
+    """Página `page` por OFFSET (parámetro obsoleto), con el mismo orden que el cursor."""
+    if descending:
+        query = query.order_by(sort_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(sort_col.asc(), id_col.asc())
+    rows = query.offset((page - 1) * page_size).limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_more:
+            next_cursor = _boundary(rows[-1], "next", sort_col, id_col)
+        if page > 1:
+            prev_cursor = _boundary(rows[0], "prev", sort_col, id_col)
+    return Page(items=rows, next_cursor=next_cursor, prev_cursor=prev_cursor, offset=True)
+
+
+def keyset_page(
+    query: Query,
+    sort_col: ColumnElement,
+    id_col: ColumnElement,
+    page_size: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    page: Optional[int] = None,
+) -> Page:
+    """
+    Una página de `query` ordenada por (sort_col, id_col). Se pide una fila
+    de más para saber si hay página siguiente sin hacer COUNT.
+    `sort_col` no debe ser NULL (los NULL no entran en la comparación).
+    `page` es el número de página por OFFSET (obsoleto); 400 si viene junto
+    con `cursor`.
+    """
+    if page is not None:
+        if cursor:
+            raise HTTPException(
+                status_code=400, detail="Usar cursor o page (obsoleto), no ambos"
+            )
+        return _offset_page(query, sort_col, id_col, page_size, page, descending)
+
+    direction, sort_value, row_id = ("next", None, None)
+    if cursor:
+        direction, sort_value, row_id = decode_cursor(cursor, sort_col)
+
+    # Para "prev" se recorre en el orden inverso y luego se da vuelta
+    forward = direction == "next"
+    ascending = forward != descending
+    if row_id is not None:
+        if ascending:
+            after = or_(sort_col > sort_value, and_(sort_col == sort_value, id_col > row_id))
+        else:
+            after = or_(sort_col < sort_value, and_(sort_col == sort_value, id_col < row_id))
+        query = query.filter(after)
+    if ascending:
+        query = query.order_by(sort_col.asc(), id_col.asc())
+    else:
+        query = query.order_by(sort_col.desc(), id_col.desc())
+
+    rows = query.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+
+    # Hacia adelante, "hay más" indica página siguiente y el cursor indica que
+    # hay anterior; hacia atrás es al revés
+    has_next = has_more if forward else cursor is not None
+    has_prev = cursor is not None if forward else has_more
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_next:
+            next_cursor = _boundary(rows[-1], "next", sort_col, id_col)
+        if has_prev:
+            prev_cursor = _boundary(rows[0], "prev", sort_col, id_col)
+    return Page(items=rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+def set_page_headers(
+    request: Request,
+    response: Response,
+    page: Page,
+    total_estimate: Optional[int] = None,
+) -> None:
+    """
+    Expone los cursores sin cambiar el cuerpo (sigue siendo una lista):
+    Link (rel="next"/"prev"), X-Next-Cursor, X-Prev-Cursor y, si se pidió,
+    X-Total-Estimate. Con `page` (OFFSET) agrega `Deprecation: true` y los
+    enlaces ya no llevan `page`.
+    """
+    links = []
+    base_url = request.url.remove_query_params("page")
+    for rel, cursor in (("next", page.next_cursor), ("prev", page.prev_cursor)):
+        if cursor:
+            url = base_url.include_query_params(cursor=cursor)
+            links.append(f'<{url}>; rel="{rel}"')
+            response.headers[f"X-{rel.capitalize()}-Cursor"] = cursor
+    if links:
+        response.headers["Link"] = ", ".join(links)
+    if total_estimate is not None:
+        response.headers["X-Total-Estimate"] = str(total_estimate)
+    if page.offset:
+        response.headers["Deprecation"] = "true"
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Set
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # opcional: sin brotli se negocia gzip o identidad
+    brotli = None
+
+# Respuestas constantes (páginas de inicio de cada panel) renderizadas una vez
+# y guardadas ya comprimidas. Cada request solo negocia la codificación,
+# compara el ETag y devuelve bytes prearmados (o un 304 sin cuerpo).
+
+# Preferencia del servidor cuando el cliente acepta varias codificaciones
+_PREFERENCE = ("br", "gzip", "identity")
+HTML_MEDIA_TYPE = "text/html; charset=utf-8"
+
+
+@dataclass(frozen=True)
+class Rendered:
+    digest: str
+    bodies: Dict[str, bytes]
+
+    def etag(self, encoding: str) -> str:
+        # ETag fuerte distinto por representación (RFC 9110 §8.8.3)
+        if encoding == "identity":
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+
+def precompress(body: bytes) -> Rendered:
+    """Hash del contenido más las variantes gzip/brotli (nivel máximo, una vez)."""
+    bodies = {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        bodies["br"] = brotli.compress(body, quality=11)
+    return Rendered(hashlib.sha256(body).hexdigest()[:32], bodies)
+
+
+def accepted_encodings(header: str) -> Set[str]:
+    """Codificaciones de Accept-Encoding con q > 0 (`*` incluye br y gzip)."""
+    accepted: Set[str] = {"identity"}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        names = {"br", "gzip"} if name == "*" else {name}
+        if q > 0:
+            accepted |= names
+        else:
+            accepted -= names
+    return accepted
+
+
+def pick_encoding(request: Request, rendered: Rendered) -> str:
+    accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+    for encoding in _PREFERENCE:
+        if encoding in accepted and encoding in rendered.bodies:
+            return encoding
+    return "identity"
+
+
+def not_modified(request: Request, digest: str) -> bool:
+    """If-None-Match contra el contenido actual (cualquier codificación)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"').split("-", 1)[0] == digest:
+            return True
+    return False
+
+
+def send(
+    request: Request,
+    rendered: Rendered,
+    media_type: str = HTML_MEDIA_TYPE,
+    cache_control: Optional[str] = None,
+) -> Response:
+    """Respuesta 200 con la variante negociada, o 304 si el ETag coincide."""
+    encoding = pick_encoding(request, rendered)
+    headers = {
+        "ETag": rendered.etag(encoding),
+        "Cache-Control": cache_control
+        or f"public, max-age={settings.landing_max_age_s}",
+        "Vary": "Accept-Encoding",
+    }
+    if not_modified(request, rendered.digest):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(rendered.bodies[encoding], media_type=media_type, headers=headers)
+
+
+class PrecompressedPage:
+    """
+    Página cuyo HTML no depende del request. `build` se llama una vez (y de
+    nuevo solo si cambia `key`, p.ej. la fecha del día para las páginas que
+    la muestran).
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], str],
+        key: Callable[[], Hashable] = lambda: None,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        self.build = build
+        self.key = key
+        self.cache_control = cache_control
+        self._cached: Optional[tuple] = None
+        self._lock = threading.Lock()
+        PAGES.append(self)
+
+    def get(self) -> Rendered:
+        key = self.key()
+        cached = self._cached
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with self._lock:
+            cached = self._cached
+            if cached is None or cached[0] != key:
+                cached = (key, precompress(self.build().encode("utf-8")))
+                self._cached = cached
+        return cached[1]
+
+    def response(self, request: Request) -> Response:
+        return send(request, self.get(), cache_control=self.cache_control)
+
+
+PAGES: List[PrecompressedPage] = []
+
+
+def warm_pages() -> int:
+    """Renderiza y comprime todas las páginas registradas (al arrancar)."""
+    for page in PAGES:
+        page.get()
+    return len(PAGES)
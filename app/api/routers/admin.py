@@ -1,53 +1,61 @@
-from fastapi import APIRouter, Depends
+import threading
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from sqlalchemy.orm import Session
-import os
-from pathlib import Path
+from markupsafe import Markup
+from sqlalchemy.orm import Session, joinedload
 
-from app.db.database import Base, engine, get_db
+from app.api.precompressed import PrecompressedPage
+from app.core.templates import render, render_to_string
+from app.db.database import get_db
 from app.db import models
+from app.db.reset_db import reset_db as reset_database
+from app.services.docs import docs_service
+from app.services.stats import stats_service
 
 router = APIRouter()
 
 
 @router.post("/__admin/reset-db")
 def reset_db(db: Session = Depends(get_db)):
+    bind = db.get_bind()
     try:
         # Cerrar conexiones de la sesión actual
         db.close()
     except Exception:
         pass
-    # Dropear y recrear tablas
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    # Dropear y recrear tablas e índice de búsqueda (si no, sobreviven
+    # documentos de filas borradas y los ids reusados heredan texto viejo)
+    reset_database(bind)
+    stats_service.invalidate()
     return {"status": "ok", "message": "database reset"}
 
 
 @router.get("/admin/db_counts", tags=["admin"])
 def db_counts(db: Session = Depends(get_db)):
-    owners = db.query(models.Owner).count()
-    pets = db.query(models.Pet).count()
-    appts = db.query(models.Appointment).count()
-    vaccs = db.query(models.Vaccination).count()
+    counts = stats_service.get(db)
     return {
-        "owners": owners,
-        "pets": pets,
-        "appointments": appts,
-        "vaccinations": vaccs,
+        "owners": counts["owners"],
+        "pets": counts["pets"],
+        "appointments": counts["appointments"],
+        "vaccinations": counts["vaccinations"],
     }
 
 
 @router.get("/admin/db_counts_form", response_class=HTMLResponse, tags=["admin"])
 def db_counts_form(db: Session = Depends(get_db)):
         """Página amigable que muestra totales del sistema."""
-        owners = db.query(models.Owner).count()
-        pets = db.query(models.Pet).count()
-        appts = db.query(models.Appointment).count()
-        appts_scheduled = db.query(models.Appointment).filter(models.Appointment.status == "scheduled").count()
-        appts_attended = db.query(models.Appointment).filter(models.Appointment.status == "attended").count()
-        appts_canceled = db.query(models.Appointment).filter(models.Appointment.status == "canceled").count()
-        vaccs = db.query(models.Vaccination).count()
-        records = db.query(models.ClinicalRecord).count()
+        # Todos los totales en una sola consulta (cacheada unos segundos)
+        counts = stats_service.get(db)
+        owners = counts["owners"]
+        pets = counts["pets"]
+        appts = counts["appointments"]
+        appts_scheduled = counts["appointments_by_status"]["scheduled"]
+        appts_attended = counts["appointments_by_status"]["attended"]
+        appts_canceled = counts["appointments_by_status"]["canceled"]
+        vaccs = counts["vaccinations"]
+        records = counts["records"]
 
         html = f"""
         <!doctype html>
@@ -370,534 +378,67 @@ def db_details(limit: int = 10, db: Session = Depends(get_db)):
                 db.query(models.Owner).order_by(models.Owner.id.desc()).limit(limit).all()
         )
         pets = (
-                db.query(models.Pet).order_by(models.Pet.id.desc()).limit(limit).all()
+                db.query(models.Pet)
+                .options(joinedload(models.Pet.owner))
+                .order_by(models.Pet.id.desc())
+                .limit(limit)
+                .all()
         )
         appts = (
                 db.query(models.Appointment)
+                .options(joinedload(models.Appointment.pet))
                 .order_by(models.Appointment.id.desc())
                 .limit(limit)
                 .all()
         )
         vaccs = (
                 db.query(models.Vaccination)
+                .options(joinedload(models.Vaccination.pet))
                 .order_by(models.Vaccination.id.desc())
                 .limit(limit)
                 .all()
         )
 
-        def safe(v):
-                return "" if v is None else str(v)
-        
-        def format_date(dt):
-                if dt is None:
-                        return ""
-                if hasattr(dt, 'strftime'):
-                        return dt.strftime('%d/%m/%Y %H:%M') if hasattr(dt, 'hour') else dt.strftime('%d/%m/%Y')
-                return str(dt)
-
-        # Generar filas de dueños
-        owners_rows = ""
-        for owner in owners:
-                owners_rows += f"""
-                <tr>
-                    <td><strong>#{owner.id}</strong></td>
-                    <td>{safe(owner.name)}</td>
-                    <td>{safe(owner.phone)}</td>
-                    <td>{safe(owner.email)}</td>
-                    <td style="text-align: center;">
-                        <a href="/owners/{owner.id}/view" target="_blank" class="btn-mini btn-view">👁️ Ver</a>
-                        <a href="/owners/{owner.id}/edit" target="_blank" class="btn-mini btn-edit">✏️ Editar</a>
-                        <a href="/owners/{owner.id}/delete" target="_blank" class="btn-mini btn-delete" onclick="return confirm('¿Estás seguro de eliminar este dueño? Se eliminarán también todas sus mascotas y turnos.')">🗑️ Eliminar</a>
-                    </td>
-                </tr>
-                """
-        
-        # Generar filas de mascotas
-        pets_rows = ""
-        species_emoji_map = {
-            'perro': '🐕',
-            'gato': '🐈',
-            'ave': '🦜',
-            'conejo': '🐰',
-            'hamster': '🐹',
-        }
-        for pet in pets:
-                species_emoji = species_emoji_map.get(safe(pet.species).lower(), '🐾')
-                owner_name = pet.owner.name if pet.owner else 'N/A'
-                pets_rows += f"""
-                <tr>
-                    <td><strong>#{pet.id}</strong></td>
-                    <td>{species_emoji} {safe(pet.name)}</td>
-                    <td>{safe(pet.species)}</td>
-                    <td>{safe(pet.breed)}</td>
-                    <td>{owner_name}</td>
-                    <td style="text-align: center;">
-                        <a href="/pets/{pet.id}/view" target="_blank" class="btn-mini btn-view">👁️ Ver</a>
-                        <a href="/pets/{pet.id}/edit" target="_blank" class="btn-mini btn-edit">✏️ Editar</a>
-                        <a href="/pets/{pet.id}/delete" target="_blank" class="btn-mini btn-delete" onclick="return confirm('¿Estás seguro de eliminar esta mascota? Se eliminarán también todos sus turnos y registros clínicos.')">🗑️ Eliminar</a>
-                    </td>
-                </tr>
-                """
-        
-        # Generar filas de turnos
-        appts_rows = ""
-        status_map = {
-            'scheduled': {'text': 'Programado', 'color': '#28a745', 'icon': '📅'},
-            'attended': {'text': 'Atendido', 'color': '#007bff', 'icon': '✅'},
-            'canceled': {'text': 'Cancelado', 'color': '#dc3545', 'icon': '❌'}
-        }
-        for apt in appts:
-                apt_status = str(apt.status) if apt.status else 'scheduled'  # type: ignore
-                status_info = status_map.get(apt_status, {'text': apt_status, 'color': '#6c757d', 'icon': '📋'})
-                pet_name = apt.pet.name if apt.pet else 'N/A'
-                
-                # Agregar botón de cancelar solo si el turno está programado
-                cancel_button = ""
-                if apt_status == 'scheduled':
-                    cancel_button = f'<a href="/appointments/{apt.id}/cancel-form" target="_blank" class="btn-mini btn-cancel" onclick="return confirm(\'¿Deseas cancelar este turno? Esta acción quedará registrada en el historial.\')">❌ Cancelar</a>'
-                
-                appts_rows += f"""
-                <tr>
-                    <td><strong>#{apt.id}</strong></td>
-                    <td>{format_date(apt.appointment_date)}</td>
-                    <td>{safe(apt.reason)}</td>
-                    <td>
-                        <span style="background: {status_info['color']}; color: white; padding: 0.3rem 0.7rem; border-radius: 20px; font-size: 0.85rem; font-weight: 600;">
-                            {status_info['icon']} {status_info['text']}
-                        </span>
-                    </td>
-                    <td>{pet_name}</td>
-                    <td style="text-align: center;">
-                        <a href="/appointments/{apt.id}/view" target="_blank" class="btn-mini btn-view">👁️ Ver</a>
-                        {cancel_button}
-                    </td>
-                </tr>
-                """
-        
-        # Generar filas de vacunaciones
-        vaccs_rows = ""
-        vacc_status_map = {
-            'due': {'text': 'Pendiente', 'color': '#ffc107', 'icon': '⏳'},
-            'done': {'text': 'Aplicada', 'color': '#28a745', 'icon': '✅'},
-            'overdue': {'text': 'Vencida', 'color': '#dc3545', 'icon': '⚠️'},
-            'upcoming': {'text': 'Próxima', 'color': '#17a2b8', 'icon': '📅'}
-        }
-        for vacc in vaccs:
-                pet_name = vacc.pet.name if vacc.pet else 'N/A'
-                vacc_status = str(vacc.status) if vacc.status else 'due'  # type: ignore
-                status_info = vacc_status_map.get(vacc_status, {'text': vacc_status, 'color': '#6c757d', 'icon': '💉'})
-                vaccs_rows += f"""
-                <tr>
-                    <td><strong>#{vacc.id}</strong></td>
-                    <td>💉 {safe(vacc.vaccine_name)}</td>
-                    <td>{format_date(vacc.applied_date)}</td>
-                    <td>{format_date(vacc.due_date)}</td>
-                    <td>
-                        <span style="background: {status_info['color']}; color: white; padding: 0.3rem 0.7rem; border-radius: 20px; font-size: 0.85rem; font-weight: 600;">
-                            {status_info['icon']} {status_info['text']}
-                        </span>
-                    </td>
-                    <td>{pet_name}</td>
-                </tr>
-                """
+        return render(
+                "admin/db_details.html",
+                limit=limit,
+                owners=owners,
+                pets=pets,
+                appts=appts,
+                vaccs=vaccs,
+                species_emoji=_SPECIES_EMOJI,
+                appt_status_map=_APPT_STATUS,
+                vacc_status_map=_VACC_STATUS,
+        )
 
-        html = f"""
-        <!doctype html>
-        <html lang="es">
-        <head>
-            <meta charset="utf-8" />
-            <meta name="viewport" content="width=device-width, initial-scale=1" />
-            <title>� Registros del Sistema - Veterinaria Inteligente</title>
-            <style>
-                * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-                    height: 100vh;
-                    overflow: hidden;
-                    display: flex;
-                    flex-direction: column;
-                }}
-                .container {{
-                    display: flex;
-                    flex-direction: column;
-                    height: 100vh;
-                }}
-                .header {{
-                    background: rgba(255,255,255,0.98);
-                    border-bottom: 3px solid #11998e;
-                    padding: 0.8rem 1.5rem;
-                    text-align: center;
-                    flex-shrink: 0;
-                }}
-                .header h1 {{
-                    margin: 0;
-                    font-size: 1.5rem;
-                    color: #333;
-                    font-weight: 700;
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 0.5rem;
-                }}
-                .header p {{
-                    margin: 0.3rem 0 0 0;
-                    font-size: 0.8rem;
-                    color: #666;
-                }}
-                .info-banner {{
-                    background: linear-gradient(135deg, #ffeaa7 0%, #fdcb6e 100%);
-                    border-bottom: 2px solid #f39c12;
-                    padding: 0.7rem 1.5rem;
-                    text-align: center;
-                    flex-shrink: 0;
-                }}
-                .info-banner p {{
-                    margin: 0;
-                    color: #333;
-                    font-size: 0.8rem;
-                    line-height: 1.4;
-                }}
-                .info-banner strong {{
-                    color: #d35400;
-                }}
-                .controls-bar {{
-                    background: rgba(255,255,255,0.95);
-                    border-bottom: 2px solid #11998e;
-                    padding: 0.6rem 1.5rem;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    gap: 0.8rem;
-                    flex-shrink: 0;
-                    flex-wrap: wrap;
-                }}
-                .controls-bar label {{
-                    font-weight: 600;
-                    color: #333;
-                    font-size: 0.85rem;
-                }}
-                .controls-bar input {{
-                    padding: 0.4rem 0.8rem;
-                    border: 2px solid #ddd;
-                    border-radius: 6px;
-                    font-size: 0.85rem;
-                    width: 80px;
-                }}
-                .controls-bar button {{
-                    padding: 0.5rem 1rem;
-                    background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    font-weight: 700;
-                    font-size: 0.8rem;
-                    cursor: pointer;
-                    transition: all 0.3s ease;
-                }}
-                .controls-bar button:hover {{
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(17, 153, 142, 0.4);
-                }}
-                .main-content {{
-                    flex: 1;
-                    overflow-y: auto;
-                    padding: 1rem 1.5rem 1rem;
-                    background: rgba(255,255,255,0.95);
-                }}
-                .content-wrapper {{
-                    max-width: 1600px;
-                    margin: 0 auto;
-                }}
-                .table-section {{
-                    margin-bottom: 1.5rem;
-                    background: #fff;
-                    border-radius: 10px;
-                    padding: 1rem;
-                    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-                    border: 2px solid #e0e0e0;
-                }}
-                .table-section h2 {{
-                    margin: 0 0 0.8rem 0;
-                    color: #333;
-                    font-size: 1rem;
-                    display: flex;
-                    align-items: center;
-                    gap: 0.5rem;
-                    border-bottom: 2px solid #11998e;
-                    padding-bottom: 0.5rem;
-                }}
-                .table-wrapper {{
-                    overflow-x: auto;
-                    max-height: 300px;
-                    overflow-y: auto;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    background: white;
-                    font-size: 0.75rem;
-                }}
-                thead {{
-                    background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-                    position: sticky;
-                    top: 0;
-                    z-index: 10;
-                }}
-                th {{
-                    color: white;
-                    padding: 0.6rem 0.8rem;
-                    text-align: left;
-                    font-weight: 600;
-                    text-transform: uppercase;
-                    font-size: 0.7rem;
-                    letter-spacing: 0.5px;
-                    white-space: nowrap;
-                }}
-                td {{
-                    padding: 0.6rem 0.8rem;
-                    border-bottom: 1px solid #e5e7eb;
-                    font-size: 0.75rem;
-                    white-space: nowrap;
-                }}
-                tbody tr:hover {{
-                    background: #f0fdf4;
-                    transition: background 0.2s ease;
-                }}
-                .btn-mini {{
-                    display: inline-block;
-                    padding: 0.3rem 0.6rem;
-                    border-radius: 5px;
-                    text-decoration: none;
-                    font-size: 0.7rem;
-                    font-weight: 600;
-                    transition: all 0.2s ease;
-                    margin: 0 0.1rem;
-                    white-space: nowrap;
-                }}
-                .btn-view {{
-                    background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-                    color: white;
-                }}
-                .btn-view:hover {{
-                    transform: translateY(-1px);
-                    box-shadow: 0 2px 6px rgba(17, 153, 142, 0.3);
-                }}
-                .btn-edit {{
-                    background: linear-gradient(135deg, #f39c12 0%, #f1c40f 100%);
-                    color: white;
-                }}
-                .btn-edit:hover {{
-                    transform: translateY(-1px);
-                    box-shadow: 0 2px 6px rgba(243, 156, 18, 0.3);
-                }}
-                .btn-delete {{
-                    background: linear-gradient(135deg, #e74c3c 0%, #c0392b 100%);
-                    color: white;
-                }}
-                .btn-delete:hover {{
-                    transform: translateY(-1px);
-                    box-shadow: 0 2px 6px rgba(231, 76, 60, 0.3);
-                }}
-                .btn-cancel {{
-                    background: linear-gradient(135deg, #95a5a6 0%, #7f8c8d 100%);
-                    color: white;
-                }}
-                .btn-cancel:hover {{
-                    transform: translateY(-1px);
-                    box-shadow: 0 2px 6px rgba(149, 165, 166, 0.3);
-                }}
-                .footer {{
-                    background: rgba(255,255,255,0.98);
-                    border-top: 3px solid #11998e;
-                    padding: 0.8rem 1.5rem;
-                    flex-shrink: 0;
-                    display: flex;
-                    justify-content: center;
-                    gap: 0.8rem;
-                    flex-wrap: wrap;
-                    box-shadow: 0 -2px 10px rgba(0,0,0,0.1);
-                }}
-                .btn {{
-                    display: inline-block;
-                    padding: 0.6rem 1.3rem;
-                    border-radius: 8px;
-                    text-decoration: none;
-                    font-weight: 700;
-                    font-size: 0.8rem;
-                    transition: all 0.3s ease;
-                    box-shadow: 0 2px 8px rgba(0,0,0,0.15);
-                    border: none;
-                    cursor: pointer;
-                    white-space: nowrap;
-                }}
-                .btn-primary {{
-                    background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-                    color: white;
-                }}
-                .btn-primary:hover {{
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(17, 153, 142, 0.4);
-                }}
-                .btn-secondary {{
-                    background: linear-gradient(135deg, #868f96 0%, #596164 100%);
-                    color: white;
-                }}
-                .btn-secondary:hover {{
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(134, 143, 150, 0.4);
-                }}
-                .btn-success {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                }}
-                .btn-success:hover {{
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(102, 126, 234, 0.4);
-                }}
-                .empty-state {{
-                    text-align: center;
-                    color: #999;
-                    padding: 2rem;
-                    font-style: italic;
-                }}
-                ::-webkit-scrollbar {{
-                    width: 8px;
-                    height: 8px;
-                }}
-                ::-webkit-scrollbar-track {{
-                    background: #f1f1f1;
-                    border-radius: 4px;
-                }}
-                ::-webkit-scrollbar-thumb {{
-                    background: #11998e;
-                    border-radius: 4px;
-                }}
-                ::-webkit-scrollbar-thumb:hover {{
-                    background: #38ef7d;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>� Registros del Sistema</h1>
-                    <p>Visualización de los últimos registros de cada categoría</p>
-                </div>
-                
-                <div class="info-banner">
-                    <p>💡 <strong>Vista personalizable:</strong> Ajustá la cantidad de registros que querés ver en cada tabla. Los datos se muestran ordenados del más reciente al más antiguo.</p>
-                </div>
-                
-                <form class="controls-bar" method="get" action="/admin/db_details">
-                    <label>📋 Registros por tabla:</label>
-                    <input type="number" name="limit" min="1" max="50" value="{limit}" />
-                    <button type="submit">🔄 Actualizar Vista</button>
-                </form>
-                
-                <div class="main-content">
-                    <div class="content-wrapper">
-                        <div class="table-section">
-                            <h2>👥 Dueños Registrados (últimos {limit})</h2>
-                            <div class="table-wrapper">
-                                <table>
-                                    <thead>
-                                        <tr>
-                                            <th>ID</th>
-                                            <th>Nombre</th>
-                                            <th>Teléfono</th>
-                                            <th>Email</th>
-                                            <th style="text-align: center;">Acciones</th>
-                                        </tr>
-                                    </thead>
-                                    <tbody>
-                                        {owners_rows if owners_rows else '<tr><td colspan="5" class="empty-state">No hay dueños registrados en el sistema</td></tr>'}
-                                    </tbody>
-                                </table>
-                            </div>
-                        </div>
-                        
-                        <div class="table-section">
-                            <h2>🐾 Mascotas Registradas (últimas {limit})</h2>
-                            <div class="table-wrapper">
-                                <table>
-                                    <thead>
-                                        <tr>
-                                            <th>ID</th>
-                                            <th>Nombre</th>
-                                            <th>Especie</th>
-                                            <th>Raza</th>
-                                            <th>Dueño</th>
-                                            <th style="text-align: center;">Acciones</th>
-                                        </tr>
-                                    </thead>
-                                    <tbody>
-                                        {pets_rows if pets_rows else '<tr><td colspan="6" class="empty-state">No hay mascotas registradas en el sistema</td></tr>'}
-                                    </tbody>
-                                </table>
-                            </div>
-                        </div>
-                        
-                        <div class="table-section">
-                            <h2>📅 Turnos Programados (últimos {limit})</h2>
-                            <div class="table-wrapper">
-                                <table>
-                                    <thead>
-                                        <tr>
-                                            <th>ID</th>
-                                            <th>Fecha y Hora</th>
-                                            <th>Motivo</th>
-                                            <th>Estado</th>
-                                            <th>Mascota</th>
-                                            <th style="text-align: center;">Acciones</th>
-                                        </tr>
-                                    </thead>
-                                    <tbody>
-                                        {appts_rows if appts_rows else '<tr><td colspan="6" class="empty-state">No hay turnos registrados en el sistema</td></tr>'}
-                                    </tbody>
-                                </table>
-                            </div>
-                        </div>
-                        
-                        <div class="table-section">
-                            <h2>💉 Vacunaciones Aplicadas (últimas {limit})</h2>
-                            <div class="table-wrapper">
-                                <table>
-                                    <thead>
-                                        <tr>
-                                            <th>ID</th>
-                                            <th>Vacuna</th>
-                                            <th>Fecha Aplicación</th>
-                                            <th>Próxima Dosis</th>
-                                            <th>Estado</th>
-                                            <th>Mascota</th>
-                                        </tr>
-                                    </thead>
-                                    <tbody>
-                                        {vaccs_rows if vaccs_rows else '<tr><td colspan="6" class="empty-state">No hay vacunaciones registradas en el sistema</td></tr>'}
-                                    </tbody>
-                                </table>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="footer">
-                    <a href="/" class="btn btn-success">🏠 IR A INICIO</a>
-                    <a href="/admin/db_counts_form" class="btn btn-primary">📊 Ver Totales</a>
-                    <a href="/ui" class="btn btn-secondary">⬅️ Volver al Panel</a>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
 
-        return HTMLResponse(content=html)
+_SPECIES_EMOJI = {
+        'perro': '🐕',
+        'gato': '🐈',
+        'ave': '🦜',
+        'conejo': '🐰',
+        'hamster': '🐹',
+}
+_APPT_STATUS = {
+        'scheduled': {'text': 'Programado', 'color': '#28a745', 'icon': '📅'},
+        'attended': {'text': 'Atendido', 'color': '#007bff', 'icon': '✅'},
+        'canceled': {'text': 'Cancelado', 'color': '#dc3545', 'icon': '❌'},
+}
+_VACC_STATUS = {
+        'due': {'text': 'Pendiente', 'color': '#ffc107', 'icon': '⏳'},
+        'done': {'text': 'Aplicada', 'color': '#28a745', 'icon': '✅'},
+        'overdue': {'text': 'Vencida', 'color': '#dc3545', 'icon': '⚠️'},
+        'upcoming': {'text': 'Próxima', 'color': '#17a2b8', 'icon': '📅'},
+}
 
 
 @router.get("/admin/api_docs_friendly", response_class=HTMLResponse, tags=["admin"])
-def api_docs_friendly():
+def api_docs_friendly(request: Request):
         """Página amigable que explica la documentación de la API para usuarios no técnicos."""
-        html = """
+        return _API_DOCS_FRIENDLY_PAGE.response(request)
+
+
+_API_DOCS_FRIENDLY_HTML = """
         <!doctype html>
         <html lang="es">
         <head>
@@ -1197,8 +738,8 @@ def api_docs_friendly():
         </body>
         </html>
         """
-        
-        return HTMLResponse(content=html)
+
+_API_DOCS_FRIENDLY_PAGE = PrecompressedPage(lambda: _API_DOCS_FRIENDLY_HTML)
 
 
 @router.get("/admin/api_docs_visual", response_class=HTMLResponse, tags=["admin"])
@@ -1206,9 +747,10 @@ def api_docs_visual(db: Session = Depends(get_db)):
     """Documentación visual y amigable de todos los endpoints del sistema."""
     
     # Obtener algunos datos de ejemplo para mostrar
-    owners_count = db.query(models.Owner).count()
-    pets_count = db.query(models.Pet).count()
-    appointments_count = db.query(models.Appointment).count()
+    counts = stats_service.get(db)
+    owners_count = counts["owners"]
+    pets_count = counts["pets"]
+    appointments_count = counts["appointments"]
     
     html = """
     <!DOCTYPE html>
@@ -1935,440 +1477,70 @@ def api_docs_visual(db: Session = Depends(get_db)):
 
 
 @router.get("/admin/presentation", response_class=HTMLResponse, tags=["admin"])
-def project_presentation():
+def project_presentation(request: Request):
     """Presentación completa del proyecto Veterinaria Inteligente - IFTS-12."""
-    
-    # Leer el archivo markdown
-    presentation_path = Path(__file__).parent.parent.parent.parent / "docs" / "Presentacion_Proyecto.md"
-    
-    try:
-        with open(presentation_path, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
-    except FileNotFoundError:
-        markdown_content = "# Error\n\nNo se pudo encontrar el documento de presentación."
-    
-    # Convertir markdown a HTML (conversión básica)
-    html_content = markdown_content.replace('\n### ', '\n<h3>').replace('\n## ', '\n<h2>').replace('\n# ', '\n<h1>')
-    html_content = html_content.replace('### ', '<h3>').replace('## ', '<h2>').replace('# ', '<h1>')
-    html_content = html_content.replace('\n\n', '</p><p>').replace('\n', '<br>')
-    html_content = html_content.replace('**', '<strong>').replace('</strong>', '</strong>', 1)
-    
-    # Procesar listas
-    lines = markdown_content.split('\n')
-    processed_html = []
-    in_list = False
-    in_code_block = False
-    in_table = False
-    
-    for i, line in enumerate(lines):
-        # Code blocks
-        if line.startswith('```'):
-            if not in_code_block:
-                processed_html.append('<pre><code>')
-                in_code_block = True
-            else:
-                processed_html.append('</code></pre>')
-                in_code_block = False
-            continue
-        
-        if in_code_block:
-            processed_html.append(line)
-            continue
-        
-        # Títulos
-        if line.startswith('# '):
-            processed_html.append(f'<h1>{line[2:]}</h1>')
-        elif line.startswith('## '):
-            processed_html.append(f'<h2>{line[3:]}</h2>')
-        elif line.startswith('### '):
-            processed_html.append(f'<h3>{line[4:]}</h3>')
-        elif line.startswith('#### '):
-            processed_html.append(f'<h4>{line[5:]}</h4>')
-        
-        # Listas
-        elif line.startswith('- ') or line.startswith('* ') or line.startswith('+ '):
-            if not in_list:
-                processed_html.append('<ul>')
-                in_list = True
-            content = line[2:].strip()
-            # Procesar bold
-            content = content.replace('**', '<strong>').replace('**', '</strong>')
-            content = content.replace('`', '<code>').replace('`', '</code>')
-            processed_html.append(f'<li>{content}</li>')
-        elif in_list and line.strip() == '':
-            processed_html.append('</ul>')
-            in_list = False
-        
-        # Tablas
-        elif '|' in line and not line.startswith('```'):
-            if not in_table:
-                processed_html.append('<table>')
-                in_table = True
-            cells = [cell.strip() for cell in line.split('|')[1:-1]]
-            if i > 0 and '---' in line:
-                continue
-            elif i > 0 and lines[i+1].strip().startswith('|---'):
-                processed_html.append('<thead><tr>')
-                for cell in cells:
-                    processed_html.append(f'<th>{cell}</th>')
-                processed_html.append('</tr></thead><tbody>')
-            else:
-                processed_html.append('<tr>')
-                for cell in cells:
-                    cell = cell.replace('**', '<strong>').replace('**', '</strong>')
-                    cell = cell.replace('`', '<code>').replace('`', '</code>')
-                    processed_html.append(f'<td>{cell}</td>')
-                processed_html.append('</tr>')
-        elif in_table and line.strip() == '':
-            processed_html.append('</tbody></table>')
-            in_table = False
-        
-        # Texto normal
-        elif line.strip() and not line.startswith('#'):
-            content = line.strip()
-            # Procesar bold
-            import re
-            content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-            # Procesar código inline
-            content = re.sub(r'`(.*?)`', r'<code>\1</code>', content)
-            # Procesar enlaces
-            content = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', content)
-            # Procesar emojis y símbolos
-            processed_html.append(f'<p>{content}</p>')
-        
-        elif line.strip() == '':
-            if in_list:
-                processed_html.append('</ul>')
-                in_list = False
-            if in_table:
-                processed_html.append('</tbody></table>')
-                in_table = False
-    
-    # Cerrar listas/tablas abiertas
-    if in_list:
-        processed_html.append('</ul>')
-    if in_table:
-        processed_html.append('</tbody></table>')
-    
-    final_html = '\n'.join(processed_html)
-    
-    # Template HTML completo
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="es">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>📚 Presentación del Proyecto - Veterinaria Inteligente IFTS-12</title>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                line-height: 1.8;
-                color: #333;
-                background: #f5f5f5;
-                font-size: 16px;
-            }}
-            
-            .container {{
-                max-width: 1200px;
-                margin: 0 auto;
-                background: white;
-                box-shadow: 0 0 30px rgba(0,0,0,0.1);
-            }}
-            
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 1.5rem 2rem 1rem 2rem;
-                text-align: center;
-                position: sticky;
-                top: 0;
-                z-index: 1000;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.2);
-            }}
-            
-            .header h1 {{
-                font-size: 2rem;
-                margin: 0 0 0.5rem 0;
-                font-weight: 700;
-            }}
-            
-            .header .subtitle {{
-                font-size: 1rem;
-                margin: 0 0 1rem 0;
-                opacity: 0.95;
-                font-weight: 400;
-            }}
-            
-            .header-buttons {{
-                display: flex;
-                gap: 0.8rem;
-                justify-content: center;
-                flex-wrap: wrap;
-                margin-top: 0.8rem;
-            }}
-            
-            .content {{
-                padding: 3rem;
-                font-size: 16px;
-            }}
-            
-            h1 {{
-                color: #667eea;
-                border-bottom: 3px solid #667eea;
-                padding-bottom: 0.5rem;
-                margin: 2rem 0 1rem;
-                font-size: 1.75rem;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            
-            h2 {{
-                color: #764ba2;
-                border-left: 5px solid #764ba2;
-                padding-left: 1rem;
-                margin: 2rem 0 1rem;
-                font-size: 1.5rem;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            
-            h3 {{
-                color: #555;
-                margin: 1.5rem 0 1rem;
-                font-size: 1.25rem;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            
-            h4 {{
-                color: #666;
-                margin: 1rem 0 0.5rem;
-                font-size: 1.1rem;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            
-            p {{
-                margin: 1rem 0;
-                text-align: justify;
-                font-size: 16px;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            
-            ul {{
-                margin: 1rem 0 1rem 2rem;
-            }}
-            
-            li {{
-                margin: 0.5rem 0;
-                font-size: 16px;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            
-            code {{
-                background: #f4f4f4;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 2px 6px;
-                font-family: 'Courier New', monospace;
-                font-size: 14px;
-                color: #c7254e;
-            }}
-            
-            pre {{
-                background: #282c34;
-                color: #abb2bf;
-                padding: 1.5rem;
-                border-radius: 8px;
-                overflow-x: auto;
-                margin: 1rem 0;
-                font-family: 'Courier New', monospace;
-                line-height: 1.5;
-                font-size: 14px;
-            }}
-            
-            pre code {{
-                background: none;
-                border: none;
-                color: #abb2bf;
-                padding: 0;
-            }}
-            
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin: 1.5rem 0;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                font-size: 16px;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            
-            th {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 1rem;
-                text-align: left;
-                font-weight: 600;
-                font-size: 16px;
-            }}
-            
-            td {{
-                padding: 0.8rem 1rem;
-                border-bottom: 1px solid #e0e0e0;
-                font-size: 16px;
-            }}
-            
-            tr:nth-child(even) {{
-                background: #f9f9f9;
-            }}
-            
-            tr:hover {{
-                background: #f0f0f0;
-            }}
-            
-            strong {{
-                color: #667eea;
-                font-weight: 600;
-            }}
-            
-            a {{
-                color: #667eea;
-                text-decoration: none;
-                border-bottom: 1px dotted #667eea;
-            }}
-            
-            a:hover {{
-                color: #764ba2;
-                border-bottom: 1px solid #764ba2;
-            }}
-            
-            .nav-buttons {{
-                display: none;
-            }}
-            
-            .btn {{
-                padding: 0.6rem 1.2rem;
-                border-radius: 6px;
-                text-decoration: none;
-                font-weight: 600;
-                font-size: 0.9rem;
-                transition: all 0.3s;
-                display: inline-block;
-                text-align: center;
-                border: none;
-                cursor: pointer;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            
-            .btn-primary {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-            }}
-            
-            .btn-primary:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-            }}
-            
-            .btn-secondary {{
-                background: #6c757d;
-                color: white;
-            }}
-            
-            .btn-secondary:hover {{
-                background: #5a6268;
-                transform: translateY(-2px);
-            }}
-            
-            .toc {{
-                background: #f8f9fa;
-                border-left: 4px solid #667eea;
-                padding: 2rem;
-                margin: 2rem 0;
-                border-radius: 8px;
-            }}
-            
-            .toc h2 {{
-                border: none;
-                padding: 0;
-                margin-bottom: 1rem;
-            }}
-            
-            .toc ul {{
-                margin-left: 1rem;
-            }}
-            
-            @media print {{
-                .header-buttons {{
-                    display: none;
-                }}
-                
-                .header {{
-                    background: #667eea;
-                    -webkit-print-color-adjust: exact;
-                    print-color-adjust: exact;
-                }}
-            }}
-            
-            @media (max-width: 768px) {{
-                .content {{
-                    padding: 1.5rem;
-                }}
-                
-                h1 {{
-                    font-size: 1.5rem;
-                }}
-                
-                h2 {{
-                    font-size: 1.3rem;
-                }}
-                
-                table {{
-                    font-size: 14px;
-                }}
-                
-                .header h1 {{
-                    font-size: 1.5rem;
-                }}
-                
-                .header .subtitle {{
-                    font-size: 0.9rem;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>📚 Proyecto IFTS-12 Veterinaria-Inteligente</h1>
-                <p class="subtitle">Integrantes: A. Mercado, S. Paniagua, F. Hernández, A. Torchia</p>
-                <div class="header-buttons">
-                    <a href="/" class="btn btn-primary">🏠 INICIO</a>
-                    <a href="/ui" class="btn btn-primary">👥 PANEL DE RECEPCIÓN</a>
-                    <a href="/vet/" class="btn btn-primary">🩺 PANEL VETERINARIO</a>
-                    <a href="/docs" class="btn btn-primary">📖 API DOCS</a>
-                    <button onclick="window.print()" class="btn btn-secondary">🖨️ IMPRIMIR/PDF</button>
-                </div>
-            </div>
-            
-            <div class="content">
-                {final_html}
-            </div>
-            
-            <div style="background: #f8f9fa; padding: 2rem; text-align: center; border-top: 2px solid #667eea;">
-                <p><strong>📚 Veterinaria Inteligente - IFTS-12</strong></p>
-                <p>Documento de Presentación del Proyecto</p>
-                <p>© 2025 - Desarrollado como proyecto educativo</p>
-                <div style="margin-top: 1rem;">
-                    <a href="/" class="btn btn-primary">⬅️ Volver al Inicio</a>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
+    return _doc_page(PRESENTATION_DOC).response(request)
+
+
+@router.get("/admin/docs", tags=["admin"])
+def list_docs():
+    """Documentos markdown de docs/ disponibles en /admin/docs/{name}."""
+    return {"docs": docs_service.names()}
+
+
+@router.get("/admin/docs/{name}", response_class=HTMLResponse, tags=["admin"])
+def view_doc(name: str, request: Request):
+    """Cualquier documento de docs/ renderizado con el mismo servicio."""
+    if docs_service.version(name) is None:
+        raise HTTPException(status_code=404, detail="Documento no encontrado")
+    return _doc_page(name).response(request)
+
+
+PRESENTATION_DOC = "Presentacion_Proyecto"
+_MISSING_DOC = "<h1>Error</h1>\n<p>No se pudo encontrar el documento de presentación.</p>"
+_doc_pages: Dict[str, PrecompressedPage] = {}
+_doc_pages_lock = threading.Lock()
+
+
+def _doc_page(name: str) -> PrecompressedPage:
     """
-    
-    return HTMLResponse(content=html)
+    Página precomprimida por documento, re-renderizada solo cuando cambia la
+    versión (mtime/tamaño) del .md; los GET condicionales reciben 304.
+    """
+    page = _doc_pages.get(name)
+    if page is None:
+        # Bajo lock: cada PrecompressedPage se registra en PAGES al crearse
+        with _doc_pages_lock:
+            page = _doc_pages.get(name)
+            if page is None:
+                page = _doc_pages[name] = PrecompressedPage(
+                    lambda: _render_doc(name),
+                    key=lambda: docs_service.version(name),
+                    cache_control="no-cache",
+                )
+    return page
+
+
+def _render_doc(name: str) -> str:
+    try:
+        body = docs_service.html(name)
+    except KeyError:
+        body = _MISSING_DOC
+    if name == PRESENTATION_DOC:
+        title = "Documento de Presentación del Proyecto"
+        heading = "Proyecto IFTS-12 Veterinaria-Inteligente"
+        subtitle = "Integrantes: A. Mercado, S. Paniagua, F. Hernández, A. Torchia"
+    else:
+        title = heading = name.replace("_", " ")
+        subtitle = f"docs/{name}.md"
+    return render_to_string(
+        "admin/markdown_doc.html",
+        title=title,
+        heading=heading,
+        subtitle=subtitle,
+        body=Markup(body),
+    )
+
+
+# La presentación se renderiza al arrancar junto con las páginas de inicio
+_doc_page(PRESENTATION_DOC)
@@ -1,29 +1,97 @@
-from datetime import date
-from fastapi import APIRouter
+import importlib
+import json
+import sys
+from datetime import date, timedelta
+from types import ModuleType
+from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from app.ml.predict import predict_affluence
+from app.core.config import settings
+from app.core.startup import startup_timings
 from app.external.weather_client import (
-    get_weather_features,
-    get_weather_forecast_buenos_aires,
+    MAX_FORECAST_DAYS,
+    forecast_version,
+    get_weather_features_async,
+    get_weather_forecast_buenos_aires_async,
 )
-from app.schemas.common import AffluencePrediction, NoShowPrediction
-from app.schemas.sentiment import SentimentRequest, SentimentResponse
-from app.schemas.nlp import MessageRequest, ClassificationResponse
-from app.schemas.intent import IntentRequest, IntentResponse
-from app.ml.sentiment import predict_sentiment
-from app.ml.noshow import predict_noshow
-from app.ml.keywords import classify_text
-from app.ml.intent import predict_intent, predict_intent_topk
+from app.schemas.common import (
+    AffluencePrediction,
+    AffluenceRange,
+    NoShowPrediction,
+    NoShowGrid,
+)
+from app.schemas.sentiment import (
+    SentimentRequest,
+    SentimentResponse,
+    SentimentBatchRequest,
+    SentimentBatchResponse,
+)
+from app.schemas.nlp import (
+    MessageRequest,
+    ClassificationResponse,
+    MessageBatchRequest,
+    ClassificationBatchResponse,
+)
+from app.schemas.intent import (
+    IntentRequest,
+    IntentResponse,
+    IntentBatchRequest,
+    IntentBatchResponse,
+)
+# keywords no depende de sklearn: se importa al arrancar
+from app.ml.keywords import classify_text, classify_texts
 
 router = APIRouter()
 
+# Horizonte máximo de /ai/predict/range (más allá del pronóstico se usa la
+# climatología media)
+MAX_RANGE_DAYS = 90
+
+
+def _ml(name: str) -> ModuleType:
+    """
+    Importa app.ml.<name> en el primer uso. numpy/pandas/sklearn/joblib no se
+    cargan al arrancar la app; la primera importación queda registrada en
+    /health/startup como fase lazy_import:<módulo>.
+    """
+    module_name = f"app.ml.{name}"
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with startup_timings.phase(f"lazy_import:{module_name}"):
+        return importlib.import_module(module_name)
+
+
+async def _ml_call(name: str, func: str, *args, **kwargs):
+    """
+    Ejecuta app.ml.<name>.<func>(*args, **kwargs) en el threadpool, incluida
+    la importación perezosa: la primera carga de pandas/sklearn (varios
+    segundos) no frena el event loop del worker.
+    """
+
+    def call():
+        return getattr(_ml(name), func)(*args, **kwargs)
+
+    return await run_in_threadpool(call)
+
+
+def _check_batch_size(texts: List[str]) -> None:
+    max_size = settings.ai_batch_max_size
+    if len(texts) > max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote admite como máximo {max_size} textos (recibidos {len(texts)})",
+        )
+
 
 @router.get("/forecast")
-def get_forecast(days: int = 5):
+async def get_forecast(days: int = 5):
     """
     Obtiene el pronóstico del tiempo de Buenos Aires para los próximos días.
     """
-    forecast = get_weather_forecast_buenos_aires(days)
+    forecast = await get_weather_forecast_buenos_aires_async(days)
     return {
         "location": "Buenos Aires, Argentina",
         "forecast": [
@@ -43,25 +111,115 @@ def get_forecast(days: int = 5):
 
 
 @router.get("/predict", response_model=AffluencePrediction)
-def predict(day: date | None = None):
-    # Obtener features de clima (stub) + fecha
-    f = get_weather_features(day)
-    label, prob = predict_affluence(f)
+async def predict(day: date | None = None):
+    # Se espera solo el clima; el modelo (joblib.load + predict_proba) corre
+    # en el threadpool para no frenar el event loop
+    f = await get_weather_features_async(day)
+    label, prob = await _ml_call("predict", "predict_affluence", f)
     return AffluencePrediction(date=f["date"], label=label, probability=prob)
 
 
+@router.get("/predict/range", response_model=AffluenceRange)
+async def predict_range(
+    start: date | None = None,
+    end: date | None = None,
+    days: int | None = Query(None, ge=1, le=MAX_RANGE_DAYS),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """
+    Afluencia para un rango de días (start/end o days=N) en una sola pasada:
+    un pronóstico cacheado, una matriz de features y un predict_proba.
+    Con format=ndjson se devuelve un día por línea a medida que se envía.
+    """
+    start = start or date.today()
+    if end is None:
+        end = start + timedelta(days=(days or 7) - 1)
+    n_days = (end - start).days + 1
+    if n_days < 1 or n_days > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"El rango debe tener entre 1 y {MAX_RANGE_DAYS} días",
+        )
+    day_list = [start + timedelta(days=i) for i in range(n_days)]
+    forecast = await get_weather_forecast_buenos_aires_async(MAX_FORECAST_DAYS)
+    results = await _ml_call("predict", "predict_affluence_range", day_list, forecast)
+
+    if format == "ndjson":
+
+        def lines():
+            for d, label, prob in results:
+                row = {"date": d.isoformat(), "label": label, "probability": prob}
+                yield json.dumps(row) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return AffluenceRange(
+        start=start,
+        end=end,
+        items=[
+            AffluencePrediction(date=d, label=label, probability=prob)
+            for d, label, prob in results
+        ],
+    )
+
+
 @router.post("/sentiment", response_model=SentimentResponse)
 def sentiment(body: SentimentRequest):
-    label, prob = predict_sentiment(body.text)
+    label, prob = _ml("sentiment").predict_sentiment(body.text)
     return SentimentResponse(label=label, probability=prob)
 
 
 @router.get("/noshow", response_model=NoShowPrediction)
-def no_show(day: date, hour: int):
-    label, prob = predict_noshow(day, hour)
+async def no_show(day: date, hour: int):
+    w = await get_weather_features_async(day)
+    label, prob = await _ml_call("noshow", "predict_noshow", day, hour, weather=w)
     return NoShowPrediction(date=day, hour=hour, label=label, probability=prob)
 
 
+def _noshow_grid(day_list, hours, forecast, f_version):
+    """Parte bloqueante de /ai/noshow/grid: importación, modelo y predict_proba."""
+    noshow = _ml("noshow")
+    hours = hours if hours is not None else list(noshow.HOURS)
+    grid = noshow.predict_noshow_grid(day_list, hours, forecast, f_version)
+    return hours, grid, _ml("registry").registry.version(noshow.MODEL_PATH)
+
+
+@router.get("/noshow/grid", response_model=NoShowGrid)
+async def no_show_grid(
+    start: date | None = None,
+    days: int = Query(1, ge=1, le=MAX_FORECAST_DAYS),
+    hours: List[int] | None = Query(None),
+):
+    """
+    Riesgo de no-show para todas las franjas horarias de un rango de días en
+    una sola respuesta (reemplaza una llamada a /ai/noshow por franja).
+    Sin `hours` se usan las franjas habituales de la clínica.
+    """
+    if hours is not None and any(h < 0 or h > 23 for h in hours):
+        raise HTTPException(
+            status_code=422, detail="Las horas deben estar entre 0 y 23"
+        )
+    start = start or date.today()
+    day_list = [start + timedelta(days=i) for i in range(days)]
+    forecast = await get_weather_forecast_buenos_aires_async(MAX_FORECAST_DAYS)
+    f_version = forecast_version()
+    hours, grid, model_version = await run_in_threadpool(
+        _noshow_grid, day_list, hours, forecast, f_version
+    )
+    return NoShowGrid(
+        start=start,
+        days=days,
+        hours=hours,
+        model_version=model_version,
+        forecast_version=f_version,
+        items=[
+            NoShowPrediction(date=d, hour=h, label=label, probability=prob)
+            for d in day_list
+            for h, label, prob in grid[d]
+        ],
+    )
+
+
 @router.post("/classify", response_model=ClassificationResponse)
 def classify(body: MessageRequest):
     label, kws, conf = classify_text(body.text)
@@ -72,9 +230,8 @@ def classify(body: MessageRequest):
 def intent(body: IntentRequest):
     # Intento con modelo supervisado; si no existe, fallback a keywords
     try:
-        label, prob = predict_intent(body.text)
-        # top-3 para transparencia
-        top = predict_intent_topk(body.text, k=3)
+        # Una sola pasada: etiqueta, probabilidad y top-3 para transparencia
+        label, prob, top = _ml("intent").predict_intent_full(body.text, k=3)
         return IntentResponse(
             label=label,
             probability=prob,
@@ -84,3 +241,52 @@ def intent(body: IntentRequest):
         label, _kws, conf = classify_text(body.text)
         # map confidence ~ probability
         return IntentResponse(label=label, probability=float(conf), top3=None)
+
+
+@router.post("/sentiment/batch", response_model=SentimentBatchResponse)
+def sentiment_batch(body: SentimentBatchRequest):
+    _check_batch_size(body.texts)
+    results = _ml("sentiment").predict_sentiment_batch(body.texts)
+    return SentimentBatchResponse(
+        items=[SentimentResponse(label=lbl, probability=p) for lbl, p in results]
+    )
+
+
+@router.post("/classify/batch", response_model=ClassificationBatchResponse)
+def classify_batch(body: MessageBatchRequest):
+    _check_batch_size(body.texts)
+    return ClassificationBatchResponse(
+        items=[
+            ClassificationResponse(label=lbl, keywords=kws, confidence=conf)
+            for lbl, kws, conf in classify_texts(body.texts)
+        ]
+    )
+
+
+@router.post("/intent/batch", response_model=IntentBatchResponse)
+def intent_batch(body: IntentBatchRequest):
+    _check_batch_size(body.texts)
+    try:
+        results = _ml("intent").predict_intent_batch(body.texts, k=3)
+        items = [
+            IntentResponse(
+                label=label,
+                probability=prob,
+                top3=[{"label": lbl, "probability": p} for lbl, p in top],
+            )
+            for label, prob, top in results
+        ]
+    except FileNotFoundError:
+        items = [
+            IntentResponse(label=label, probability=float(conf), top3=None)
+            for label, _kws, conf in classify_texts(body.texts)
+        ]
+    return IntentBatchResponse(items=items)
+
+
+@router.get("/models")
+def models_status():
+    """
+    Estado del registro de modelos en memoria: aciertos, cargas y tiempos.
+    """
+    return _ml("registry").registry.stats()
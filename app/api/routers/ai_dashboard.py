@@ -1,13 +1,20 @@
-﻿from fastapi import APIRouter
+﻿from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from datetime import date
 
+from app.api.precompressed import PrecompressedPage
+
 router = APIRouter()
 
 
 @router.get("/", response_class=HTMLResponse)
-def ai_dashboard():
+def ai_dashboard(request: Request):
     """Dashboard de predicción de afluencia con IA - Rediseñado sin scroll"""
+    return _AI_DASHBOARD_PAGE.response(request)
+
+
+def _render_ai_dashboard() -> str:
+    # Solo depende de la fecha del día (encabezado)
     today = date.today().isoformat()
     # Obtener fecha formateada en español
     from datetime import datetime
@@ -196,16 +203,16 @@ def ai_dashboard():
         // Filtrar solo las fechas desde hoy en adelante
         const futureForecast = forecastData.forecast.filter(day => day.date >= todayStr);
         
-        const predictions = [];
-        for (const day of futureForecast.slice(0, 5)) {{
-          const response = await fetch('/ai/predict?day=' + day.date);
-          const predData = await response.json();
-          predictions.push({{ date: day.date, weather: day, prediction: predData }});
-        }}
+        // Afluencia de los próximos 5 días en una sola llamada
+        const days = futureForecast.slice(0, 5);
+        const rangeResponse = await fetch('/ai/predict/range?start=' + days[0].date + '&days=' + days.length);
+        const rangeData = await rangeResponse.json();
+        const predictions = days.map((day, i) => ({{ date: day.date, weather: day, prediction: rangeData.items[i] }}));
         
+        // Una sola llamada con el riesgo de no-show de todas las franjas del día
         const hours = [9, 12, 15, 18];
-        const noshowPromises = hours.map(hour => fetch('/ai/noshow?day=' + todayStr + '&hour=' + hour).then(r => r.json()));
-        const noshowData = await Promise.all(noshowPromises);
+        const gridResponse = await fetch('/ai/noshow/grid?start=' + todayStr + '&days=1&' + hours.map(h => 'hours=' + h).join('&'));
+        const noshowData = (await gridResponse.json()).items;
         
         let html = '<div class="result-item"><strong>📊 Pronóstico de Afluencia de Clientes - Próximos 5 Días:</strong><br><br>';
         html += '<p style="margin-bottom: 0.8rem; font-size: 0.75rem;">El sistema analiza las condiciones del clima para estimar cuántos clientes visitarán la veterinaria cada día.</p>';
@@ -283,4 +290,7 @@ def ai_dashboard():
 </body>
 </html>
 """
-    return HTMLResponse(content=html_content)
+    return html_content
+
+
+_AI_DASHBOARD_PAGE = PrecompressedPage(_render_ai_dashboard, key=date.today)
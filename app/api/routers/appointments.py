@@ -1,15 +1,22 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, date as date_type, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, Form, Query, Request, Response
 from fastapi.responses import HTMLResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import Date, func, select
+from sqlalchemy.orm import Session, joinedload
 
-from app.db.database import get_db
+from app.api.pagination import keyset_page, set_page_headers
+from app.core.config import settings
+from app.core.templates import stream
+from app.db.database import get_db, stream_scalars
 from app.db import models
 from app.schemas.appointment import AppointmentCreate, AppointmentRead
+from app.services.stats import stats_service
 
 router = APIRouter()
 
+_WEEKDAYS_ES = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+
 
 @router.post("/", response_model=AppointmentRead)
 def create_appointment(payload: AppointmentCreate, db: Session = Depends(get_db)):
@@ -17,7 +24,7 @@ def create_appointment(payload: AppointmentCreate, db: Session = Depends(get_db)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
     ap = models.Appointment(
-        date=payload.date,
+        appointment_date=payload.date,
         reason=payload.reason,
         status="scheduled",
         pet_id=payload.pet_id,
@@ -457,8 +464,25 @@ def create_appointment_form(
 
 
 @router.get("/", response_model=List[AppointmentRead])
-def list_appointments(db: Session = Depends(get_db)):
-    return db.query(models.Appointment).order_by(models.Appointment.appointment_date.asc()).all()
+def list_appointments(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    page_size: int = Query(50, ge=1, le=200),
+    include_total: bool = Query(False),
+    db: Session = Depends(get_db),
+):
+    """Turnos por fecha ascendente, paginados por cursor (appointment_date, id)."""
+    page = keyset_page(
+        db.query(models.Appointment),
+        models.Appointment.appointment_date,
+        models.Appointment.id,
+        page_size,
+        cursor,
+    )
+    total = stats_service.get(db)["appointments"] if include_total else None
+    set_page_headers(request, response, page, total)
+    return page.items
 
 
 # NOTA: Esta ruta /view está deshabilitada porque hay una definición duplicada más completa
@@ -466,16 +490,24 @@ def list_appointments(db: Session = Depends(get_db)):
 # Si se necesita paginación simple, renombrar esta ruta a /view-all o similar
 @router.get("/view-all", response_class=HTMLResponse)
 def list_appointments_view(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     page_size: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
-    """Vista HTML amigable de todos los turnos con paginación."""
-    q = db.query(models.Appointment).order_by(models.Appointment.appointment_date.desc())
-    total_count = q.count()
-    appointments = q.offset((page - 1) * page_size).limit(page_size).all()
-    
-    total_pages = (total_count + page_size - 1) // page_size
+    """Vista HTML amigable de todos los turnos con paginación por cursor."""
+    page = keyset_page(
+        db.query(models.Appointment).options(
+            joinedload(models.Appointment.pet).joinedload(models.Pet.owner)
+        ),
+        models.Appointment.appointment_date,
+        models.Appointment.id,
+        page_size,
+        cursor,
+        descending=True,
+    )
+    appointments = page.items
+    # Total aproximado desde el cache de conteos (sin COUNT por página)
+    total_count = stats_service.get(db)["appointments"]
     
     # Generar filas de la tabla
     appointment_rows = ""
@@ -522,17 +554,17 @@ def list_appointments_view(
     
     # Controles de paginación
     pagination = ""
-    if total_pages > 1:
-        prev_disabled = 'disabled' if page <= 1 else ''
-        next_disabled = 'disabled' if page >= total_pages else ''
-        prev_page = max(1, page - 1)
-        next_page = min(total_pages, page + 1)
+    if page.next_cursor or page.prev_cursor:
+        prev_disabled = '' if page.prev_cursor else 'disabled'
+        next_disabled = '' if page.next_cursor else 'disabled'
+        prev_href = f"/appointments/view-all?cursor={page.prev_cursor}&page_size={page_size}" if page.prev_cursor else "#"
+        next_href = f"/appointments/view-all?cursor={page.next_cursor}&page_size={page_size}" if page.next_cursor else "#"
         
         pagination = f"""
         <div class="pagination">
-            <a href="/appointments/view?page={prev_page}&page_size={page_size}" class="btn-page" {prev_disabled}>← Anterior</a>
-            <span class="page-info">Página {page} de {total_pages} | Total: {total_count} turnos</span>
-            <a href="/appointments/view?page={next_page}&page_size={page_size}" class="btn-page" {next_disabled}>Siguiente →</a>
+            <a href="{prev_href}" class="btn-page" {prev_disabled}>← Anterior</a>
+            <span class="page-info">Total: {total_count} turnos</span>
+            <a href="{next_href}" class="btn-page" {next_disabled}>Siguiente →</a>
         </div>
         """
     else:
@@ -746,7 +778,6 @@ def list_appointments_view(
             <div>Turnos registrados</div>
           </div>
           <div style="text-align: right;">
-            <div>Página {page} de {total_pages}</div>
             <div style="font-size: 0.9rem; opacity: 0.9;">Mostrando {len(appointments)} registros</div>
           </div>
         </div>
@@ -810,23 +841,18 @@ def search_appointments(
         except ValueError:
             pass
     
-    # Construir query
-    query = db.query(models.Appointment)
-    
-    # Filtrar por rango de fechas
+    # Filtros comunes al conteo y al listado
+    conditions = []
     if start_date:
         start_datetime = datetime.combine(start_date, datetime.min.time())
-        query = query.filter(models.Appointment.appointment_date >= start_datetime)
+        conditions.append(models.Appointment.appointment_date >= start_datetime)
     
     if end_date:
         end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(models.Appointment.appointment_date <= end_datetime)
+        conditions.append(models.Appointment.appointment_date <= end_datetime)
     
-    # Filtrar por estado
     if status:
-        query = query.filter(models.Appointment.status == status)
-    
-    appointments = query.order_by(models.Appointment.appointment_date.asc()).all()
+        conditions.append(models.Appointment.status == status)
     
     # Configuración de vista según filtros
     status_config = {
@@ -837,412 +863,42 @@ def search_appointments(
     
     status_info = status_config.get(status or 'all', {'name': 'Todos', 'color': '#667eea'})
     
-    # Agrupar por fecha para mejor visualización
-    from collections import defaultdict
-    appointments_by_date = defaultdict(list)
-    for apt in appointments:
-        date_key = apt.appointment_date.date()
-        appointments_by_date[date_key].append(apt)
-    
-    # Ordenar fechas
-    sorted_dates = sorted(appointments_by_date.keys())
-    
-    # Generar HTML
-    html_content = f"""
-    <!doctype html>
-    <html lang="es">
-    <head>
-      <meta charset="utf-8" />
-      <meta name="viewport" content="width=device-width, initial-scale=1" />
-      <title>🔍 Búsqueda Avanzada de Turnos - Veterinaria Inteligente</title>
-      <style>
-        * {{ box-sizing: border-box; }}
-        body {{
-          font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-          margin: 0;
-          padding: 2rem;
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          min-height: 100vh;
-        }}
-        .container {{
-          max-width: 1400px;
-          margin: 0 auto;
-          background: #fff;
-          border-radius: 16px;
-          box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-          padding: 2rem;
-        }}
-        header {{
-          text-align: center;
-          margin-bottom: 2rem;
-          padding-bottom: 1.5rem;
-          border-bottom: 3px solid #f0f0f0;
-        }}
-        header h1 {{
-          margin: 0 0 .5rem;
-          font-size: 2.5rem;
-          color: #333;
-          font-weight: 700;
-        }}
-        header p {{
-          margin: .5rem 0 0;
-          color: #666;
-          font-size: 1.1rem;
-        }}
-        .filters-summary {{
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          color: white;
-          padding: 1.5rem;
-          border-radius: 12px;
-          margin-bottom: 2rem;
-          display: flex;
-          justify-content: space-between;
-          align-items: center;
-          flex-wrap: wrap;
-          gap: 1rem;
-        }}
-        .filters-summary .count {{
-          font-size: 2.5rem;
-          font-weight: 700;
-        }}
-        .filters-summary .info {{
-          flex: 1;
-          text-align: right;
-        }}
-        .toggle-filters {{
-          background: rgba(255, 255, 255, 0.3);
-          color: white;
-          border: 2px solid white;
-          padding: 0.75rem 1.5rem;
-          border-radius: 8px;
-          cursor: pointer;
-          font-size: 1rem;
-          font-weight: 600;
-          transition: all 0.3s;
-        }}
-        .toggle-filters:hover {{
-          background: white;
-          color: #667eea;
-          transform: translateY(-2px);
-        }}
-        #filters-detail {{
-          animation: slideDown 0.3s ease-out;
-        }}
-        @keyframes slideDown {{
-          from {{
-            opacity: 0;
-            transform: translateY(-10px);
-          }}
-          to {{
-            opacity: 1;
-            transform: translateY(0);
-          }}
-        }}
-        .stats-cards {{
-          display: grid;
-          grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-          gap: 1rem;
-          margin-bottom: 2rem;
-        }}
-        .stat-card {{
-          background: #f8f9fa;
-          padding: 1.5rem;
-          border-radius: 12px;
-          text-align: center;
-          border-left: 5px solid #667eea;
-        }}
-        .stat-card.attended {{ border-left-color: #28a745; }}
-        .stat-card.scheduled {{ border-left-color: #667eea; }}
-        .stat-card.canceled {{ border-left-color: #dc3545; }}
-        .stat-card h3 {{
-          margin: 0;
-          font-size: 2rem;
-          color: #333;
-        }}
-        .stat-card p {{
-          margin: 0.5rem 0 0;
-          color: #666;
-        }}
-        .date-group {{
-          margin-bottom: 2rem;
-        }}
-        .date-header {{
-          background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-          color: white;
-          padding: 1rem 1.5rem;
-          border-radius: 8px;
-          margin-bottom: 1rem;
-          font-size: 1.3rem;
-          font-weight: 600;
-          display: flex;
-          justify-content: space-between;
-          align-items: center;
-        }}
-        .appointments-grid {{
-          display: grid;
-          gap: 1rem;
-          margin-bottom: 1rem;
-        }}
-        .appointment-card {{
-          background: #f8f9fa;
-          border-left: 5px solid {status_info['color']};
-          border-radius: 8px;
-          padding: 1.5rem;
-          box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-          transition: transform 0.2s, box-shadow 0.2s;
-        }}
-        .appointment-card:hover {{
-          transform: translateY(-2px);
-          box-shadow: 0 4px 16px rgba(0,0,0,0.15);
-        }}
-        .appointment-card.attended {{
-          border-left-color: #28a745;
-          background: #f0f9f4;
-        }}
-        .appointment-card.canceled {{
-          border-left-color: #dc3545;
-          background: #fcf2f3;
-        }}
-        .appointment-card.scheduled {{
-          border-left-color: #667eea;
-          background: #f5f6ff;
-        }}
-        .appointment-header {{
-          display: flex;
-          justify-content: space-between;
-          align-items: center;
-          margin-bottom: 1rem;
-          flex-wrap: wrap;
-          gap: 1rem;
-        }}
-        .appointment-time {{
-          font-size: 1.5rem;
-          font-weight: 700;
-          color: #333;
-        }}
-        .status-badge {{
-          padding: 0.5rem 1rem;
-          border-radius: 20px;
-          font-size: 0.85rem;
-          font-weight: 600;
-          text-transform: uppercase;
-        }}
-        .status-badge.attended {{
-          background: #28a745;
-          color: white;
-        }}
-        .status-badge.canceled {{
-          background: #dc3545;
-          color: white;
-        }}
-        .status-badge.scheduled {{
-          background: #667eea;
-          color: white;
-        }}
-        .appointment-details {{
-          display: grid;
-          gap: 0.75rem;
-        }}
-        .detail-row {{
-          display: grid;
-          grid-template-columns: 150px 1fr;
-          gap: 1rem;
-          align-items: start;
-        }}
-        .detail-label {{
-          font-weight: 600;
-          color: #666;
-          display: flex;
-          align-items: center;
-          gap: 0.5rem;
-        }}
-        .detail-value {{
-          color: #333;
-          line-height: 1.5;
-        }}
-        .detail-value.highlight {{
-          font-weight: 600;
-          font-size: 1.1rem;
-          color: #667eea;
-        }}
-        .no-results {{
-          text-align: center;
-          padding: 3rem;
-          color: #666;
-          font-size: 1.2rem;
-        }}
-        .no-results-icon {{
-          font-size: 4rem;
-          margin-bottom: 1rem;
-        }}
-        .back-link {{
-          display: inline-block;
-          margin-top: 2rem;
-          padding: 0.75rem 1.5rem;
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          color: white;
-          text-decoration: none;
-          border-radius: 8px;
-          font-weight: 600;
-          transition: transform 0.2s;
-        }}
-        .back-link:hover {{
-          transform: translateY(-2px);
-        }}
-        @media (max-width: 768px) {{
-          .detail-row {{
-            grid-template-columns: 1fr;
-            gap: 0.25rem;
-          }}
-        }}
-      </style>
-    </head>
-    <body>
-      <div class="container">
-        <header>
-          <h1>🔍 Búsqueda Avanzada de Turnos</h1>
-          <p>Resultados de la búsqueda</p>
-        </header>
-        
-        <div class="filters-summary">
-          <div>
-            <div class="count">{len(appointments)}</div>
-            <div>turnos encontrados</div>
-          </div>
-          <div class="info">
-            <button class="toggle-filters" onclick="toggleFilters()">
-              📋 Ver filtros aplicados
-            </button>
-            <div id="filters-detail" style="display: none; margin-top: 1rem; padding: 1rem; background: rgba(255,255,255,0.2); border-radius: 8px; text-align: left;">
-              <strong style="display: block; margin-bottom: 0.5rem;">Filtros aplicados:</strong>
-              {'<p style="margin: 0.25rem 0;">📅 Desde: ' + start_date.strftime('%d/%m/%Y') + '</p>' if start_date else '<p style="margin: 0.25rem 0; opacity: 0.7;">📅 Desde: Sin filtro</p>'}
-              {'<p style="margin: 0.25rem 0;">📅 Hasta: ' + end_date.strftime('%d/%m/%Y') + '</p>' if end_date else '<p style="margin: 0.25rem 0; opacity: 0.7;">📅 Hasta: Sin filtro</p>'}
-              {'<p style="margin: 0.25rem 0;">📊 Estado: ' + status_info['name'] + '</p>' if status else '<p style="margin: 0.25rem 0; opacity: 0.7;">📊 Estado: Todos</p>'}
-            </div>
-          </div>
-        </div>
-        
-        <script>
-          function toggleFilters() {{
-            const detail = document.getElementById('filters-detail');
-            const btn = document.querySelector('.toggle-filters');
-            if (detail.style.display === 'none') {{
-              detail.style.display = 'block';
-              btn.textContent = '📋 Ocultar filtros';
-            }} else {{
-              detail.style.display = 'none';
-              btn.textContent = '📋 Ver filtros aplicados';
-            }}
-          }}
-        </script>
-        
-        <div class="stats-cards">
-          <div class="stat-card attended">
-            <h3>{sum(1 for a in appointments if str(a.status) == 'attended')}</h3>
-            <p>Atendidos</p>
-          </div>
-          <div class="stat-card scheduled">
-            <h3>{sum(1 for a in appointments if str(a.status) == 'scheduled')}</h3>
-            <p>Programados</p>
-          </div>
-          <div class="stat-card canceled">
-            <h3>{sum(1 for a in appointments if str(a.status) == 'canceled')}</h3>
-            <p>Cancelados</p>
-          </div>
-        </div>
-    """
-    
-    if appointments:
-        for date_key in sorted_dates:
-            date_appointments = appointments_by_date[date_key]
-            weekday = date_key.strftime('%A')
-            weekday_es = {
-                'Monday': 'Lunes', 'Tuesday': 'Martes', 'Wednesday': 'Miércoles',
-                'Thursday': 'Jueves', 'Friday': 'Viernes', 'Saturday': 'Sábado', 'Sunday': 'Domingo'
-            }.get(weekday, weekday)
-            
-            html_content += f"""
-        <div class="date-group">
-          <div class="date-header">
-            <span>📅 {weekday_es}, {date_key.strftime('%d de %B de %Y')}</span>
-            <span>{len(date_appointments)} turnos</span>
-          </div>
-          <div class="appointments-grid">
-            """
-            
-            for apt in date_appointments:
-                apt_status = str(apt.status)
-                status_text = {
-                    'scheduled': 'Programado',
-                    'attended': 'Atendido',
-                    'canceled': 'Cancelado'
-                }.get(apt_status, apt_status)
-                
-                time_str = apt.appointment_date.strftime('%H:%M')
-                pet_name = apt.pet.name if apt.pet else 'N/A'
-                owner_name = apt.pet.owner.name if apt.pet and apt.pet.owner else 'N/A'
-                owner_phone = apt.pet.owner.phone if apt.pet and apt.pet.owner else 'N/A'
-                pet_species = apt.pet.species if apt.pet else 'N/A'
-                pet_breed = apt.pet.breed if apt.pet else 'N/A'
-                
-                html_content += f"""
-            <div class="appointment-card {apt_status}">
-              <div class="appointment-header">
-                <div class="appointment-time">🕐 {time_str}</div>
-                <div class="status-badge {apt_status}">{status_text}</div>
-              </div>
-              <div class="appointment-details">
-                <div class="detail-row">
-                  <span class="detail-label">🐾 Mascota:</span>
-                  <span class="detail-value highlight">{pet_name}</span>
-                </div>
-                <div class="detail-row">
-                  <span class="detail-label">🔍 Especie/Raza:</span>
-                  <span class="detail-value">{pet_species} - {pet_breed}</span>
-                </div>
-                <div class="detail-row">
-                  <span class="detail-label">👤 Dueño:</span>
-                  <span class="detail-value">{owner_name}</span>
-                </div>
-                <div class="detail-row">
-                  <span class="detail-label">📞 Teléfono:</span>
-                  <span class="detail-value">{owner_phone}</span>
-                </div>
-                <div class="detail-row">
-                  <span class="detail-label">📋 Motivo:</span>
-                  <span class="detail-value">{apt.reason or 'No especificado'}</span>
-                </div>
-                <div class="detail-row">
-                  <span class="detail-label">🔑 ID:</span>
-                  <span class="detail-value">#{apt.id}</span>
-                </div>
-              </div>
-            </div>
-                """
-            
-            html_content += """
-          </div>
-        </div>
-            """
-    else:
-        html_content += """
-        <div class="no-results">
-          <div class="no-results-icon">🔍</div>
-          <p>No se encontraron turnos con los filtros seleccionados.</p>
-          <p style="font-size: 1rem; color: #999;">Intenta ajustar los criterios de búsqueda.</p>
-        </div>
-        """
-    
-    html_content += """
-        <div style="text-align: center;">
-          <a href="/vet/gestion" class="back-link">⬅️ Volver a Gestión Veterinaria</a>
-        </div>
-      </div>
-    </body>
-    </html>
-    """
-    
-    return html_content
+    # Totales por estado y por día con un GROUP BY: la cabecera se envía
+    # antes de leer los turnos
+    day = func.date(models.Appointment.appointment_date, type_=Date)
+    counts = {"total": 0, **{key: 0 for key in status_config}}
+    day_counts: Dict[date_type, int] = {}
+    for d, st, n in db.execute(
+        select(day, models.Appointment.status, func.count(models.Appointment.id))
+        .where(*conditions)
+        .group_by(day, models.Appointment.status)
+    ):
+        counts["total"] += n
+        if st in counts:
+            counts[st] += n
+        day_counts[d] = day_counts.get(d, 0) + n
+
+    # Los turnos se leen por lotes mientras se envía la página (la plantilla
+    # abre un grupo nuevo cada vez que cambia el día)
+    rows = stream_scalars(
+        select(models.Appointment)
+        .options(joinedload(models.Appointment.pet).joinedload(models.Pet.owner))
+        .where(*conditions)
+        .order_by(models.Appointment.appointment_date.asc(), models.Appointment.id.asc()),
+        settings.html_stream_batch_size,
+    )
+
+    return stream(
+        "appointments/search.html",
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        status_info=status_info,
+        counts=counts,
+        day_counts=day_counts,
+        weekdays=_WEEKDAYS_ES,
+        appointments=rows,
+    )
 
 
 @router.get("/view", response_class=HTMLResponse)
@@ -1268,27 +924,25 @@ def view_appointments(
         except ValueError:
             pass
     
-    # Construir query
-    query = db.query(models.Appointment)
+    # Filtros comunes al conteo y al listado
+    conditions = []
     
     # Filtrar por mascota si se proporciona
     if pet_id:
-        query = query.filter(models.Appointment.pet_id == pet_id)
+        conditions.append(models.Appointment.pet_id == pet_id)
     
     # Filtrar por fecha si se proporciona
     if target_date:
         start = datetime.combine(target_date, datetime.min.time())
         end = start + timedelta(days=1)
-        query = query.filter(
-            models.Appointment.appointment_date >= start,
-            models.Appointment.appointment_date < end
-        )
+        conditions.append(models.Appointment.appointment_date >= start)
+        conditions.append(models.Appointment.appointment_date < end)
     
     # Filtrar por estado si se proporciona
     if status:
-        query = query.filter(models.Appointment.status == status)
+        conditions.append(models.Appointment.status == status)
     
-    appointments = query.order_by(models.Appointment.appointment_date.asc()).all()
+    total = db.scalar(select(func.count(models.Appointment.id)).where(*conditions))
     
     # Definir títulos y colores según el contexto
     if pet:
@@ -1340,281 +994,24 @@ def view_appointments(
         color = config['color']
         gradient = config['gradient']
     
-    # Generar HTML
-    html_content = f"""
-    <!doctype html>
-    <html lang="es">
-    <head>
-      <meta charset="utf-8" />
-      <meta name="viewport" content="width=device-width, initial-scale=1" />
-      <title>{title} - Veterinaria Inteligente</title>
-      <style>
-        * {{ box-sizing: border-box; }}
-        body {{
-          font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-          margin: 0;
-          padding: 2rem;
-          background: {gradient};
-          min-height: 100vh;
-        }}
-        .container {{
-          max-width: 1400px;
-          margin: 0 auto;
-          background: #fff;
-          border-radius: 16px;
-          box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-          padding: 2rem;
-        }}
-        header {{
-          text-align: center;
-          margin-bottom: 2rem;
-          padding-bottom: 1.5rem;
-          border-bottom: 3px solid #f0f0f0;
-        }}
-        header h1 {{
-          margin: 0 0 .5rem;
-          font-size: 2.5rem;
-          color: #333;
-          font-weight: 700;
-        }}
-        header p {{
-          margin: .5rem 0 0;
-          color: #666;
-          font-size: 1.1rem;
-        }}
-        .summary {{
-          background: {gradient};
-          color: white;
-          padding: 2rem;
-          border-radius: 12px;
-          margin-bottom: 2rem;
-          text-align: center;
-        }}
-        .summary h2 {{
-          margin: 0;
-          font-size: 3rem;
-          font-weight: 700;
-        }}
-        .summary p {{
-          margin: 0.5rem 0 0;
-          font-size: 1.2rem;
-          opacity: 0.9;
-        }}
-        .appointments-grid {{
-          display: grid;
-          gap: 1rem;
-        }}
-        .appointment-card {{
-          background: #f8f9fa;
-          border-left: 5px solid {color};
-          border-radius: 8px;
-          padding: 1.5rem;
-          box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-          transition: transform 0.2s, box-shadow 0.2s;
-        }}
-        .appointment-card:hover {{
-          transform: translateY(-2px);
-          box-shadow: 0 4px 16px rgba(0,0,0,0.15);
-        }}
-        .appointment-header {{
-          display: flex;
-          justify-content: space-between;
-          align-items: center;
-          margin-bottom: 1rem;
-          flex-wrap: wrap;
-          gap: 1rem;
-        }}
-        .appointment-datetime {{
-          display: flex;
-          gap: 1rem;
-          align-items: center;
-        }}
-        .appointment-time {{
-          font-size: 1.5rem;
-          font-weight: 700;
-          color: #333;
-        }}
-        .appointment-date {{
-          font-size: 1rem;
-          color: #666;
-          font-weight: 500;
-        }}
-        .status-badge {{
-          padding: 0.5rem 1rem;
-          border-radius: 20px;
-          font-size: 0.85rem;
-          font-weight: 600;
-          text-transform: uppercase;
-        }}
-        .status-badge.attended {{
-          background: #28a745;
-          color: white;
-        }}
-        .status-badge.scheduled {{
-          background: #667eea;
-          color: white;
-        }}
-        .status-badge.canceled {{
-          background: #dc3545;
-          color: white;
-        }}
-        .appointment-details {{
-          display: grid;
-          gap: 0.75rem;
-        }}
-        .detail-row {{
-          display: grid;
-          grid-template-columns: 150px 1fr;
-          gap: 1rem;
-          align-items: start;
-        }}
-        .detail-label {{
-          font-weight: 600;
-          color: #666;
-          display: flex;
-          align-items: center;
-          gap: 0.5rem;
-        }}
-        .detail-value {{
-          color: #333;
-          line-height: 1.5;
-        }}
-        .detail-value.highlight {{
-          font-weight: 600;
-          color: {color};
-          font-size: 1.1rem;
-        }}
-        .no-appointments {{
-          text-align: center;
-          padding: 3rem;
-          color: #666;
-          font-size: 1.2rem;
-        }}
-        .no-appointments-icon {{
-          font-size: 4rem;
-          margin-bottom: 1rem;
-        }}
-        .back-link {{
-          display: inline-block;
-          margin-top: 2rem;
-          padding: 0.75rem 1.5rem;
-          background: {gradient};
-          color: white;
-          text-decoration: none;
-          border-radius: 8px;
-          font-weight: 600;
-          transition: transform 0.2s;
-        }}
-        .back-link:hover {{
-          transform: translateY(-2px);
-        }}
-        @media (max-width: 768px) {{
-          .detail-row {{
-            grid-template-columns: 1fr;
-            gap: 0.25rem;
-          }}
-        }}
-      </style>
-    </head>
-    <body>
-      <div class="container">
-        <header>
-          <h1>{title}</h1>
-          <p>{subtitle}</p>
-        </header>
-        
-        <div class="summary">
-          <h2>{len(appointments)}</h2>
-          <p>turnos encontrados</p>
-        </div>
-        
-        <div class="appointments-grid">
-    """
-    
-    if appointments:
-        for apt in appointments:
-            time_str = apt.appointment_date.strftime('%H:%M')
-            date_full = apt.appointment_date.strftime('%d/%m/%Y')
-            pet_name = apt.pet.name if apt.pet else 'N/A'
-            owner_name = apt.pet.owner.name if apt.pet and apt.pet.owner else 'N/A'
-            owner_phone = apt.pet.owner.phone if apt.pet and apt.pet.owner else 'N/A'
-            pet_species = apt.pet.species if apt.pet else 'N/A'
-            pet_breed = apt.pet.breed if apt.pet else 'N/A'
-            
-            # Calcular estado del turno
-            today = datetime.now().date()
-            apt_date = apt.appointment_date.date()
-            
-            if apt.status == 'attended':
-                status_class = "attended"
-                status_text = "✓ Atendido"
-            elif apt.status == 'canceled':
-                status_class = "canceled"
-                status_text = "✗ Cancelado"
-            elif apt_date >= today:
-                status_class = "scheduled"
-                status_text = "◷ Programado"
-            else:
-                status_class = "scheduled"
-                status_text = "◷ Pendiente"
-            
-            html_content += f"""
-          <div class="appointment-card">
-            <div class="appointment-header">
-              <div class="appointment-datetime">
-                <div class="appointment-time">🕐 {time_str}</div>
-                <div class="appointment-date">📅 {date_full}</div>
-              </div>
-              <div class="status-badge {status_class}">{status_text}</div>
-            </div>
-            <div class="appointment-details">
-              <div class="detail-row">
-                <span class="detail-label">🐾 Mascota:</span>
-                <span class="detail-value highlight">{pet_name}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">🔍 Especie/Raza:</span>
-                <span class="detail-value">{pet_species} - {pet_breed}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">👤 Dueño:</span>
-                <span class="detail-value">{owner_name}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">📞 Teléfono:</span>
-                <span class="detail-value">{owner_phone}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">📋 Motivo:</span>
-                <span class="detail-value">{apt.reason or 'No especificado'}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">🔑 ID Turno:</span>
-                <span class="detail-value">#{apt.id}</span>
-              </div>
-            </div>
-          </div>
-            """
-    else:
-        html_content += """
-          <div class="no-appointments">
-            <div class="no-appointments-icon">😴</div>
-            <p>No se encontraron turnos con los filtros seleccionados.</p>
-          </div>
-        """
-    
-    html_content += """
-        </div>
-        
-        <div style="text-align: center;">
-          <a href="/vet/gestion" class="back-link">⬅️ Volver a Gestión Veterinaria</a>
-        </div>
-      </div>
-    </body>
-    </html>
-    """
-    
-    return html_content
+    rows = stream_scalars(
+        select(models.Appointment)
+        .options(joinedload(models.Appointment.pet).joinedload(models.Pet.owner))
+        .where(*conditions)
+        .order_by(models.Appointment.appointment_date.asc(), models.Appointment.id.asc()),
+        settings.html_stream_batch_size,
+    )
+
+    return stream(
+        "appointments/list.html",
+        title=title,
+        subtitle=subtitle,
+        color=color,
+        gradient=gradient,
+        total=total,
+        today=datetime.now().date(),
+        appointments=rows,
+    )
 
 
 @router.get("/{appointment_id}/view", response_class=HTMLResponse)
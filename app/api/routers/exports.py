@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db import models
+
+router = APIRouter()
+
+# entidad -> (modelo, columna para el filtro de fechas)
+EXPORTS: Dict[str, Any] = {
+    "appointments": (models.Appointment, models.Appointment.appointment_date),
+    "pets": (models.Pet, models.Pet.created_at),
+    "owners": (models.Owner, models.Owner.created_at),
+    "vaccinations": (models.Vaccination, models.Vaccination.due_date),
+    "records": (models.ClinicalRecord, models.ClinicalRecord.visit_date),
+}
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"No serializable: {type(value)!r}")
+
+
+def _build_query(
+    entity: str, start: Optional[date], end: Optional[date], status: Optional[str]
+):
+    model, date_col = EXPORTS[entity]
+    columns = list(model.__table__.columns)
+    stmt = select(*columns).order_by(model.id)
+    # Las columnas DateTime se comparan contra [start 00:00, end+1 00:00)
+    is_datetime = date_col.type.python_type is datetime
+    if start is not None:
+        lo = datetime(start.year, start.month, start.day) if is_datetime else start
+        stmt = stmt.where(date_col >= lo)
+    if end is not None:
+        if is_datetime:
+            stmt = stmt.where(
+                date_col < datetime(end.year, end.month, end.day) + timedelta(days=1)
+            )
+        else:
+            stmt = stmt.where(date_col <= end)
+    if status is not None:
+        if "status" not in model.__table__.columns:
+            raise HTTPException(status_code=422, detail=f"{entity} no tiene estado")
+        stmt = stmt.where(model.__table__.c.status == status)
+    return stmt, [c.name for c in columns]
+
+
+def _stream_rows(stmt, batch_size: int) -> Iterator[List[tuple]]:
+    """
+    Lotes de filas (tuplas, sin objetos ORM) con un cursor del lado del
+    servidor: la memoria no depende del tamaño de la tabla. La sesión es
+    propia del generador porque vive mientras se envía la respuesta.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            stmt.execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def _encode_ndjson(names: List[str], batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(names, row)), default=_json_default, ensure_ascii=False)
+            + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+def _encode_csv(names: List[str], batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(names)
+    for rows in batches:
+        writer.writerows(
+            [v.isoformat() if isinstance(v, (date, datetime)) else v for v in row]
+            for row in rows
+        )
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    # wbits=31: formato gzip (cabecera + CRC) en modo streaming
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+@router.get("/{entity}")
+def export_entity(
+    entity: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start: Optional[date] = Query(None, description="Desde (incluido)"),
+    end: Optional[date] = Query(None, description="Hasta (incluido)"),
+    status: Optional[str] = Query(None),
+    gzip: bool = Query(False, description="Comprimir con Content-Encoding: gzip"),
+):
+    """
+    Exportación completa de una tabla como NDJSON o CSV, enviada por partes
+    a medida que se lee (memoria constante, apta para dumps del BI).
+    Filtros opcionales de rango de fechas y de estado.
+    """
+    if entity not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Entidad desconocida: {entity}")
+    if start and end and end < start:
+        raise HTTPException(status_code=422, detail="end debe ser >= start")
+    stmt, names = _build_query(entity, start, end, status)
+
+    batches = _stream_rows(stmt, settings.export_batch_size)
+    encode = _encode_ndjson if format == "ndjson" else _encode_csv
+    body = encode(names, batches)
+    headers = {"Content-Disposition": f'attachment; filename="{entity}.{format}"'}
+    if gzip:
+        body = _gzip(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=MEDIA_TYPES[format], headers=headers)
@@ -1,8 +1,16 @@
 from fastapi import APIRouter
 
+from app.core.startup import startup_timings
+
 router = APIRouter()
 
 
 @router.get("/health")
 def healthcheck():
     return {"status": "ok"}
+
+
+@router.get("/health/startup")
+def startup_report():
+    """Tiempos por fase del arranque y de las importaciones diferidas de ML."""
+    return startup_timings.as_dict()
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
+from app.api.precompressed import PrecompressedPage
+
 router = APIRouter()
 
 
@@ -313,7 +315,10 @@ HTML_HOME = """
 """
 
 
+_HOME_PAGE = PrecompressedPage(lambda: HTML_HOME)
+
+
 @router.get("/", response_class=HTMLResponse)
-def home_page():
+def home_page(request: Request):
     """Página de inicio principal del sistema Veterinaria Inteligente"""
-    return HTMLResponse(content=HTML_HOME)
+    return _HOME_PAGE.response(request)
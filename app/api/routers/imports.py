@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import get_db
+from app.services.bulk_import import SPECS, import_stream
+
+router = APIRouter()
+
+
+@router.post("/{entity}")
+def bulk_import(
+    entity: str,
+    file: UploadFile = File(..., description="CSV con encabezado o NDJSON"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+):
+    """
+    Importación masiva de owners, pets, appointments o vaccinations.
+
+    Cada fila se valida con el schema *Create correspondiente. Las mascotas
+    pueden referenciar al dueño por owner_email, y los turnos y vacunas a la
+    mascota por pet_name + owner_email. Se inserta en lotes y las filas con
+    error se informan sin abortar el resto.
+    """
+    if entity not in SPECS:
+        raise HTTPException(status_code=404, detail=f"Entidad desconocida: {entity}")
+    fmt = format
+    if fmt is None:
+        name = (file.filename or "").lower()
+        fmt = (
+            "csv"
+            if name.endswith(".csv") or file.content_type == "text/csv"
+            else "ndjson"
+        )
+    report = import_stream(db, entity, file.file, fmt, settings.import_batch_size)
+    return report.as_dict()
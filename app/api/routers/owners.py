@@ -1,11 +1,16 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Form, Request, Response
 from fastapi.responses import HTMLResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
+from app.api.pagination import keyset_page, set_page_headers
+from app.core.templates import render
 from app.db.database import get_db
 from app.db import models
 from app.schemas.owner import OwnerCreate, OwnerRead
+from app.services.search import apply_search
+from app.services.stats import stats_service
 
 router = APIRouter()
 
@@ -332,12 +337,27 @@ def create_owner_form(
 
 @router.get("/", response_model=List[OwnerRead])
 def list_owners(
-    page: int = Query(1, ge=1),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    page_number: Optional[int] = Query(
+        None, alias="page", ge=1, deprecated=True, description="Obsoleto (OFFSET): usar cursor"
+    ),
     page_size: int = Query(50, ge=1, le=200),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
 ):
-    q = db.query(models.Owner).order_by(models.Owner.id.asc())
-    return q.offset((page - 1) * page_size).limit(page_size).all()
+    page = keyset_page(
+        db.query(models.Owner),
+        models.Owner.id,
+        models.Owner.id,
+        page_size,
+        cursor,
+        page=page_number,
+    )
+    total = stats_service.get(db)["owners"] if include_total else None
+    set_page_headers(request, response, page, total)
+    return page.items
 
 
 @router.get("/view", response_class=HTMLResponse)
@@ -664,22 +684,16 @@ def search_owners_view(
     db: Session = Depends(get_db)
 ):
     """Vista HTML de búsqueda de dueños con filtros - Diseño profesional sin scroll."""
-    # Construir query
-    query = db.query(models.Owner)
-    
-    # Filtrar por nombre
-    if name:
-        query = query.filter(models.Owner.name.ilike(f"%{name}%"))
-    
-    # Filtrar por teléfono
-    if phone:
-        query = query.filter(models.Owner.phone.ilike(f"%{phone}%"))
-    
-    # Filtrar por email
-    if email:
-        query = query.filter(models.Owner.email.ilike(f"%{email}%"))
+    # Índice de texto completo: palabras por prefijo, sin acentos, por relevancia
+    contact = " ".join(value for value in (phone, email) if value)
+    stmt = apply_search(db, select(models.Owner), "owners", {"name": name, "contact": contact})
     
-    owners = query.order_by(models.Owner.name.asc()).all()
+    # selectinload: una sola query extra para las mascotas de todos los dueños
+    owners = (
+        db.scalars(
+            stmt.options(selectinload(models.Owner.pets)).order_by(models.Owner.name.asc())
+        ).all()
+    )
     
     # Generar HTML
     html_content = f"""
@@ -1016,354 +1030,8 @@ def get_owner_view(owner_id: int, db: Session = Depends(get_db)):
     if not owner:
         raise HTTPException(status_code=404, detail="Owner not found")
     
-    phone_display = owner.phone if owner.phone else '<span style="color: #999;">No especificado</span>'
-    email_display = owner.email if owner.email else '<span style="color: #999;">No especificado</span>'
-    
     pets = owner.pets if owner.pets else []
-    
-    html_content = f"""
-    <!doctype html>
-    <html lang="es">
-    <head>
-      <meta charset="utf-8" />
-      <meta name="viewport" content="width=device-width, initial-scale=1" />
-      <title>👤 {owner.name} - Detalles del Dueño</title>
-      <style>
-        * {{ box-sizing: border-box; }}
-        body {{
-          font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-          margin: 0;
-          padding: 2rem;
-          background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-          min-height: 100vh;
-        }}
-        .container {{
-          max-width: 1200px;
-          margin: 0 auto;
-          background: #fff;
-          border-radius: 16px;
-          box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-          overflow: hidden;
-        }}
-        .header {{
-          background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-          color: white;
-          padding: 3rem 2rem;
-          text-align: center;
-        }}
-        .header-icon {{
-          font-size: 5rem;
-          margin-bottom: 1rem;
-        }}
-        .header h1 {{
-          margin: 0 0 1rem;
-          font-size: 2.5rem;
-          font-weight: 700;
-        }}
-        .header-id {{
-          background: rgba(255, 255, 255, 0.3);
-          color: white;
-          padding: 0.5rem 1rem;
-          border-radius: 20px;
-          display: inline-block;
-          font-weight: 600;
-        }}
-        .content {{
-          padding: 2rem;
-        }}
-        .section {{
-          margin-bottom: 2rem;
-        }}
-        .section-title {{
-          font-size: 1.5rem;
-          font-weight: 700;
-          color: #333;
-          margin: 0 0 1.5rem;
-          padding-bottom: 0.5rem;
-          border-bottom: 3px solid #11998e;
-        }}
-        .info-grid {{
-          display: grid;
-          grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-          gap: 1.5rem;
-          margin-bottom: 2rem;
-        }}
-        .info-card {{
-          background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-          border-left: 5px solid #11998e;
-          border-radius: 8px;
-          padding: 1.5rem;
-        }}
-        .info-label {{
-          font-size: 0.9rem;
-          color: #666;
-          font-weight: 600;
-          margin-bottom: 0.5rem;
-          display: flex;
-          align-items: center;
-          gap: 0.5rem;
-        }}
-        .info-icon {{
-          font-size: 1.5rem;
-        }}
-        .info-value {{
-          font-size: 1.3rem;
-          color: #333;
-          font-weight: 700;
-        }}
-        .pets-grid {{
-          display: grid;
-          grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
-          gap: 1.5rem;
-        }}
-        .pet-card {{
-          background: #f8f9fa;
-          border-left: 5px solid #667eea;
-          border-radius: 8px;
-          padding: 1.5rem;
-          box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-          transition: transform 0.2s, box-shadow 0.2s;
-        }}
-        .pet-card:hover {{
-          transform: translateY(-4px);
-          box-shadow: 0 6px 20px rgba(0,0,0,0.15);
-        }}
-        .pet-header {{
-          display: flex;
-          align-items: center;
-          gap: 1rem;
-          margin-bottom: 1rem;
-          padding-bottom: 1rem;
-          border-bottom: 2px solid #e0e0e0;
-        }}
-        .pet-icon {{
-          font-size: 2.5rem;
-        }}
-        .pet-name {{
-          font-size: 1.5rem;
-          font-weight: 700;
-          color: #333;
-          margin: 0;
-        }}
-        .pet-id {{
-          color: #667eea;
-          font-size: 0.85rem;
-          font-weight: 600;
-        }}
-        .pet-details {{
-          display: grid;
-          gap: 0.5rem;
-          margin-bottom: 1rem;
-        }}
-        .pet-detail-row {{
-          display: flex;
-          justify-content: space-between;
-          padding: 0.5rem;
-          background: white;
-          border-radius: 4px;
-        }}
-        .pet-detail-label {{
-          color: #666;
-          font-weight: 600;
-        }}
-        .pet-detail-value {{
-          color: #333;
-        }}
-        .pet-actions {{
-          display: flex;
-          gap: 0.5rem;
-        }}
-        .btn {{
-          padding: 0.5rem 1rem;
-          border-radius: 6px;
-          text-decoration: none;
-          font-size: 0.9rem;
-          font-weight: 600;
-          transition: all 0.2s;
-          display: inline-block;
-          text-align: center;
-          flex: 1;
-        }}
-        .btn-primary {{
-          background: #667eea;
-          color: white;
-        }}
-        .btn-primary:hover {{
-          background: #764ba2;
-        }}
-        .btn-secondary {{
-          background: #11998e;
-          color: white;
-        }}
-        .btn-secondary:hover {{
-          background: #38ef7d;
-        }}
-        .no-pets {{
-          text-align: center;
-          padding: 3rem;
-          color: #666;
-          background: #f8f9fa;
-          border-radius: 8px;
-        }}
-        .no-pets-icon {{
-          font-size: 4rem;
-          margin-bottom: 1rem;
-        }}
-        .stats {{
-          display: grid;
-          grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-          gap: 1rem;
-          margin-bottom: 2rem;
-        }}
-        .stat-card {{
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          color: white;
-          padding: 1.5rem;
-          border-radius: 8px;
-          text-align: center;
-        }}
-        .stat-value {{
-          font-size: 3rem;
-          font-weight: 700;
-          margin: 0;
-        }}
-        .stat-label {{
-          margin: 0.5rem 0 0;
-          opacity: 0.9;
-        }}
-        .back-link {{
-          display: inline-block;
-          margin-top: 2rem;
-          padding: 0.75rem 1.5rem;
-          background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-          color: white;
-          text-decoration: none;
-          border-radius: 8px;
-          font-weight: 600;
-          transition: transform 0.2s;
-        }}
-        .back-link:hover {{
-          transform: translateY(-2px);
-        }}
-        .timestamp {{
-          color: #999;
-          font-size: 0.85rem;
-          text-align: center;
-          margin-top: 2rem;
-          padding-top: 1rem;
-          border-top: 1px solid #e0e0e0;
-        }}
-      </style>
-    </head>
-    <body>
-      <div class="container">
-        <div class="header">
-          <div class="header-icon">👤</div>
-          <h1>{owner.name}</h1>
-          <span class="header-id">ID: #{owner.id}</span>
-        </div>
-        
-        <div class="content">
-          <div class="section">
-            <h2 class="section-title">📋 Información de Contacto</h2>
-            <div class="info-grid">
-              <div class="info-card">
-                <div class="info-label">
-                  <span class="info-icon">📞</span>
-                  Teléfono
-                </div>
-                <div class="info-value">{phone_display}</div>
-              </div>
-              
-              <div class="info-card">
-                <div class="info-label">
-                  <span class="info-icon">📧</span>
-                  Email
-                </div>
-                <div class="info-value">{email_display}</div>
-              </div>
-            </div>
-          </div>
-          
-          <div class="section">
-            <h2 class="section-title">📊 Estadísticas</h2>
-            <div class="stats">
-              <div class="stat-card">
-                <div class="stat-value">{len(pets)}</div>
-                <div class="stat-label">Mascotas</div>
-              </div>
-            </div>
-          </div>
-          
-          <div class="section">
-            <h2 class="section-title">🐾 Mascotas</h2>
-    """
-    
-    if pets:
-        html_content += '<div class="pets-grid">'
-        for pet in pets:
-            breed_display = pet.breed if pet.breed else 'No especificado'
-            age_display = f"{pet.age} años" if pet.age is not None else 'No especificado'
-            
-            html_content += f"""
-            <div class="pet-card">
-              <div class="pet-header">
-                <div class="pet-icon">{'🐕' if pet.species == 'perro' else '🐱' if pet.species == 'gato' else '🐾'}</div>
-                <div>
-                  <h3 class="pet-name">{pet.name}</h3>
-                  <div class="pet-id">ID: #{pet.id}</div>
-                </div>
-              </div>
-              
-              <div class="pet-details">
-                <div class="pet-detail-row">
-                  <span class="pet-detail-label">Especie:</span>
-                  <span class="pet-detail-value">{pet.species.title()}</span>
-                </div>
-                <div class="pet-detail-row">
-                  <span class="pet-detail-label">Raza:</span>
-                  <span class="pet-detail-value">{breed_display}</span>
-                </div>
-                <div class="pet-detail-row">
-                  <span class="pet-detail-label">Edad:</span>
-                  <span class="pet-detail-value">{age_display}</span>
-                </div>
-              </div>
-              
-              <div class="pet-actions">
-                <a href="/pets/{pet.id}/view" class="btn btn-primary">Ver Detalles</a>
-                <a href="/pets/{pet.id}/clinical-history" class="btn btn-secondary">Historia Clínica</a>
-              </div>
-            </div>
-            """
-        html_content += '</div>'
-    else:
-        html_content += """
-          <div class="no-pets">
-            <div class="no-pets-icon">🐾</div>
-            <p style="font-size: 1.2rem; margin: 0;">Este dueño no tiene mascotas registradas</p>
-            <p style="color: #999; margin: 0.5rem 0 0;">Puedes agregar mascotas desde el panel de administración</p>
-          </div>
-        """
-    
-    html_content += f"""
-          </div>
-          
-          <div class="timestamp">
-            <p>📅 Registrado: {owner.created_at.strftime('%d/%m/%Y %H:%M') if owner.created_at else 'N/A'}</p>
-            <p>🔄 Última actualización: {owner.updated_at.strftime('%d/%m/%Y %H:%M') if owner.updated_at else 'N/A'}</p>
-          </div>
-          
-          <div style="text-align: center;">
-            <a href="/owners/search/view" class="back-link">⬅️ Volver a la búsqueda</a>
-          </div>
-        </div>
-      </div>
-    </body>
-    </html>
-    """
-    
-    return html_content
+    return render("owners/view.html", owner=owner, pets=pets)
 
 @router.get("/{owner_id}/edit", response_class=HTMLResponse)
 def edit_owner_form(owner_id: int, db: Session = Depends(get_db)):
@@ -1,12 +1,18 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Form, Request, Response
 from fastapi.responses import HTMLResponse
-from datetime import date
-from sqlalchemy.orm import Session
+from datetime import date, datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload
 
-from app.db.database import get_db
+from app.api.pagination import keyset_page, set_page_headers
+from app.core.config import settings
+from app.core.templates import render, stream
+from app.db.database import get_db, stream_scalars
 from app.db import models
 from app.schemas.pet import PetCreate, PetRead
+from app.services.search import apply_search
+from app.services.stats import stats_service
 
 router = APIRouter()
 
@@ -411,12 +417,27 @@ def create_pet_form(
 
 @router.get("/", response_model=List[PetRead])
 def list_pets(
-    page: int = Query(1, ge=1),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    page_number: Optional[int] = Query(
+        None, alias="page", ge=1, deprecated=True, description="Obsoleto (OFFSET): usar cursor"
+    ),
     page_size: int = Query(50, ge=1, le=200),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
 ):
-    q = db.query(models.Pet).order_by(models.Pet.id.asc())
-    return q.offset((page - 1) * page_size).limit(page_size).all()
+    page = keyset_page(
+        db.query(models.Pet),
+        models.Pet.id,
+        models.Pet.id,
+        page_size,
+        cursor,
+        page=page_number,
+    )
+    total = stats_service.get(db)["pets"] if include_total else None
+    set_page_headers(request, response, page, total)
+    return page.items
 
 
 @router.get("/view", response_class=HTMLResponse)
@@ -428,7 +449,12 @@ def list_pets_view(
     """Vista HTML amigable de todas las mascotas."""
     q = db.query(models.Pet).order_by(models.Pet.id.desc())
     total_count = q.count()
-    pets = q.offset((page - 1) * page_size).limit(page_size).all()
+    pets = (
+        q.options(joinedload(models.Pet.owner))
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
     
     total_pages = (total_count + page_size - 1) // page_size
     
@@ -760,344 +786,27 @@ def search_pets_view(
     db: Session = Depends(get_db)
 ):
     """Vista HTML de búsqueda de mascotas con filtros."""
-    # Construir query
-    query = db.query(models.Pet)
-    
-    # Filtrar por nombre de mascota
-    if name:
-        query = query.filter(models.Pet.name.ilike(f"%{name}%"))
-    
-    # Filtrar por especie
-    if species:
-        query = query.filter(models.Pet.species.ilike(f"%{species}%"))
-    
-    # Filtrar por nombre de dueño
-    if owner_name:
-        query = query.join(models.Owner).filter(models.Owner.name.ilike(f"%{owner_name}%"))
-    
-    pets = query.order_by(models.Pet.name.asc()).all()
-    
-    # Construir descripción de filtros
-    filter_parts = []
-    if name:
-        filter_parts.append(f"Nombre: {name}")
-    if species:
-        filter_parts.append(f"Especie: {species}")
-    if owner_name:
-        filter_parts.append(f"Dueño: {owner_name}")
-    
-    filter_text = " | ".join(filter_parts) if filter_parts else "Sin filtros"
-    
-    # Generar HTML
-    html_content = f"""
-    <!doctype html>
-    <html lang="es">
-    <head>
-      <meta charset="utf-8" />
-      <meta name="viewport" content="width=device-width, initial-scale=1" />
-      <title>🐾 Búsqueda de Mascotas - Veterinaria Inteligente</title>
-      <style>
-        * {{ box-sizing: border-box; }}
-        body {{
-          font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-          margin: 0;
-          padding: 0;
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          height: 100vh;
-          overflow: hidden;
-        }}
-        .container {{
-          height: 100vh;
-          display: flex;
-          flex-direction: column;
-          overflow: hidden;
-        }}
-        header {{
-          text-align: center;
-          padding: 0.8rem 1rem;
-          background: rgba(255,255,255,0.98);
-          border-bottom: 2px solid #e2e8f0;
-          flex-shrink: 0;
-        }}
-        header h1 {{
-          margin: 0;
-          font-size: 2rem;
-          color: #333;
-          font-weight: 700;
-          display: inline-flex;
-          align-items: center;
-          gap: 0.5rem;
-        }}
-        header p {{
-          margin: 0.3rem 0 0;
-          color: #666;
-          font-size: 0.95rem;
-        }}
-        .summary {{
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          color: white;
-          padding: 1rem 2rem;
-          display: flex;
-          justify-content: space-between;
-          align-items: center;
-          flex-shrink: 0;
-        }}
-        .summary .count {{
-          font-size: 2.5rem;
-          font-weight: 700;
-        }}
-        .summary .label {{
-          font-size: 1rem;
-        }}
-        .main-content {{
-          flex: 1;
-          overflow-y: auto;
-          padding: 1rem;
-          background: rgba(255,255,255,0.95);
-        }}
-        .pets-grid {{
-          display: grid;
-          grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
-          gap: 1rem;
-          max-width: 1400px;
-          margin: 0 auto;
-        }}
-        .pet-card {{
-          background: #f8f9fa;
-          border-left: 4px solid #667eea;
-          border-radius: 8px;
-          padding: 1rem;
-          box-shadow: 0 2px 6px rgba(0,0,0,0.1);
-          transition: transform 0.2s, box-shadow 0.2s;
-        }}
-        .pet-card:hover {{
-          transform: translateY(-2px);
-          box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
-        .pet-header {{
-          display: flex;
-          align-items: center;
-          gap: 0.8rem;
-          margin-bottom: 0.8rem;
-          padding-bottom: 0.8rem;
-          border-bottom: 2px solid #e0e0e0;
-        }}
-        .pet-icon {{
-          font-size: 2.5rem;
-        }}
-        .pet-name {{
-          font-size: 1.4rem;
-          font-weight: 700;
-          color: #333;
-          margin: 0;
-        }}
-        .pet-species {{
-          color: #667eea;
-          font-size: 0.9rem;
-          font-weight: 600;
-          margin: 0.2rem 0 0;
-        }}
-        .pet-info {{
-          display: grid;
-          gap: 0.5rem;
-          margin-bottom: 0.8rem;
-        }}
-        .info-row {{
-          display: flex;
-          gap: 0.5rem;
-          align-items: flex-start;
-          font-size: 0.85rem;
-        }}
-        .info-label {{
-          font-weight: 600;
-          color: #555;
-          min-width: 75px;
-        }}
-        .info-value {{
-          color: #333;
-        }}
-        .owner-section {{
-          background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-          color: white;
-          padding: 0.8rem;
-          border-radius: 6px;
-          margin-bottom: 0.8rem;
-          font-size: 0.85rem;
-        }}
-        .owner-section h4 {{
-          margin: 0 0 0.4rem;
-          font-size: 1rem;
-        }}
-        .owner-section p {{
-          margin: 0.25rem 0;
-        }}
-        .actions {{
-          display: flex;
-          gap: 0.5rem;
-        }}
-        .btn {{
-          padding: 0.5rem 0.9rem;
-          border-radius: 6px;
-          text-decoration: none;
-          font-size: 0.85rem;
-          font-weight: 600;
-          transition: all 0.2s;
-          display: inline-block;
-          text-align: center;
-          flex: 1;
-        }}
-        .btn-primary {{
-          background: #667eea;
-          color: white;
-        }}
-        .btn-primary:hover {{
-          background: #764ba2;
-        }}
-        .btn-success {{
-          background: #11998e;
-          color: white;
-        }}
-        .btn-success:hover {{
-          background: #38ef7d;
-        }}
-        .no-results {{
-          text-align: center;
-          padding: 3rem;
-          color: #666;
-          font-size: 1.2rem;
-        }}
-        .no-results-icon {{
-          font-size: 4rem;
-          margin-bottom: 1rem;
-        }}
-        .footer {{
-          text-align: center;
-          padding: 0.8rem;
-          background: rgba(255,255,255,0.95);
-          border-top: 1px solid #e2e8f0;
-          flex-shrink: 0;
-        }}
-        .back-link {{
-          display: inline-block;
-          padding: 0.6rem 1.5rem;
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          color: white;
-          text-decoration: none;
-          border-radius: 8px;
-          font-weight: 600;
-          font-size: 0.95rem;
-          transition: transform 0.2s;
-        }}
-        .back-link:hover {{
-          transform: translateY(-1px);
-        }}
-      </style>
-    </head>
-    <body>
-      <div class="container">
-        <header>
-          <h1>🐾 Búsqueda de Mascotas</h1>
-          <p>Resultados de la búsqueda</p>
-        </header>
-        
-        <div class="summary">
-          <div>
-            <div class="count">{len(pets)}</div>
-            <div class="label">mascotas encontradas</div>
-          </div>
-        </div>
-        
-        <div class="main-content">
-          <div class="pets-grid">
-    """
+    # Índice de texto completo: palabras por prefijo, sin acentos, por relevancia
+    stmt = apply_search(
+        db,
+        select(models.Pet),
+        "pets",
+        {"name": name, "species": species, "owner": owner_name},
+    )
     
-    if pets:
-        for pet in pets:
-            # Emoji de especie
-            species_lower = pet.species.lower()
-            if 'perro' in species_lower or 'dog' in species_lower:
-                species_emoji = '🐕'
-            elif 'gato' in species_lower or 'cat' in species_lower:
-                species_emoji = '🐈'
-            elif 'ave' in species_lower or 'pájaro' in species_lower or 'bird' in species_lower:
-                species_emoji = '🦜'
-            elif 'conejo' in species_lower or 'rabbit' in species_lower:
-                species_emoji = '🐰'
-            elif 'hámster' in species_lower or 'hamster' in species_lower:
-                species_emoji = '🐹'
-            else:
-                species_emoji = '🐾'
-            
-            # Calcular edad si hay fecha de nacimiento
-            age_text = ""
-            if pet.birth_date is not None:
-                from datetime import datetime
-                today = datetime.now().date()
-                age_years = (today - pet.birth_date).days // 365
-                age_text = f" - {age_years} años" if age_years >= 1 else " - Menos de 1 año"
-            
-            breed_text = pet.breed if pet.breed is not None else "No especificado"
-            notes_html = f'<div class="info-row"><span class="info-label">📝 Notas:</span><span class="info-value">{pet.notes}</span></div>' if pet.notes is not None else ''
-            
-            owner_phone = pet.owner.phone if pet.owner.phone else 'No especificado'
-            owner_email = pet.owner.email if pet.owner.email else 'No especificado'
-            
-            html_content += f"""
-            <div class="pet-card">
-              <div class="pet-header">
-                <div class="pet-icon">{species_emoji}</div>
-                <div>
-                  <h2 class="pet-name">{pet.name}</h2>
-                  <p class="pet-species">{pet.species} - {breed_text}</p>
-                </div>
-              </div>
-              
-              <div class="pet-info">
-                <div class="info-row">
-                  <span class="info-label">🆔 ID:</span>
-                  <span class="info-value">#{pet.id}</span>
-                </div>
-                <div class="info-row">
-                  <span class="info-label">🎂 Nacimiento:</span>
-                  <span class="info-value">{pet.birth_date.strftime('%d/%m/%Y') if pet.birth_date is not None else 'No especificado'}{age_text}</span>
-                </div>
-                {notes_html}
-              </div>
-              
-              <div class="owner-section">
-                <h4>👤 Dueño: {pet.owner.name}</h4>
-                <p><strong>📞 Teléfono:</strong> {owner_phone}</p>
-                <p><strong>📧 Email:</strong> {owner_email}</p>
-              </div>
-              
-              <div class="actions">
-                <a href="/pets/{pet.id}/view" class="btn btn-primary" target="_blank">👁️ Ver detalles</a>
-                <a href="/pets/{pet.id}/clinical-history" class="btn btn-success" target="_blank">📋 Historia clínica</a>
-              </div>
-            </div>
-            """
-    else:
-        html_content += """
-            <div class="no-results" style="grid-column: 1 / -1;">
-              <div class="no-results-icon">🔍</div>
-              <p>No se encontraron mascotas con los filtros seleccionados.</p>
-              <p style="font-size: 0.95rem; color: #999;">Intenta ajustar los criterios de búsqueda.</p>
-            </div>
-        """
+    total = db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
     
-    html_content += """
-          </div>
-        </div>
-        
-        <div class="footer">
-          <a href="/vet/clinica" class="back-link">⬅️ Volver a Atención Clínica</a>
-        </div>
-      </div>
-    </body>
-    </html>
-    """
+    # Las mascotas se leen por lotes mientras se envía la página
+    rows = stream_scalars(
+        stmt.options(joinedload(models.Pet.owner)).order_by(models.Pet.name.asc(), models.Pet.id.asc()),
+        settings.html_stream_batch_size,
+    )
     
-    return html_content
+    return stream(
+        "pets/search.html",
+        total=total,
+        pets=({"pet": pet, "species_emoji": _species_emoji(pet.species)} for pet in rows),
+    )
 
 
 @router.get("/{pet_id}", response_model=PetRead)
@@ -1115,474 +824,86 @@ def get_pet_view(pet_id: int, db: Session = Depends(get_db)):
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
     
-    # Calcular edad
-    if pet.birth_date is not None:
-        from datetime import datetime
-        today = datetime.now().date()
-        age_years = (today - pet.birth_date).days // 365
-        age_text = f"{age_years} años" if age_years >= 1 else "Menos de 1 año"
-        birth_display = f"{pet.birth_date.strftime('%d/%m/%Y')} ({age_text})"
-    else:
-        birth_display = "No especificado"
-    
-    breed_display = pet.breed if pet.breed is not None else "No especificado"
-    notes_display = pet.notes if pet.notes is not None else "Sin notas"
-    
-    # Emoji de especie
-    species_lower = pet.species.lower()
+    species_emoji = _species_emoji(pet.species)
+
+    records = sorted(pet.clinical_records or [], key=lambda r: r.visit_date, reverse=True)
+    today = date.today()
+    vaccinations = [
+        _vaccination_item(v, today)
+        for v in sorted(pet.vaccinations or [], key=lambda v: v.due_date, reverse=True)
+    ]
+    now = datetime.now()
+    appointments = [
+        _appointment_item(a, now)
+        for a in sorted(pet.appointments or [], key=lambda a: a.appointment_date, reverse=True)
+    ]
+
+    return render(
+        "pets/view.html",
+        pet=pet,
+        species_emoji=species_emoji,
+        records=records,
+        vaccinations=vaccinations,
+        appointments=appointments,
+    )
+
+
+def _species_emoji(species: str) -> str:
+    """Emoji de la especie (🐾 si no es una de las conocidas)."""
+    species_lower = species.lower()
     if 'perro' in species_lower or 'dog' in species_lower:
-        species_emoji = '🐕'
+        return '🐕'
     elif 'gato' in species_lower or 'cat' in species_lower:
-        species_emoji = '🐈'
+        return '🐈'
     elif 'ave' in species_lower or 'pájaro' in species_lower or 'bird' in species_lower:
-        species_emoji = '🦜'
+        return '🦜'
     elif 'conejo' in species_lower or 'rabbit' in species_lower:
-        species_emoji = '🐰'
+        return '🐰'
     elif 'hámster' in species_lower or 'hamster' in species_lower:
-        species_emoji = '🐹'
-    else:
-        species_emoji = '🐾'
-    
-    # Obtener récords clínicos
-    records = pet.clinical_records if pet.clinical_records else []
-    
-    # Obtener vacunas
-    vaccinations = pet.vaccinations if pet.vaccinations else []
-    
-    # Obtener turnos
-    appointments = pet.appointments if pet.appointments else []
-    
-    html_content = f"""
-    <!doctype html>
-    <html lang="es">
-    <head>
-      <meta charset="utf-8" />
-      <meta name="viewport" content="width=device-width, initial-scale=1" />
-      <title>{species_emoji} {pet.name} - Detalles - Veterinaria Inteligente</title>
-      <style>
-        * {{ box-sizing: border-box; }}
-        body {{
-          font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-          margin: 0;
-          padding: 0;
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          height: 100vh;
-          overflow: hidden;
-        }}
-        .container {{
-          height: 100vh;
-          display: flex;
-          flex-direction: column;
-          overflow: hidden;
-        }}
-        header {{
-          text-align: center;
-          padding: 0.8rem 1rem;
-          background: rgba(255,255,255,0.98);
-          border-bottom: 2px solid #e2e8f0;
-          flex-shrink: 0;
-        }}
-        header h1 {{
-          margin: 0;
-          font-size: 2rem;
-          color: #333;
-          font-weight: 700;
-        }}
-        .pet-header {{
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          color: white;
-          padding: 1rem 1.5rem;
-          display: flex;
-          align-items: center;
-          gap: 1rem;
-          flex-shrink: 0;
-        }}
-        .pet-icon {{
-          font-size: 3rem;
-        }}
-        .pet-info h2 {{
-          margin: 0;
-          font-size: 1.8rem;
-        }}
-        .pet-id {{
-          opacity: 0.9;
-          font-size: 0.85rem;
-          margin-top: 0.2rem;
-        }}
-        .main-content {{
-          flex: 1;
-          overflow-y: auto;
-          padding: 1rem;
-          background: rgba(255,255,255,0.95);
-        }}
-        .info-grid {{
-          display: grid;
-          grid-template-columns: 1fr 1fr;
-          gap: 1rem;
-          margin-bottom: 1rem;
-          max-width: 1200px;
-          margin-left: auto;
-          margin-right: auto;
-        }}
-        .info-card {{
-          background: #f8f9fa;
-          border-left: 4px solid #667eea;
-          border-radius: 8px;
-          padding: 1rem;
-          box-shadow: 0 2px 6px rgba(0,0,0,0.1);
-        }}
-        .info-card h3 {{
-          margin: 0 0 0.7rem;
-          color: #667eea;
-          font-size: 1.1rem;
-        }}
-        .info-row {{
-          display: flex;
-          gap: 0.4rem;
-          margin-bottom: 0.5rem;
-          align-items: flex-start;
-          font-size: 0.85rem;
-        }}
-        .info-label {{
-          font-weight: 600;
-          color: #555;
-          min-width: 90px;
-        }}
-        .info-value {{
-          color: #333;
-          flex: 1;
-        }}
-        .owner-section {{
-          background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-          color: white;
-          padding: 1rem;
-          border-radius: 8px;
-          margin-bottom: 1rem;
-          max-width: 1200px;
-          margin-left: auto;
-          margin-right: auto;
-        }}
-        .owner-section h3 {{
-          margin: 0 0 0.6rem;
-          font-size: 1.1rem;
-        }}
-        .owner-section > div {{
-          display: grid;
-          gap: 0.4rem;
-          font-size: 0.85rem;
-        }}
-        .section {{
-          margin-bottom: 1rem;
-          max-width: 1200px;
-          margin-left: auto;
-          margin-right: auto;
-        }}
-        .section h3 {{
-          color: #333;
-          font-size: 1.2rem;
-          margin-bottom: 0.7rem;
-          padding-bottom: 0.4rem;
-          border-bottom: 2px solid #e0e0e0;
-        }}
-        .list-item {{
-          background: #f8f9fa;
-          padding: 0.8rem;
-          border-radius: 8px;
-          margin-bottom: 0.7rem;
-          border-left: 4px solid #667eea;
-          box-shadow: 0 2px 4px rgba(0,0,0,0.08);
-          transition: all 0.2s;
-        }}
-        .list-item:hover {{
-          transform: translateX(2px);
-          box-shadow: 0 3px 8px rgba(0,0,0,0.12);
-        }}
-        .list-item-title {{
-          font-weight: 700;
-          color: #333;
-          margin-bottom: 0.4rem;
-          font-size: 0.95rem;
-        }}
-        .list-item-text {{
-          color: #666;
-          font-size: 0.8rem;
-          line-height: 1.5;
-        }}
-        .badge {{
-          display: inline-block;
-          padding: 0.25rem 0.6rem;
-          border-radius: 12px;
-          font-size: 0.75rem;
-          font-weight: 600;
-          margin-right: 0.4rem;
-          box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .badge-success {{ 
-          background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%); 
-          color: #155724;
-        }}
-        .badge-warning {{ 
-          background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%); 
-          color: #856404;
-        }}
-        .badge-danger {{ 
-          background: linear-gradient(135deg, #f8d7da 0%, #f5c6cb 100%); 
-          color: #721c24;
-        }}
-        .badge-info {{ 
-          background: linear-gradient(135deg, #d1ecf1 0%, #bee5eb 100%); 
-          color: #0c5460;
-        }}
-        .empty-state {{
-          text-align: center;
-          padding: 1.5rem;
-          color: #999;
-          font-style: italic;
-          font-size: 0.9rem;
-        }}
-        .footer {{
-          text-align: center;
-          padding: 0.8rem;
-          background: rgba(255,255,255,0.95);
-          border-top: 1px solid #e2e8f0;
-          flex-shrink: 0;
-        }}
-        .actions {{
-          display: flex;
-          gap: 0.6rem;
-          flex-wrap: wrap;
-          justify-content: center;
-        }}
-        .btn {{
-          padding: 0.5rem 1rem;
-          border-radius: 6px;
-          text-decoration: none;
-          font-weight: 600;
-          transition: all 0.2s;
-          display: inline-block;
-          text-align: center;
-          font-size: 0.85rem;
-        }}
-        .btn-primary {{
-          background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-          color: white;
-        }}
-        .btn-primary:hover {{
-          transform: translateY(-1px);
-          box-shadow: 0 3px 10px rgba(102, 126, 234, 0.4);
-        }}
-        .btn-secondary {{
-          background: #6c757d;
-          color: white;
-        }}
-        .btn-secondary:hover {{
-          background: #5a6268;
-          transform: translateY(-1px);
-        }}
-      </style>
-    </head>
-    <body>
-      <div class="container">
-        <header>
-          <h1>{species_emoji} Detalles de {pet.name}</h1>
-        </header>
-        
-        <div class="pet-header">
-          <div class="pet-icon">{species_emoji}</div>
-          <div class="pet-info">
-            <h2>{pet.name}</h2>
-            <p class="pet-id">ID: #{pet.id} | {pet.species}</p>
-          </div>
-        </div>
-        
-        <div class="main-content">
-          <div class="info-grid">
-            <div class="info-card">
-              <h3>📋 Información Básica</h3>
-              <div class="info-row">
-                <span class="info-label">Especie:</span>
-                <span class="info-value">{pet.species}</span>
-              </div>
-              <div class="info-row">
-                <span class="info-label">Raza:</span>
-                <span class="info-value">{breed_display}</span>
-              </div>
-              <div class="info-row">
-                <span class="info-label">Fecha de Nac.:</span>
-                <span class="info-value">{birth_display}</span>
-              </div>
-            </div>
-            
-            <div class="info-card">
-              <h3>📝 Notas</h3>
-              <p style="margin: 0; color: #666; font-size: 0.85rem;">{notes_display}</p>
-            </div>
-          </div>
-          
-          <div class="owner-section">
-            <h3>👤 Dueño: {pet.owner.name}</h3>
-            <div>
-              <div>📞 {pet.owner.phone if pet.owner.phone else 'No especificado'}</div>
-              <div>📧 {pet.owner.email if pet.owner.email else 'No especificado'}</div>
-            </div>
-          </div>
-          
-          <div class="section">
-            <h3>📋 Récords Clínicos</h3>
-    """
-    
-    if records:
-        for record in sorted(records, key=lambda r: r.visit_date, reverse=True):
-            symptoms_html = f'<div class="list-item-text"><strong>Síntomas:</strong> {record.symptoms}</div>' if record.symptoms else ''
-            treatment_html = f'<div class="list-item-text"><strong>Tratamiento:</strong> {record.treatment}</div>' if record.treatment else ''
-            medications_html = f'<div class="list-item-text"><strong>Medicamentos:</strong> {record.medications}</div>' if record.medications else ''
-            
-            html_content += f"""
-            <div class="list-item">
-              <div class="list-item-title">🗓️ {record.visit_date.strftime('%d/%m/%Y')}</div>
-              <div class="list-item-text"><strong>Diagnóstico:</strong> {record.diagnosis}</div>
-              {symptoms_html}
-              {treatment_html}
-              {medications_html}
-            </div>
-            """
+        return '🐹'
+    return '🐾'
+
+
+def _vaccination_item(vaccination: models.Vaccination, today: date) -> dict:
+    """Estado de una vacuna según los días hasta el vencimiento."""
+    days_until_due = (vaccination.due_date - today).days
+    if days_until_due < 0:
+        tone, badge = "danger", "⚠️ Vencida"
+        days_text = f"Vencida hace {abs(days_until_due)} días"
+    elif days_until_due <= 30:
+        tone, badge = "warning", "⏰ Próxima a vencer"
+        days_text = f"Vence en {days_until_due} días"
     else:
-        html_content += '<div class="empty-state">Sin récords clínicos registrados</div>'
-    
-    html_content += """
-          </div>
-          
-          <div class="section">
-            <h3>💉 Vacunas</h3>
-    """
-    
-    if vaccinations:
-        from datetime import datetime
-        today = datetime.now().date()
-        for vaccination in sorted(vaccinations, key=lambda v: v.due_date, reverse=True):
-            # Calcular días hasta vencimiento
-            days_until_due = (vaccination.due_date - today).days
-            
-            # Determinar estado y estilo
-            if days_until_due < 0:
-                status_badge = '<span class="badge badge-danger">⚠️ Vencida</span>'
-                border_color = '#f8d7da'
-                days_text = f'<span style="color: #dc3545; font-weight: 600;">Vencida hace {abs(days_until_due)} días</span>'
-            elif days_until_due <= 30:
-                status_badge = '<span class="badge badge-warning">⏰ Próxima a vencer</span>'
-                border_color = '#fff3cd'
-                days_text = f'<span style="color: #856404; font-weight: 600;">Vence en {days_until_due} días</span>'
-            else:
-                status_badge = '<span class="badge badge-success">✅ Vigente</span>'
-                border_color = '#d4edda'
-                days_text = f'<span style="color: #155724; font-weight: 600;">Vence en {days_until_due} días</span>'
-            
-            notes_html = f'<div class="list-item-text">📝 <strong>Notas:</strong> {vaccination.notes}</div>' if vaccination.notes else ''
-            
-            html_content += f"""
-            <div class="list-item" style="border-left-color: {border_color}; border-left-width: 5px;">
-              <div class="list-item-title" style="display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 0.4rem;">
-                <span style="font-size: 0.95rem;">💉 {vaccination.vaccine_name}</span>
-                {status_badge}
-              </div>
-              <div class="list-item-text" style="margin-top: 0.5rem; display: grid; gap: 0.4rem;">
-                <div style="display: flex; gap: 1rem; flex-wrap: wrap;">
-                  <div>📅 <strong>Aplicada:</strong> {vaccination.applied_date.strftime('%d/%m/%Y')}</div>
-                  <div>⏰ <strong>Vencimiento:</strong> {vaccination.due_date.strftime('%d/%m/%Y')}</div>
-                </div>
-                <div>{days_text}</div>
-              </div>
-              {notes_html}
-            </div>
-            """
+        tone, badge = "success", "✅ Vigente"
+        days_text = f"Vence en {days_until_due} días"
+    return {"vaccination": vaccination, "tone": tone, "badge": badge, "days_text": days_text}
+
+
+def _appointment_item(appointment: models.Appointment, now: datetime) -> dict:
+    """Estado de un turno y tiempo relativo respecto de ahora."""
+    if appointment.status == 'attended':
+        tone, badge = "success", "✅ Atendido"
+    elif appointment.status == 'canceled':
+        tone, badge = "danger", "❌ Cancelado"
+    elif appointment.status == 'scheduled':
+        if appointment.appointment_date < now:
+            tone, badge = "warning", "⏰ Pendiente (pasado)"
+        else:
+            tone, badge = "info", "📅 Programado"
     else:
-        html_content += '<div class="empty-state">Sin vacunas registradas</div>'
-    
-    html_content += """
-          </div>
-          
-          <div class="section">
-            <h3>📅 Turnos</h3>
-    """
-    
-    if appointments:
-        from datetime import datetime
-        today = datetime.now()
-        
-        for appointment in sorted(appointments, key=lambda a: a.appointment_date, reverse=True):
-            # Determinar si es pasado o futuro
-            is_past = appointment.appointment_date < today
-            
-            # Estilo según estado
-            if appointment.status == 'attended':
-                status_badge = '<span class="badge badge-success">✅ Atendido</span>'
-                border_color = '#d4edda'
-            elif appointment.status == 'canceled':
-                status_badge = '<span class="badge badge-danger">❌ Cancelado</span>'
-                border_color = '#f8d7da'
-            elif appointment.status == 'scheduled':
-                if is_past:
-                    status_badge = '<span class="badge badge-warning">⏰ Pendiente (pasado)</span>'
-                    border_color = '#fff3cd'
-                else:
-                    status_badge = '<span class="badge badge-info">📅 Programado</span>'
-                    border_color = '#d1ecf1'
-            else:
-                status_badge = f'<span class="badge badge-info">{appointment.status}</span>'
-                border_color = '#e0e0e0'
-            
-            # Calcular tiempo relativo
-            time_diff = appointment.appointment_date - today
-            if time_diff.days > 0:
-                time_text = f'En {time_diff.days} días'
-            elif time_diff.days == 0:
-                hours = time_diff.seconds // 3600
-                if hours > 0:
-                    time_text = f'Hoy en {hours} horas'
-                else:
-                    time_text = 'Hoy'
-            elif time_diff.days == -1:
-                time_text = 'Ayer'
-            else:
-                time_text = f'Hace {abs(time_diff.days)} días'
-            
-            notes_html = f'<div class="list-item-text" style="margin-top: 0.4rem;">📝 <strong>Notas:</strong> {appointment.notes}</div>' if appointment.notes else ''
-            
-            html_content += f"""
-            <div class="list-item" style="border-left-color: {border_color}; border-left-width: 5px;">
-              <div class="list-item-title" style="display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 0.4rem;">
-                <span style="font-size: 0.95rem;">🗓️ {appointment.appointment_date.strftime('%d/%m/%Y %H:%M')}</span>
-                {status_badge}
-              </div>
-              <div class="list-item-text" style="margin-top: 0.5rem; display: grid; gap: 0.4rem;">
-                <div style="display: flex; gap: 1rem; flex-wrap: wrap;">
-                  <div><strong>Motivo:</strong> {appointment.reason}</div>
-                  <div style="color: #666; font-style: italic;">({time_text})</div>
-                </div>
-              </div>
-              {notes_html}
-            </div>
-            """
+        tone, badge = "neutral", str(appointment.status)
+
+    time_diff = appointment.appointment_date - now
+    if time_diff.days > 0:
+        time_text = f'En {time_diff.days} días'
+    elif time_diff.days == 0:
+        hours = time_diff.seconds // 3600
+        time_text = f'Hoy en {hours} horas' if hours > 0 else 'Hoy'
+    elif time_diff.days == -1:
+        time_text = 'Ayer'
     else:
-        html_content += '<div class="empty-state">Sin turnos registrados</div>'
-    
-    html_content += f"""
-          </div>
-        </div>
-        
-        <div class="footer">
-          <div class="actions">
-            <a href="/pets/{pet.id}/clinical-history" class="btn btn-primary">📋 Ver Historia Clínica Completa</a>
-            <a href="/pets/search/view" class="btn btn-secondary">⬅️ Volver a búsqueda</a>
-            <a href="/vet/clinica" class="btn btn-secondary">🏥 Panel Clínico</a>
-          </div>
-        </div>
-      </div>
-    </body>
-    </html>
-    """
-    
-    return html_content
+        time_text = f'Hace {abs(time_diff.days)} días'
+    return {"appointment": appointment, "tone": tone, "badge": badge, "time_text": time_text}
 
 
 @router.get("/{pet_id}/clinical-history", response_class=HTMLResponse)
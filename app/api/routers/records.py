@@ -1,11 +1,15 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Form, Request, Response
 from fastapi.responses import HTMLResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.pagination import keyset_page, set_page_headers
 from app.db.database import get_db
 from app.db import models
 from app.schemas.clinical_record import ClinicalRecordCreate, ClinicalRecordRead
+from app.services.search import apply_search, tokens
+from app.services.stats import stats_service
 
 router = APIRouter()
 
@@ -324,17 +328,49 @@ def create_record_form(
 
 @router.get("/", response_model=List[ClinicalRecordRead])
 def list_records(
+    request: Request,
+    response: Response,
     pet_id: Optional[int] = Query(default=None),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
+    page_number: Optional[int] = Query(
+        None, alias="page", ge=1, deprecated=True, description="Obsoleto (OFFSET): usar cursor"
+    ),
     page_size: int = Query(50, ge=1, le=200),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
 ):
-    q = db.query(models.ClinicalRecord).order_by(
-        models.ClinicalRecord.created_at.desc()
-    )
+    # Más recientes primero. El id crece con created_at (que puede ser NULL
+    # en registros viejos), así que sirve de clave del cursor.
+    q = db.query(models.ClinicalRecord)
     if pet_id is not None:
         q = q.filter(models.ClinicalRecord.pet_id == pet_id)
-    return q.offset((page - 1) * page_size).limit(page_size).all()
+    page = keyset_page(
+        q,
+        models.ClinicalRecord.id,
+        models.ClinicalRecord.id,
+        page_size,
+        cursor,
+        descending=True,
+        page=page_number,
+    )
+    total = None
+    if include_total:
+        total = q.count() if pet_id is not None else stats_service.get(db)["records"]
+    set_page_headers(request, response, page, total)
+    return page.items
+
+
+@router.get("/search", response_model=List[ClinicalRecordRead])
+def search_records(
+    q: str = Query(..., min_length=1, description="Síntomas, diagnóstico, medicación o mascota"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """Récords clínicos que contienen todas las palabras de `q` (por prefijo, sin acentos), por relevancia."""
+    if not tokens(q):
+        return []
+    stmt = apply_search(db, select(models.ClinicalRecord), "records", {None: q})
+    return db.scalars(stmt.order_by(models.ClinicalRecord.id.desc()).limit(limit)).all()
 
 
 @router.get("/view", response_class=HTMLResponse)
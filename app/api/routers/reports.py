@@ -1,28 +1,53 @@
-from datetime import date, datetime
-from fastapi import APIRouter, Depends, Query
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.db import models
-from app.schemas.report import AttendanceReport
+from app.schemas.report import AttendanceDay, AttendanceReport
+from app.services.attendance import attendance_series, attendance_totals
 
 router = APIRouter()
 
+# Tope de días para la serie diaria (la respuesta tiene una fila por día)
+MAX_SERIES_DAYS = 3660
 
-@router.get("/attendance", response_model=AttendanceReport)
+
+@router.get(
+    "/attendance", response_model=AttendanceReport, response_model_exclude_none=True
+)
 def attendance_report(
     start: date = Query(...),
     end: date = Query(...),
+    series: bool = Query(False, description="Incluir la serie diaria por estado"),
     db: Session = Depends(get_db),
 ):
-    start_dt = datetime(start.year, start.month, start.day)
-    end_dt = datetime(end.year, end.month, end.day, 23, 59, 59)
-    total = db.query(models.Appointment).filter(
-        models.Appointment.date >= start_dt, models.Appointment.date <= end_dt
-    )
-    attended = total.filter(models.Appointment.status == "attended").count()
-    canceled = total.filter(models.Appointment.status == "canceled").count()
-    scheduled = total.filter(models.Appointment.status == "scheduled").count()
-    return AttendanceReport(
-        start=start, end=end, attended=attended, canceled=canceled, scheduled=scheduled
+    """
+    Turnos por estado en [start, end]. Se responde desde el rollup diario
+    (o con un único GROUP BY status si ATTENDANCE_ROLLUP=false).
+    """
+    if end < start:
+        raise HTTPException(status_code=422, detail="end debe ser >= start")
+    totals = attendance_totals(db, start, end)
+    report = AttendanceReport(
+        start=start,
+        end=end,
+        attended=totals["attended"],
+        canceled=totals["canceled"],
+        scheduled=totals["scheduled"],
     )
+    if series:
+        if (end - start).days + 1 > MAX_SERIES_DAYS:
+            raise HTTPException(
+                status_code=422,
+                detail=f"La serie admite como máximo {MAX_SERIES_DAYS} días",
+            )
+        report.series = [
+            AttendanceDay(
+                date=row["date"],
+                attended=row["attended"],
+                canceled=row["canceled"],
+                scheduled=row["scheduled"],
+            )
+            for row in attendance_series(db, start, end)
+        ]
+    return report
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
+from app.api.precompressed import PrecompressedPage
+
 router = APIRouter()
 
 
@@ -338,6 +340,9 @@ HTML_PAGE = """
 """
 
 
+_UI_PAGE = PrecompressedPage(lambda: HTML_PAGE)
+
+
 @router.get("/", response_class=HTMLResponse)
-def ui_home():
-    return HTMLResponse(content=HTML_PAGE)
+def ui_home(request: Request):
+    return _UI_PAGE.response(request)
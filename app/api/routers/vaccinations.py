@@ -1,10 +1,14 @@
 from datetime import date, timedelta
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Form, Request, Response
 from fastapi.responses import HTMLResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload
 
-from app.db.database import get_db
+from app.api.pagination import keyset_page, set_page_headers
+from app.core.config import settings
+from app.core.templates import stream
+from app.db.database import get_db, stream_scalars
 from app.db import models
 from app.schemas.vaccination import VaccinationCreate, VaccinationRead
 
@@ -56,22 +60,34 @@ def create_vaccination_form(
 
 @router.get("/upcoming", response_model=List[VaccinationRead])
 def upcoming_json(
+    request: Request,
+    response: Response,
     days: int = Query(30, ge=1, le=365),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
+    page_number: Optional[int] = Query(
+        None, alias="page", ge=1, deprecated=True, description="Obsoleto (OFFSET): usar cursor"
+    ),
     page_size: int = Query(50, ge=1, le=200),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
 ):
-    """Vacunas próximas en formato JSON."""
+    """Vacunas próximas en formato JSON (cursor sobre due_date, id)."""
     today = date.today()
     limit = today + timedelta(days=days)
-    q = (
-        db.query(models.Vaccination)
-        .filter(
-            models.Vaccination.due_date >= today, models.Vaccination.due_date <= limit
-        )
-        .order_by(models.Vaccination.due_date.asc())
+    q = db.query(models.Vaccination).filter(
+        models.Vaccination.due_date >= today, models.Vaccination.due_date <= limit
     )
-    return q.offset((page - 1) * page_size).limit(page_size).all()
+    page = keyset_page(
+        q,
+        models.Vaccination.due_date,
+        models.Vaccination.id,
+        page_size,
+        cursor,
+        page=page_number,
+    )
+    # El rango usa ix_vaccinations_due_date: el COUNT no recorre la tabla
+    set_page_headers(request, response, page, q.count() if include_total else None)
+    return page.items
 
 
 @router.get("/view", response_class=HTMLResponse)
@@ -94,380 +110,87 @@ def view_vaccinations(
         species_emoji = "🐕" if pet.species.lower() == "perro" else "🐈" if pet.species.lower() == "gato" else "🐾"
         
         # Todas las vacunas del pet
-        vaccinations = (
-            db.query(models.Vaccination)
-            .filter(models.Vaccination.pet_id == pet_id)
-            .order_by(models.Vaccination.due_date.asc())
-            .all()
-        )
+        conditions = [models.Vaccination.pet_id == pet_id]
+        total = _count_vaccinations(db, conditions)
         title = f"{species_emoji} Vacunas de {pet.name}"
-        subtitle = f"Dueño/a: {pet.owner.name} - Total: {len(vaccinations)} vacunas"
+        subtitle = f"Dueño/a: {pet.owner.name} - Total: {total} vacunas"
         gradient = "linear-gradient(135deg, #764ba2 0%, #667eea 100%)"
         color = "#667eea"
-        is_overdue = False  # No aplica cuando vemos todas las vacunas
         list_label = "registradas"
+        empty = ("😊", "Esta mascota aún no tiene vacunas registradas.")
     
     # Determinar tipo de vista
     elif type == "overdue":
         # Vacunas vencidas (due_date < hoy)
-        vaccinations = (
-            db.query(models.Vaccination)
-            .filter(models.Vaccination.due_date < today)
-            .order_by(models.Vaccination.due_date.asc())
-            .all()
-        )
+        conditions = [models.Vaccination.due_date < today]
+        total = _count_vaccinations(db, conditions)
         title = "🚨 Vacunas Vencidas"
         subtitle = "Requieren atención urgente"
         gradient = "linear-gradient(135deg, #dc3545 0%, #c82333 100%)"
         color = "#dc3545"
-        is_overdue = True
         list_label = "vencidas"
+        empty = ("✅", "¡Excelente! No hay vacunas vencidas.")
     else:
         # Vacunas próximas (hoy <= due_date <= hoy + days)
         limit = today + timedelta(days=days)
-        vaccinations = (
-            db.query(models.Vaccination)
-            .filter(
-                models.Vaccination.due_date >= today,
-                models.Vaccination.due_date <= limit
-            )
-            .order_by(models.Vaccination.due_date.asc())
-            .all()
-        )
+        conditions = [
+            models.Vaccination.due_date >= today,
+            models.Vaccination.due_date <= limit
+        ]
+        total = _count_vaccinations(db, conditions)
         title = f"⚠️ Vacunas Próximas ({days} días)"
         subtitle = f"Vencen entre hoy y {limit.strftime('%d/%m/%Y')}"
         gradient = "linear-gradient(135deg, #ffc107 0%, #ff9800 100%)"
         color = "#ff9800"
-        is_overdue = False
         list_label = "próximas a vencer"
+        empty = ("😌", "No hay vacunas próximas a vencer en este período.")
     
-    # Calcular urgencia
-    def get_urgency(vac):
-        delta = (vac.due_date - today).days
-        if delta < 0:
-            return "overdue", abs(delta)
-        elif delta <= 7:
-            return "urgent", delta
-        elif delta <= 30:
-            return "warning", delta
-        else:
-            return "normal", delta
-    
-    # Generar HTML
-    html_content = f"""
-    <!doctype html>
-    <html lang="es">
-    <head>
-      <meta charset="utf-8" />
-      <meta name="viewport" content="width=device-width, initial-scale=1" />
-      <title>{title} - Veterinaria Inteligente</title>
-      <style>
-        * {{ box-sizing: border-box; }}
-        body {{
-          font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-          margin: 0;
-          padding: 2rem;
-          background: {gradient};
-          min-height: 100vh;
-        }}
-        .container {{
-          max-width: 1400px;
-          margin: 0 auto;
-          background: #fff;
-          border-radius: 16px;
-          box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-          padding: 2rem;
-        }}
-        header {{
-          text-align: center;
-          margin-bottom: 2rem;
-          padding-bottom: 1.5rem;
-          border-bottom: 3px solid #f0f0f0;
-        }}
-        header h1 {{
-          margin: 0 0 .5rem;
-          font-size: 2.5rem;
-          color: #333;
-          font-weight: 700;
-        }}
-        header p {{
-          margin: .5rem 0 0;
-          color: #666;
-          font-size: 1.1rem;
-        }}
-        .summary {{
-          background: {gradient};
-          color: white;
-          padding: 2rem;
-          border-radius: 12px;
-          margin-bottom: 2rem;
-          text-align: center;
-        }}
-        .summary h2 {{
-          margin: 0;
-          font-size: 3rem;
-          font-weight: 700;
-        }}
-        .summary p {{
-          margin: 0.5rem 0 0;
-          font-size: 1.2rem;
-          opacity: 0.9;
-        }}
-        .vaccinations-grid {{
-          display: grid;
-          gap: 1rem;
-        }}
-        .vaccination-card {{
-          background: #f8f9fa;
-          border-left: 5px solid {color};
-          border-radius: 8px;
-          padding: 1.5rem;
-          box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-          transition: transform 0.2s, box-shadow 0.2s;
-        }}
-        .vaccination-card:hover {{
-          transform: translateY(-2px);
-          box-shadow: 0 4px 16px rgba(0,0,0,0.15);
-        }}
-        .vaccination-card.overdue {{
-          border-left-color: #dc3545;
-          background: #fff5f5;
-        }}
-        .vaccination-card.urgent {{
-          border-left-color: #ff6b6b;
-          background: #fff9f9;
-        }}
-        .vaccination-card.warning {{
-          border-left-color: #ffc107;
-          background: #fffef5;
-        }}
-        .vaccination-header {{
-          display: flex;
-          justify-content: space-between;
-          align-items: center;
-          margin-bottom: 1rem;
-          flex-wrap: wrap;
-          gap: 1rem;
-        }}
-        .vaccination-name {{
-          font-size: 1.5rem;
-          font-weight: 700;
-          color: #333;
-        }}
-        .due-date {{
-          font-size: 1.2rem;
-          color: #666;
-          font-weight: 600;
-        }}
-        .urgency-badge {{
-          padding: 0.5rem 1rem;
-          border-radius: 20px;
-          font-size: 0.85rem;
-          font-weight: 600;
-          text-transform: uppercase;
-        }}
-        .urgency-badge.overdue {{
-          background: #dc3545;
-          color: white;
-        }}
-        .urgency-badge.urgent {{
-          background: #ff6b6b;
-          color: white;
-        }}
-        .urgency-badge.warning {{
-          background: #ffc107;
-          color: #333;
-        }}
-        .urgency-badge.normal {{
-          background: #28a745;
-          color: white;
-        }}
-        .vaccination-details {{
-          display: grid;
-          gap: 0.75rem;
-        }}
-        .detail-row {{
-          display: grid;
-          grid-template-columns: 180px 1fr;
-          gap: 1rem;
-          align-items: start;
-        }}
-        .detail-label {{
-          font-weight: 600;
-          color: #666;
-          display: flex;
-          align-items: center;
-          gap: 0.5rem;
-        }}
-        .detail-value {{
-          color: #333;
-          line-height: 1.5;
-        }}
-        .detail-value.highlight {{
-          font-weight: 600;
-          color: {color};
-          font-size: 1.1rem;
-        }}
-        .contact-info {{
-          background: #e3f2fd;
-          padding: 1rem;
-          border-radius: 8px;
-          margin-top: 0.5rem;
-          border-left: 3px solid #2196f3;
-        }}
-        .contact-info p {{
-          margin: 0.25rem 0;
-          color: #0d47a1;
-        }}
-        .contact-info strong {{
-          color: #01579b;
-        }}
-        .no-vaccinations {{
-          text-align: center;
-          padding: 3rem;
-          color: #666;
-          font-size: 1.2rem;
-        }}
-        .no-vaccinations-icon {{
-          font-size: 4rem;
-          margin-bottom: 1rem;
-        }}
-        .back-link {{
-          display: inline-block;
-          margin-top: 2rem;
-          padding: 0.75rem 1.5rem;
-          background: {gradient};
-          color: white;
-          text-decoration: none;
-          border-radius: 8px;
-          font-weight: 600;
-          transition: transform 0.2s;
-        }}
-        .back-link:hover {{
-          transform: translateY(-2px);
-        }}
-        @media (max-width: 768px) {{
-          .detail-row {{
-            grid-template-columns: 1fr;
-            gap: 0.25rem;
-          }}
-        }}
-      </style>
-    </head>
-    <body>
-      <div class="container">
-        <header>
-          <h1>{title}</h1>
-          <p>{subtitle}</p>
-        </header>
-        
-        <div class="summary">
-          <h2>{len(vaccinations)}</h2>
-          <p>vacunas {list_label}</p>
-        </div>
-        
-        <div class="vaccinations-grid">
-    """
+    # Las vacunas se leen por lotes mientras se envía la página
+    rows = stream_scalars(
+        select(models.Vaccination)
+        .options(joinedload(models.Vaccination.pet).joinedload(models.Pet.owner))
+        .where(*conditions)
+        .order_by(models.Vaccination.due_date.asc(), models.Vaccination.id.asc()),
+        settings.html_stream_batch_size,
+    )
     
-    if vaccinations:
-        for vac in vaccinations:
-            urgency_type, days_diff = get_urgency(vac)
-            
-            urgency_text = {
-                'overdue': f'VENCIDA hace {days_diff} días',
-                'urgent': f'Vence en {days_diff} días',
-                'warning': f'Vence en {days_diff} días',
-                'normal': f'Vence en {days_diff} días'
-            }.get(urgency_type, '')
-            
-            due_date_str = vac.due_date.strftime('%d/%m/%Y')
-            applied_date_str = 'N/A'
-            if vac.applied_date is not None:
-                applied_date_str = vac.applied_date.strftime('%d/%m/%Y')
-            
-            pet_name = vac.pet.name if vac.pet else 'N/A'
-            pet_species = vac.pet.species if vac.pet else 'N/A'
-            pet_breed = vac.pet.breed if vac.pet else 'N/A'
-            
-            # Nombre del dueño
-            if vac.pet and vac.pet.owner:
-                owner_name = vac.pet.owner.name
-                owner_phone = vac.pet.owner.phone if vac.pet.owner.phone else 'N/A'
-                owner_email = vac.pet.owner.email if vac.pet.owner.email else 'N/A'
-            else:
-                owner_name = 'N/A'
-                owner_phone = 'N/A'
-                owner_email = 'N/A'
-            
-            html_content += f"""
-          <div class="vaccination-card {urgency_type}">
-            <div class="vaccination-header">
-              <div class="vaccination-name">💉 {vac.vaccine_name}</div>
-              <div class="urgency-badge {urgency_type}">{urgency_text}</div>
-            </div>
-            <div class="vaccination-details">
-              <div class="detail-row">
-                <span class="detail-label">📅 Vencimiento:</span>
-                <span class="detail-value highlight">{due_date_str}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">📆 Última aplicación:</span>
-                <span class="detail-value">{applied_date_str}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">🐾 Mascota:</span>
-                <span class="detail-value highlight">{pet_name}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">🔍 Especie/Raza:</span>
-                <span class="detail-value">{pet_species} - {pet_breed}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">📋 Estado:</span>
-                <span class="detail-value">{vac.status}</span>
-              </div>
-              <div class="detail-row">
-                <span class="detail-label">🔑 ID Vacuna:</span>
-                <span class="detail-value">#{vac.id}</span>
-              </div>
-            </div>
-            
-            <div class="contact-info">
-              <p><strong>👤 Dueño:</strong> {owner_name}</p>
-              <p><strong>📞 Teléfono:</strong> {owner_phone}</p>
-              <p><strong>📧 Email:</strong> {owner_email}</p>
-            </div>
-          </div>
-            """
+    return stream(
+        "vaccinations/list.html",
+        title=title,
+        subtitle=subtitle,
+        color=color,
+        gradient=gradient,
+        total=total,
+        list_label=list_label,
+        empty=empty,
+        vaccinations=(_vaccination_card(vac, today) for vac in rows),
+    )
+
+
+def _count_vaccinations(db: Session, conditions: list) -> int:
+    return db.scalar(select(func.count(models.Vaccination.id)).where(*conditions))
+
+
+def _vaccination_card(vac: models.Vaccination, today: date) -> dict:
+    """Datos de una tarjeta: urgencia según los días hasta el vencimiento."""
+    delta = (vac.due_date - today).days
+    if delta < 0:
+        urgency, text = "overdue", f"VENCIDA hace {abs(delta)} días"
+    elif delta <= 7:
+        urgency, text = "urgent", f"Vence en {delta} días"
+    elif delta <= 30:
+        urgency, text = "warning", f"Vence en {delta} días"
     else:
-        # Mensaje personalizado dependiendo del contexto
-        if pet_id is not None:
-            no_vac_icon = "😊"
-            no_vac_msg = "Esta mascota aún no tiene vacunas registradas."
-        elif is_overdue:
-            no_vac_icon = "✅"
-            no_vac_msg = "¡Excelente! No hay vacunas vencidas."
-        else:
-            no_vac_icon = "😌"
-            no_vac_msg = "No hay vacunas próximas a vencer en este período."
-        
-        html_content += f"""
-          <div class="no-vaccinations">
-            <div class="no-vaccinations-icon">{no_vac_icon}</div>
-            <p>{no_vac_msg}</p>
-          </div>
-        """
-    
-    html_content += """
-        </div>
-        
-        <div style="text-align: center;">
-          <a href="/vet/gestion" class="back-link">⬅️ Volver a Gestión Veterinaria</a>
-        </div>
-      </div>
-    </body>
-    </html>
-    """
-    
-    return html_content
+        urgency, text = "normal", f"Vence en {delta} días"
+    pet = vac.pet
+    owner = pet.owner if pet else None
+    return {
+        "vac": vac,
+        "urgency": urgency,
+        "urgency_text": text,
+        "pet": pet,
+        "owner_name": owner.name if owner else "N/A",
+        "owner_phone": (owner.phone if owner else None) or "N/A",
+        "owner_email": (owner.email if owner else None) or "N/A",
+    }
 
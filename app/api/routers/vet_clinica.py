@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
+from app.api.precompressed import PrecompressedPage
+
 router = APIRouter()
 
 
@@ -371,6 +373,9 @@ HTML_VET_CLINICA = """
 """
 
 
+_VET_CLINICA_PAGE = PrecompressedPage(lambda: HTML_VET_CLINICA)
+
+
 @router.get("/", response_class=HTMLResponse)
-def vet_clinica_home():
-    return HTMLResponse(content=HTML_VET_CLINICA)
+def vet_clinica_home(request: Request):
+    return _VET_CLINICA_PAGE.response(request)
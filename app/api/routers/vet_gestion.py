@@ -1,16 +1,23 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from datetime import date
 
+from app.api.precompressed import PrecompressedPage
+
 router = APIRouter()
 
 
 @router.get("/", response_class=HTMLResponse)
-def vet_gestion_home():
+def vet_gestion_home(request: Request):
     """Panel de Gestión Veterinaria - Control completo de la veterinaria"""
+    return _VET_GESTION_PAGE.response(request)
+
+
+def _render_vet_gestion() -> str:
+    # Solo depende de la fecha del día (valores por defecto de los filtros)
     today = date.today().isoformat()
-    
-    return HTMLResponse(content=f"""
+
+    return f"""
 <!doctype html>
 <html lang="es">
 <head>
@@ -473,4 +480,7 @@ def vet_gestion_home():
   </script>
 </body>
 </html>
-""")
+"""
+
+
+_VET_GESTION_PAGE = PrecompressedPage(_render_vet_gestion, key=date.today)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
+from app.api.precompressed import PrecompressedPage
+
 router = APIRouter()
 
 
@@ -210,6 +212,9 @@ HTML_VET_LANDING = """
 """
 
 
+_VET_UI_PAGE = PrecompressedPage(lambda: HTML_VET_LANDING)
+
+
 @router.get("/", response_class=HTMLResponse)
-def vet_ui_home():
-    return HTMLResponse(content=HTML_VET_LANDING)
+def vet_ui_home(request: Request):
+    return _VET_UI_PAGE.response(request)
@@ -3,8 +3,63 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     db_url: str = "sqlite:///./app.db"
+    db_echo: bool = False
+    # Pool de conexiones (Postgres y otros motores con servidor)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_s: float = 30.0
+    db_pool_recycle_s: int = 1800
+    db_pool_pre_ping: bool = True
+    # SQLite: WAL para lecturas concurrentes con escrituras; cache_size
+    # negativo = KiB; busy_timeout = espera máxima del lock de escritura
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_cache_size: int = -64000
+    sqlite_mmap_size: int = 268435456
+    sqlite_busy_timeout_ms: int = 5000
     weather_api_base: str | None = None
     weather_api_key: str | None = None
+    # Cache del pronóstico del clima (segundos) y snapshot del último válido
+    weather_cache_ttl_s: int = 1800
+    weather_snapshot_path: str = ".cache/weather_snapshot.json"
+    # Segundos que se recuerda una descarga fallida (se sirve el respaldo)
+    weather_negative_ttl_s: float = 30.0
+    # Cliente HTTP del clima: timeout, reintentos y circuit breaker
+    weather_timeout_s: float = 10.0
+    weather_retries: int = 1
+    weather_backoff_s: float = 0.3
+    weather_breaker_threshold: int = 3
+    weather_breaker_reset_s: float = 60.0
+    # Esquema al arrancar: auto (create_all salvo que Alembic esté en head),
+    # create (siempre create_all) o skip (nunca)
+    startup_schema: str = "auto"
+    # TTL (segundos) del cache de conteos del panel de administración
+    stats_cache_ttl_s: float = 5.0
+    # Reporte de asistencia desde el rollup diario (False: GROUP BY en vivo)
+    attendance_rollup: bool = True
+    # Filas por lote en /exports/* (cursor del lado del servidor)
+    export_batch_size: int = 1000
+    # Filas por INSERT/commit en la importación masiva (/import/*)
+    import_batch_size: int = 1000
+    # Filas por INSERT en app.db.seed (motor de carga incluido)
+    seed_batch_size: int = 10000
+    # Tamaño máximo de lote para los endpoints /ai/*/batch
+    ai_batch_max_size: int = 500
+    # Plantillas HTML (Jinja2): bytecode compilado en disco ("" lo desactiva)
+    # y recarga al cambiar el archivo (solo desarrollo)
+    templates_cache_dir: str = ".cache/jinja"
+    templates_auto_reload: bool = False
+    # Cache-Control max-age (segundos) de /static (URLs versionadas por hash)
+    static_max_age_s: int = 31536000
+    # Cache-Control max-age (segundos) de las páginas de inicio precomprimidas;
+    # vencido, el navegador revalida con If-None-Match y recibe 304
+    landing_max_age_s: int = 300
+    # HTML de los documentos de docs/ compartido entre workers ("" lo desactiva)
+    docs_cache_dir: str = ".cache/docs"
+    # Listados HTML en streaming: filas por lote del cursor (yield_per) y
+    # caracteres de HTML acumulados antes de enviar cada bloque
+    html_stream_batch_size: int = 200
+    html_stream_chunk_size: int = 16384
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+
+class StartupTimings:
+    """
+    Tiempos por fase del arranque del proceso (imports, esquema de la base,
+    routers) y de las importaciones diferidas de ML en el primer uso.
+    """
+
+    def __init__(self) -> None:
+        self._t0 = time.perf_counter()
+        self._last = self._t0
+        self.phases: List[Dict[str, Any]] = []
+
+    def _add(self, name: str, start: float, end: float, **extra: Any) -> None:
+        self.phases.append(
+            {
+                "phase": name,
+                "ms": round((end - start) * 1000.0, 3),
+                "at_ms": round((end - self._t0) * 1000.0, 3),
+                **extra,
+            }
+        )
+
+    def mark(self, name: str, **extra: Any) -> None:
+        """Registra el tiempo transcurrido desde la marca/fase anterior."""
+        now = time.perf_counter()
+        self._add(name, self._last, now, **extra)
+        self._last = now
+
+    @contextmanager
+    def phase(self, name: str, **extra: Any) -> Iterator[Dict[str, Any]]:
+        """Mide un bloque; `extra` puede completarse dentro del bloque."""
+        start = time.perf_counter()
+        try:
+            yield extra
+        finally:
+            end = time.perf_counter()
+            self._add(name, start, end, **extra)
+            self._last = end
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round((self._last - self._t0) * 1000.0, 3),
+            "phases": list(self.phases),
+        }
+
+
+startup_timings = StartupTimings()
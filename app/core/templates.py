@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
+from markupsafe import Markup
+from starlette.types import Scope
+
+from app.core.config import settings
+
+APP_DIR = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = APP_DIR / "templates"
+STATIC_DIR = APP_DIR / "static"
+
+
+def _bytecode_cache() -> Optional[BytecodeCache]:
+    """Bytecode compilado en disco: los workers nuevos no re-parsean plantillas."""
+    if not settings.templates_cache_dir:
+        return None
+    path = Path(settings.templates_cache_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(str(path))
+
+
+@lru_cache(maxsize=256)
+def _static_digest(path: str, mtime_ns: int) -> str:
+    return hashlib.sha256((STATIC_DIR / path).read_bytes()).hexdigest()[:12]
+
+
+def static_url(path: str) -> str:
+    """
+    URL de un asset estático con el hash del contenido (?v=...): el navegador
+    lo cachea sin revalidar y cualquier cambio del archivo cambia la URL.
+    """
+    mtime_ns = (STATIC_DIR / path).stat().st_mtime_ns
+    return f"/static/{path}?v={_static_digest(path, mtime_ns)}"
+
+
+# Lo que emite {{ flush() }}: render_chunks envía lo acumulado y lo descarta
+_FLUSH = "\x00flush\x00"
+
+
+def flush() -> Markup:
+    """Marca en una plantilla el punto hasta donde enviar el HTML sin esperar."""
+    return Markup(_FLUSH)
+
+
+def fmt_date(value: Any, fmt: str = "%d/%m/%Y", default: str = "N/A") -> str:
+    """Filtro `fecha`: strftime tolerante a None."""
+    if value is None:
+        return default
+    return value.strftime(fmt)
+
+
+def age_text(birth_date: Optional[date], default: str = "No especificado") -> str:
+    """Filtro `edad`: años cumplidos a partir de la fecha de nacimiento."""
+    if birth_date is None:
+        return default
+    years = (date.today() - birth_date).days // 365
+    return f"{years} años" if years >= 1 else "Menos de 1 año"
+
+
+env = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=_bytecode_cache(),
+    auto_reload=settings.templates_auto_reload,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+env.globals["static_url"] = static_url
+env.globals["flush"] = flush
+env.filters["fecha"] = fmt_date
+env.filters["edad"] = age_text
+
+
+def render_to_string(name: str, **context: Any) -> str:
+    return env.get_template(name).render(**context)
+
+
+def render(name: str, **context: Any) -> HTMLResponse:
+    """Renderiza una plantilla de app/templates como respuesta HTML."""
+    return HTMLResponse(render_to_string(name, **context))
+
+
+def render_chunks(name: str, **context: Any) -> Iterator[bytes]:
+    """
+    Renderiza la plantilla de a partes (Template.generate) y junta los
+    fragmentos en bloques de ~settings.html_stream_chunk_size caracteres. Cada
+    {{ flush() }} envía lo acumulado: la cabecera de la página sale antes de
+    que la plantilla empiece a pedir filas.
+    """
+    chunk_size = settings.html_stream_chunk_size
+    buffer: List[str] = []
+    size = 0
+    for piece in env.get_template(name).generate(**context):
+        if piece == _FLUSH:
+            if buffer:
+                yield "".join(buffer).encode("utf-8")
+                buffer, size = [], 0
+            continue
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def stream(name: str, **context: Any) -> StreamingResponse:
+    """
+    Como render(), pero enviando el HTML a medida que se genera. Para listados
+    que iteran filas con app.db.database.stream_scalars: la memoria y el
+    tiempo hasta el primer byte no dependen de la cantidad de resultados.
+    """
+    return StreamingResponse(
+        render_chunks(name, **context), media_type="text/html; charset=utf-8"
+    )
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles con Cache-Control largo (las URLs llevan el hash del contenido)."""
+
+    async def get_response(self, path: str, scope: Scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = (
+                f"public, max-age={settings.static_max_age_s}, immutable"
+            )
+        return response
@@ -1,17 +1,15 @@
 from app.db.database import SessionLocal, Base, engine
-from app.db import models
+from app.services.stats import compute_counts
 
 
 def main() -> None:
     Base.metadata.create_all(bind=engine)
     s = SessionLocal()
     try:
-        owners = s.query(models.Owner).count()
-        pets = s.query(models.Pet).count()
-        appts = s.query(models.Appointment).count()
-        print(f"owners {owners}")
-        print(f"pets {pets}")
-        print(f"appts {appts}")
+        counts = compute_counts(s)
+        print(f"owners {counts['owners']}")
+        print(f"pets {counts['pets']}")
+        print(f"appts {counts['appointments']}")
     finally:
         s.close()
 
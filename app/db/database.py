@@ -1,11 +1,83 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict, Iterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
-import os
 
-DB_URL = os.getenv("DB_URL", "sqlite:///./app.db")
-connect_args = {"check_same_thread": False} if DB_URL.startswith("sqlite") else {}
+from app.core.config import Settings, settings
+
+DB_URL = settings.db_url
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def sqlite_pragmas(s: Settings) -> Dict[str, Any]:
+    """PRAGMAs que se aplican a cada conexión SQLite nueva."""
+    journal_mode = s.sqlite_journal_mode.upper()
+    synchronous = s.sqlite_synchronous.upper()
+    if journal_mode not in _JOURNAL_MODES:
+        raise ValueError(f"sqlite_journal_mode inválido: {s.sqlite_journal_mode}")
+    if synchronous not in _SYNCHRONOUS:
+        raise ValueError(f"sqlite_synchronous inválido: {s.sqlite_synchronous}")
+    return {
+        # busy_timeout primero: el cambio a WAL también puede esperar un lock
+        "busy_timeout": int(s.sqlite_busy_timeout_ms),
+        "journal_mode": journal_mode,
+        "synchronous": synchronous,
+        "cache_size": int(s.sqlite_cache_size),
+        "mmap_size": int(s.sqlite_mmap_size),
+    }
+
+
+def make_engine(url: str | None = None, s: Settings = settings) -> Engine:
+    """
+    Crea el engine a partir de Settings.
+
+    - SQLite: WAL + synchronous=NORMAL para que los lectores no bloqueen a
+      los escritores, busy_timeout para esperar el lock en vez de fallar con
+      "database is locked", y cache/mmap configurables.
+    - Postgres y otros: pool con tamaño, overflow, timeout, reciclado y
+      pre-ping para descartar conexiones muertas.
+    """
+    url = url or s.db_url
+    kwargs: Dict[str, Any] = {
+        "echo": s.db_echo,
+        "future": True,
+        "pool_pre_ping": s.db_pool_pre_ping,
+    }
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    if is_sqlite:
+        kwargs["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": s.sqlite_busy_timeout_ms / 1000.0,
+        }
+    else:
+        kwargs.update(
+            pool_size=s.db_pool_size,
+            max_overflow=s.db_max_overflow,
+            pool_timeout=s.db_pool_timeout_s,
+            pool_recycle=s.db_pool_recycle_s,
+        )
+
+    engine = create_engine(url, **kwargs)
+
+    if is_sqlite:
+        pragmas = sqlite_pragmas(s)
 
-engine = create_engine(DB_URL, echo=False, future=True, connect_args=connect_args)
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_conn, _record):
+            cursor = dbapi_conn.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+    return engine
+
+
+engine = make_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
@@ -16,3 +88,21 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def stream_scalars(stmt, batch_size: int) -> Iterator[Any]:
+    """
+    Entidades ORM de `stmt` leídas de a `batch_size` filas (yield_per). La
+    sesión es propia del generador porque vive mientras se envía la respuesta,
+    y cada lote se saca de la sesión una vez consumido: la memoria no depende
+    de la cantidad de filas. Solo admite joinedload de relaciones muchos-a-uno.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.scalars().partitions():
+            yield from partition
+            for obj in partition:
+                db.expunge(obj)
+    finally:
+        db.close()
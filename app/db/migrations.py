@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def alembic_at_head(engine: Engine) -> bool:
+    """
+    True si la base ya tiene aplicadas todas las migraciones de Alembic.
+    Si no existe la tabla alembic_version ni se importa Alembic.
+    """
+    if not inspect(engine).has_table("alembic_version"):
+        return False
+    try:
+        from alembic.config import Config
+        from alembic.runtime.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+    except ImportError:
+        return False
+
+    cfg = Config(str(ROOT_DIR / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT_DIR / "alembic"))
+    heads = set(ScriptDirectory.from_config(cfg).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+    return bool(heads) and current == heads
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, Text, Index
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 
@@ -25,6 +25,7 @@ class Owner(Base):
 
 class Pet(Base):
     __tablename__ = "pets"
+    __table_args__ = (Index("ix_pets_owner_id", "owner_id"),)
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(120), nullable=False)
     species = Column(String(50), nullable=False)
@@ -56,6 +57,8 @@ class Pet(Base):
 
 class ClinicalRecord(Base):
     __tablename__ = "clinical_records"
+    # Historia clínica: WHERE pet_id = ? ORDER BY visit_date DESC
+    __table_args__ = (Index("ix_clinical_records_pet_visit", "pet_id", "visit_date"),)
     id = Column(Integer, primary_key=True, index=True)
     visit_date = Column(Date, nullable=False, default=lambda: datetime.now(timezone.utc).date())
     # Use timezone-aware timestamps to avoid deprecation warnings and ensure UTC storage
@@ -78,6 +81,13 @@ class ClinicalRecord(Base):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    # Agenda por día/rango, filtros por estado y turnos de una mascota,
+    # siempre ordenados por fecha
+    __table_args__ = (
+        Index("ix_appointments_date", "appointment_date"),
+        Index("ix_appointments_status_date", "status", "appointment_date"),
+        Index("ix_appointments_pet_date", "pet_id", "appointment_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     appointment_date = Column(DateTime, nullable=False)
     reason = Column(String(120), nullable=False)  # vacunación, control, urgencia
@@ -98,6 +108,11 @@ class Appointment(Base):
 
 class Vaccination(Base):
     __tablename__ = "vaccinations"
+    # Próximas/vencidas por due_date y vacunas de una mascota
+    __table_args__ = (
+        Index("ix_vaccinations_due_date", "due_date"),
+        Index("ix_vaccinations_pet_due", "pet_id", "due_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     vaccine_name = Column(String(120), nullable=False)
     applied_date = Column(Date, nullable=False)
@@ -115,3 +130,16 @@ class Vaccination(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+
+
+class AppointmentDailyStat(Base):
+    """
+    Rollup diario de turnos por estado (día × estado × cantidad). Se mantiene
+    incrementalmente al crear/cancelar/atender turnos (app.services.attendance)
+    y permite responder reportes de un año leyendo unas pocas cientos de filas.
+    """
+
+    __tablename__ = "appointment_daily_stats"
+    day = Column(Date, primary_key=True)
+    status = Column(String(50), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
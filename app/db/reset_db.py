@@ -1,13 +1,21 @@
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+
 from app.db.database import Base, engine
+from app.services.search import drop_search_index, ensure_search_index
 
 # Asegurar que los modelos están importados para que SQLAlchemy conozca los mapeos
 from app.db import models as _models  # noqa: F401
 
 
-def reset_db() -> None:
-    """Droppea y recrea todas las tablas de la base de datos configurada."""
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+def reset_db(bind: Optional[Engine] = None) -> None:
+    """Droppea y recrea todas las tablas (e índice de búsqueda) de la base configurada."""
+    bind = bind or engine
+    drop_search_index(bind)
+    Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+    ensure_search_index(bind)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,58 @@
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import islice
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
-from typing import cast
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, cast
 import argparse
 import random
 import re
 import requests
+from time import perf_counter
 
+from app.core.config import settings
 from app.db.database import Base, engine, SessionLocal
 from app.db import models
+# Importar attendance también registra los hooks del rollup diario de asistencia
+from app.services.attendance import rebuild_rollup, record_new_appointments
+from app.services.search import index_missing
+from app.services.stats import stats_service
+
+# Valores por cláusula IN al buscar llaves existentes (límite de parámetros de SQLite)
+_IN_CHUNK = 500
+
+_STATUSES = ["scheduled", "attended", "canceled"]
+_WORK_HOURS = [9, 10, 11, 12, 14, 15, 16, 17]
+_APPOINTMENT_REASONS = [
+    "control anual",
+    "vacunación",
+    "revisión",
+    "urgencia",
+    "consulta general",
+    "chequeo post-operatorio",
+    "análisis de sangre",
+    "desparasitación",
+    "castración",
+    "tratamiento dental",
+    "limpieza dental",
+    "radiografía",
+    "ecografía",
+    "cirugía menor",
+    "control de peso",
+]
+_VACCINES = [
+    "Rabia",
+    "Séxtuple (Parvovirus, Moquillo, Hepatitis, Leptospirosis, Parainfluenza, Coronavirus)",
+    "Triple Felina",
+    "Antirábica",
+    "Parvovirus",
+    "Moquillo",
+    "Bordetella",
+    "Leptospirosis",
+    "Leucemia Felina",
+    "Giardia",
+]
 
 
 def _get_or_create_owner(db: Session, name: str, email: str, phone: str) -> models.Owner:
@@ -141,38 +186,204 @@ def seed():
         db.close()
 
 
-def seed_bulk(min_count: int = 200):
+# --- inserción por lotes -------------------------------------------------------
+
+
+@dataclass
+class SeedReport:
+    """Filas insertadas por tabla y velocidad de la siembra."""
+
+    label: str
+    rows: Dict[str, int] = field(default_factory=dict)
+    started: float = field(default_factory=perf_counter)
+    elapsed_s: float = 0.0
+
+    def add(self, table: str, n: int) -> None:
+        self.rows[table] = self.rows.get(table, 0) + n
+
+    def finish(self) -> "SeedReport":
+        self.elapsed_s = perf_counter() - self.started
+        return self
+
+    @property
+    def total(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.total / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def __str__(self) -> str:
+        detail = ", ".join(f"{table}={n}" for table, n in self.rows.items())
+        return (
+            f"{self.label}: {self.total} filas nuevas en {self.elapsed_s:.2f}s "
+            f"({self.rows_per_s:,.0f} filas/s) [{detail}]"
+        )
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _batch_size(batch_size: Optional[int]) -> int:
+    return max(1, batch_size or settings.seed_batch_size)
+
+
+def _insert_rows(db: Session, model, rows: Iterable[Dict[str, Any]], batch_size: int) -> int:
+    """INSERT multi-fila (executemany) de a `batch_size` filas, sin commit."""
+    # Directo por Core: el camino "bulk" del ORM arma un comando por fila
+    conn = db.connection()
+    stmt = model.__table__.insert()
+    n = 0
+    for chunk in _chunks(rows, batch_size):
+        conn.execute(stmt, chunk)
+        n += len(chunk)
+    return n
+
+
+def _key_ids(
+    db: Session, model, key: Sequence[str], filter_col: str, values: Iterable[Any]
+) -> Dict[Tuple, int]:
+    """Llave natural -> id de las filas existentes, con una consulta por _IN_CHUNK valores."""
+    cols = [getattr(model, k) for k in key]
+    col = getattr(model, filter_col)
+    found: Dict[Tuple, int] = {}
+    for chunk in _chunks(set(values), _IN_CHUNK):
+        for *k, row_id in db.execute(select(*cols, model.id).where(col.in_(chunk))):
+            found[tuple(k)] = row_id
+    return found
+
+
+def _insert_missing(
+    db: Session,
+    model,
+    key: Sequence[str],
+    rows: List[Dict[str, Any]],
+    batch_size: int,
+    filter_col: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Reemplazo por lotes de los _get_or_create_*: consulta de una vez las
+    llaves existentes e inserta solo las filas nuevas (sin repetidas).
+    Devuelve las filas insertadas.
+    """
+    filter_col = filter_col or key[0]
+    existing = set(_key_ids(db, model, key, filter_col, (r[filter_col] for r in rows)))
+    new = []
+    for row in rows:
+        k = tuple(row[c] for c in key)
+        if k not in existing:
+            existing.add(k)
+            new.append(row)
+    _insert_rows(db, model, new, batch_size)
+    return new
+
+
+def _commit(db: Session, report: SeedReport) -> SeedReport:
+    # Los INSERT de Core no pasan por los eventos del ORM: el índice de
+    # búsqueda y el cache de conteos se actualizan a mano (el rollup lo
+    # actualiza cada seeder)
+    if report.total:
+        index_missing(db.connection())
+    db.commit()
+    if report.total:
+        stats_service.invalidate()
+    report.finish()
+    print(report)
+    return report
+
+
+def _pet_ids(db: Session) -> List[int]:
+    return list(db.execute(select(models.Pet.id).order_by(models.Pet.id)).scalars())
+
+
+def _insert_owner_chains(
+    db: Session,
+    chains: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+    batch_size: int,
+    report: SeedReport,
+) -> None:
+    """
+    Inserta (dueño, mascota, turno) idempotentes en tres pasadas por lotes:
+    las llaves son email, (owner_id, nombre) y (pet_id, fecha, motivo). La
+    mascota y el turno llegan sin owner_id/pet_id; se completan aquí.
+    """
+    owners = [owner for owner, _, _ in chains]
+    report.add("owners", len(_insert_missing(db, models.Owner, ("email",), owners, batch_size)))
+    owner_ids = _key_ids(db, models.Owner, ("email",), "email", (o["email"] for o in owners))
+
+    pets = []
+    for owner, pet, _ in chains:
+        pets.append({**pet, "owner_id": owner_ids[(owner["email"],)]})
+    report.add("pets", len(_insert_missing(db, models.Pet, ("owner_id", "name"), pets, batch_size)))
+    pet_ids = _key_ids(
+        db, models.Pet, ("owner_id", "name"), "owner_id", (p["owner_id"] for p in pets)
+    )
+
+    appointments = [
+        {"status": "scheduled", **appointment, "pet_id": pet_ids[(pet["owner_id"], pet["name"])]}
+        for pet, (_, _, appointment) in zip(pets, chains)
+    ]
+    new = _insert_missing(
+        db,
+        models.Appointment,
+        ("pet_id", "appointment_date", "reason"),
+        appointments,
+        batch_size,
+    )
+    record_new_appointments(db, new)
+    report.add("appointments", len(new))
+
+
+def seed_bulk(
+    min_count: int = 200, batch_size: Optional[int] = None, bind: Optional[Engine] = None
+) -> SeedReport:
     """Genera al menos `min_count` Dueños, Mascotas y Turnos de forma idempotente.
 
     Para i en 1..min_count:
       - Owner: bulk_owner_{i}@example.com
       - Pet:   BulkPet{i} (alternando especie perro/gato)
       - Appt:  hoy 09:00 + i minutos, reason "control {i}"
+    Todo se inserta por lotes en una sola transacción.
     """
-    Base.metadata.create_all(bind=engine)
-    db: Session = SessionLocal()
+    Base.metadata.create_all(bind=bind or engine)
+    report = SeedReport("Seed bulk")
+    # Sin `bind` se respeta el engine configurado en SessionLocal
+    db: Session = SessionLocal(bind=bind) if bind is not None else SessionLocal()
     try:
         base_dt = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+        chains = []
         for i in range(1, min_count + 1):
-            email = f"bulk_owner_{i:03d}@example.com"
-            name = f"Owner {i:03d}"
-            phone = f"+54 11 {1000+i:04d}-{2000+i:04d}"
-            owner = _get_or_create_owner(db, name=name, email=email, phone=phone)
-
-            pet_name = f"BulkPet{i:03d}"
             species = "perro" if i % 2 == 0 else "gato"
-            breed = "mestizo" if species == "perro" else "siamés"
-            pet = _get_or_create_pet(
-                db, owner_id=cast(int, owner.id), name=pet_name, species=species, breed=breed
+            chains.append(
+                (
+                    {
+                        "name": f"Owner {i:03d}",
+                        "email": f"bulk_owner_{i:03d}@example.com",
+                        "phone": f"+54 11 {1000+i:04d}-{2000+i:04d}",
+                    },
+                    {
+                        "name": f"BulkPet{i:03d}",
+                        "species": species,
+                        "breed": "mestizo" if species == "perro" else "siamés",
+                    },
+                    {
+                        "appointment_date": base_dt + timedelta(minutes=i),
+                        "reason": f"control {i:03d}",
+                    },
+                )
             )
-
-            ap_dt = base_dt + timedelta(minutes=i)
-            reason = f"control {i:03d}"
-            _get_or_create_appointment(db, pet_id=cast(int, pet.id), date=ap_dt, reason=reason)
+        _insert_owner_chains(db, chains, _batch_size(batch_size), report)
 
         print(
             f"Seed bulk idempotente: asegurados >= {min_count} owners/pets/appointments"
         )
+        return _commit(db, report)
     finally:
         db.close()
 
@@ -307,7 +518,7 @@ def _fetch_cat_breeds_from_wiki(max_items: int = 200) -> list[str]:
         ]
 
 
-def seed_internet(count: int = 100):
+def seed_internet(count: int = 100, batch_size: Optional[int] = None) -> SeedReport:
     """Genera N registros (Owner, Pet, Appointment) usando listas de razas obtenidas de Internet.
 
     Fuentes:
@@ -320,9 +531,10 @@ def seed_internet(count: int = 100):
       Appointment: (pet_id, date, reason)
     """
     Base.metadata.create_all(bind=engine)
+    report = SeedReport("Seed internet")
     db: Session = SessionLocal()
     try:
-        random.seed(42)  # determinismo suave
+        rng = random.Random(42)  # determinismo suave
 
         dog_breeds = _fetch_dog_breeds_from_wiki(300)
         cat_breeds = _fetch_cat_breeds_from_wiki(300)
@@ -336,321 +548,226 @@ def seed_internet(count: int = 100):
         ]
 
         base_dt = datetime.now().replace(hour=11, minute=0, second=0, microsecond=0)
+        chains = []
         for i in range(1, count + 1):
-            email = f"internet_owner_{i:03d}@example.com"
-            name = f"Internet Owner {i:03d}"
-            phone = f"+54 11 {3000+i:04d}-{4000+i:04d}"
-            owner = _get_or_create_owner(db, name=name, email=email, phone=phone)
-
             species = "perro" if i % 2 == 1 else "gato"
-            breed = (
-                random.choice(dog_breeds) if species == "perro" else random.choice(cat_breeds)
-            )
-            pet_name = f"{random.choice(pet_names)}{i:02d}"
-            pet = _get_or_create_pet(
-                db,
-                owner_id=cast(int, owner.id),
-                name=pet_name,
-                species=species,
-                breed=breed,
-            )
-
-            ap_dt = base_dt + timedelta(minutes=i)
-            reason = f"{random.choice(reasons)} ({breed})"
-            _get_or_create_appointment(
-                db, pet_id=cast(int, pet.id), date=ap_dt, reason=reason
+            breed = rng.choice(dog_breeds) if species == "perro" else rng.choice(cat_breeds)
+            pet_name = f"{rng.choice(pet_names)}{i:02d}"
+            chains.append(
+                (
+                    {
+                        "name": f"Internet Owner {i:03d}",
+                        "email": f"internet_owner_{i:03d}@example.com",
+                        "phone": f"+54 11 {3000+i:04d}-{4000+i:04d}",
+                    },
+                    {"name": pet_name, "species": species, "breed": breed},
+                    {
+                        "appointment_date": base_dt + timedelta(minutes=i),
+                        "reason": f"{rng.choice(reasons)} ({breed})",
+                    },
+                )
             )
+        _insert_owner_chains(db, chains, _batch_size(batch_size), report)
 
         print(
             f"Seed internet: cargados >= {count} registros usando razas de Wikipedia (CC BY-SA 4.0)."
         )
+        return _commit(db, report)
     finally:
         db.close()
 
 
-def seed_today_appointments(count: int = 10):
+def _pet_ids_or_seed(db: Session) -> List[int]:
+    pet_ids = _pet_ids(db)
+    if not pet_ids:
+        print("No hay mascotas en la base. Ejecutando seed base primero...")
+        seed()
+        pet_ids = _pet_ids(db)
+    return pet_ids
+
+
+def _insert_appointment_samples(
+    db: Session, rows: List[Dict[str, Any]], batch_size: int, report: SeedReport
+) -> None:
+    # Idempotente por (pet_id, fecha, motivo); se consulta por fecha porque
+    # las muestras se concentran en pocos horarios
+    new = _insert_missing(
+        db,
+        models.Appointment,
+        ("pet_id", "appointment_date", "reason"),
+        rows,
+        batch_size,
+        filter_col="appointment_date",
+    )
+    record_new_appointments(db, new)
+    report.add("appointments", len(new))
+
+
+def _sample_status(
+    rng: random.Random, when: datetime, now: datetime, past_weights, future_weights
+) -> str:
+    weights = past_weights if when < now else future_weights
+    return rng.choices(_STATUSES, weights=weights, k=1)[0]
+
+
+def seed_today_appointments(count: int = 10, batch_size: Optional[int] = None) -> SeedReport:
     """Genera turnos para el día de hoy con diferentes estados y horarios."""
+    report = SeedReport("Seed today appointments")
     db = SessionLocal()
     try:
-        # Asegurar que hay al menos algunos dueños y mascotas
-        owners_count = db.query(models.Owner).count()
-        if owners_count == 0:
-            print("No hay dueños en la base. Ejecutando seed base primero...")
-            seed()
-        
-        pets = db.query(models.Pet).all()
-        if not pets:
+        pet_ids = _pet_ids_or_seed(db)
+        if not pet_ids:
             print("No hay mascotas en la base. No se pueden crear turnos.")
-            return
-        
+            return report.finish()
+
         today = datetime.now().date()
-        estados = ["scheduled", "attended", "canceled"]
-        motivos = [
-            "control anual",
-            "vacunación",
-            "revisión",
-            "urgencia",
-            "consulta general",
-            "chequeo post-operatorio",
-            "análisis de sangre",
-            "desparasitación",
-            "castración",
-            "tratamiento dental",
-        ]
-        
-        # Generar turnos distribuidos en horario laboral (9:00 - 18:00)
-        horarios_base = [9, 10, 11, 12, 14, 15, 16, 17]
-        
-        random.seed(42)  # Para reproducibilidad
-        
-        turnos_creados = 0
-        for i in range(count):
-            pet = random.choice(pets)
-            hora = random.choice(horarios_base)
-            minuto = random.choice([0, 15, 30, 45])
-            
-            date_time = datetime.combine(
-                today, datetime.min.time()
-            ).replace(hour=hora, minute=minuto)
-            
-            # Asignar estado según el horario
-            # Turnos pasados: mayormente atendidos o cancelados
-            # Turnos futuros: scheduled
-            now = datetime.now()
-            if date_time < now:
-                estado = random.choices(
-                    estados,
-                    weights=[10, 70, 20],  # scheduled, attended, canceled
-                    k=1
-                )[0]
-            else:
-                estado = random.choices(
-                    estados,
-                    weights=[85, 5, 10],  # scheduled, attended, canceled
-                    k=1
-                )[0]
-            
-            motivo = random.choice(motivos)
-            
-            _get_or_create_appointment(
-                db,
-                pet_id=cast(int, pet.id),
-                date=date_time,
-                reason=motivo,
-                status=estado,
+        motivos = _APPOINTMENT_REASONS[:10]
+        rng = random.Random(42)  # Para reproducibilidad
+        now = datetime.now()
+
+        # Turnos distribuidos en horario laboral (9:00 - 18:00). Pasados:
+        # mayormente atendidos o cancelados; futuros: scheduled
+        rows = []
+        for _ in range(count):
+            pet_id = rng.choice(pet_ids)
+            when = datetime.combine(
+                today, time(rng.choice(_WORK_HOURS), rng.choice([0, 15, 30, 45]))
             )
-            turnos_creados += 1
-        
+            status = _sample_status(rng, when, now, [10, 70, 20], [85, 5, 10])
+            rows.append(
+                {
+                    "pet_id": pet_id,
+                    "appointment_date": when,
+                    "reason": rng.choice(motivos),
+                    "status": status,
+                }
+            )
+        _insert_appointment_samples(db, rows, _batch_size(batch_size), report)
+
         print(
-            f"Seed today appointments: cargados {turnos_creados} turnos para hoy ({today})."
+            f"Seed today appointments: cargados {report.total} turnos nuevos para hoy ({today})."
         )
+        return _commit(db, report)
     finally:
         db.close()
 
 
-def seed_two_months_appointments(count_per_day: int = 8):
+def seed_two_months_appointments(
+    count_per_day: int = 8, batch_size: Optional[int] = None
+) -> SeedReport:
     """Genera turnos distribuidos en los próximos 2 meses."""
+    report = SeedReport("Seed two months")
     db = SessionLocal()
     try:
-        # Asegurar que hay al menos algunos dueños y mascotas
-        owners_count = db.query(models.Owner).count()
-        if owners_count == 0:
-            print("No hay dueños en la base. Ejecutando seed base primero...")
-            seed()
-        
-        pets = db.query(models.Pet).all()
-        if not pets:
+        pet_ids = _pet_ids_or_seed(db)
+        if not pet_ids:
             print("No hay mascotas en la base. No se pueden crear turnos.")
-            return
-        
+            return report.finish()
+
         today = datetime.now().date()
         end_date = today + timedelta(days=60)  # 2 meses
-        
-        estados = ["scheduled", "attended", "canceled"]
-        motivos = [
-            "control anual",
-            "vacunación",
-            "revisión",
-            "urgencia",
-            "consulta general",
-            "chequeo post-operatorio",
-            "análisis de sangre",
-            "desparasitación",
-            "castración",
-            "tratamiento dental",
-            "limpieza dental",
-            "radiografía",
-            "ecografía",
-            "cirugía menor",
-            "control de peso",
-        ]
-        
-        # Horarios laborales
-        horarios_base = [9, 10, 11, 12, 14, 15, 16, 17]
-        
-        random.seed(42)  # Para reproducibilidad
-        
-        turnos_creados = 0
+        rng = random.Random(42)  # Para reproducibilidad
+        now = datetime.now()
+
+        rows = []
         current_date = today
-        
         while current_date <= end_date:
             # Solo días laborales (lunes a viernes)
-            if current_date.weekday() < 5:  # 0=lunes, 4=viernes
+            if current_date.weekday() < 5:
                 for _ in range(count_per_day):
-                    pet = random.choice(pets)
-                    hora = random.choice(horarios_base)
-                    minuto = random.choice([0, 15, 30, 45])
-                    
-                    date_time = datetime.combine(
-                        current_date, datetime.min.time()
-                    ).replace(hour=hora, minute=minuto)
-                    
-                    # Asignar estado según la fecha
-                    now = datetime.now()
-                    if date_time < now:
-                        # Turnos pasados: mayormente atendidos
-                        estado = random.choices(
-                            estados,
-                            weights=[5, 80, 15],  # scheduled, attended, canceled
-                            k=1
-                        )[0]
-                    else:
-                        # Turnos futuros: principalmente scheduled
-                        estado = random.choices(
-                            estados,
-                            weights=[90, 5, 5],  # scheduled, attended, canceled
-                            k=1
-                        )[0]
-                    
-                    motivo = random.choice(motivos)
-                    
-                    _get_or_create_appointment(
-                        db,
-                        pet_id=cast(int, pet.id),
-                        date=date_time,
-                        reason=motivo,
-                        status=estado,
+                    pet_id = rng.choice(pet_ids)
+                    when = datetime.combine(
+                        current_date,
+                        time(rng.choice(_WORK_HOURS), rng.choice([0, 15, 30, 45])),
+                    )
+                    # Pasados: mayormente atendidos; futuros: scheduled
+                    status = _sample_status(rng, when, now, [5, 80, 15], [90, 5, 5])
+                    rows.append(
+                        {
+                            "pet_id": pet_id,
+                            "appointment_date": when,
+                            "reason": rng.choice(_APPOINTMENT_REASONS),
+                            "status": status,
+                        }
                     )
-                    turnos_creados += 1
-            
             current_date += timedelta(days=1)
-        
+        _insert_appointment_samples(db, rows, _batch_size(batch_size), report)
+
         print(
-            f"Seed two months: cargados {turnos_creados} turnos desde {today} hasta {end_date}."
+            f"Seed two months: cargados {report.total} turnos nuevos desde {today} hasta {end_date}."
         )
+        return _commit(db, report)
     finally:
         db.close()
 
 
-def seed_vaccinations_samples(count: int = 50):
+def seed_vaccinations_samples(count: int = 50, batch_size: Optional[int] = None) -> SeedReport:
     """Genera vacunas de muestra con diferentes estados de vencimiento."""
+    report = SeedReport("Seed vaccinations")
     db = SessionLocal()
     try:
-        pets = db.query(models.Pet).all()
-        if not pets:
-            print("No hay mascotas en la base. Ejecutando seed base primero...")
-            seed()
-            pets = db.query(models.Pet).all()
-        
-        if not pets:
+        pet_ids = _pet_ids_or_seed(db)
+        if not pet_ids:
             print("No se pueden crear vacunas sin mascotas.")
-            return
-        
+            return report.finish()
+
         today = datetime.now().date()
-        
-        vaccines = [
-            "Rabia",
-            "Séxtuple (Parvovirus, Moquillo, Hepatitis, Leptospirosis, Parainfluenza, Coronavirus)",
-            "Triple Felina",
-            "Antirábica",
-            "Parvovirus",
-            "Moquillo",
-            "Bordetella",
-            "Leptospirosis",
-            "Leucemia Felina",
-            "Giardia",
-        ]
-        
-        random.seed(42)
-        
-        vacunas_creadas = 0
-        
+        rng = random.Random(42)
+
         # Distribuir vacunas en diferentes rangos de tiempo
         # 20% vencidas (hace 1-60 días)
         # 30% próximas urgentes (1-7 días)
         # 30% próximas advertencia (8-30 días)
         # 20% futuras (31-90 días)
-        
-        for i in range(count):
-            pet = random.choice(pets)
-            vaccine_name = random.choice(vaccines)
-            
-            # Determinar rango de fecha
-            rand = random.random()
+        rows = []
+        for _ in range(count):
+            pet_id = rng.choice(pet_ids)
+            vaccine_name = rng.choice(_VACCINES)
+            rand = rng.random()
             if rand < 0.2:
-                # Vencidas
-                days_offset = -random.randint(1, 60)
+                days_offset = -rng.randint(1, 60)
             elif rand < 0.5:
-                # Próximas urgentes (1-7 días)
-                days_offset = random.randint(1, 7)
+                days_offset = rng.randint(1, 7)
             elif rand < 0.8:
-                # Próximas advertencia (8-30 días)
-                days_offset = random.randint(8, 30)
+                days_offset = rng.randint(8, 30)
             else:
-                # Futuras (31-90 días)
-                days_offset = random.randint(31, 90)
-            
+                days_offset = rng.randint(31, 90)
             due_date = today + timedelta(days=days_offset)
-            
-            # Fecha de aplicación (aprox 1 año antes del vencimiento)
-            applied_date = due_date - timedelta(days=365)
-            
-            status = "overdue" if days_offset < 0 else "due"
-            
-            # Verificar si ya existe
-            exists = (
-                db.query(models.Vaccination)
-                .filter(
-                    models.Vaccination.pet_id == cast(int, pet.id),
-                    models.Vaccination.vaccine_name == vaccine_name,
-                    models.Vaccination.due_date == due_date,
-                )
-                .first()
+            rows.append(
+                {
+                    "pet_id": pet_id,
+                    "vaccine_name": vaccine_name,
+                    # Fecha de aplicación (aprox 1 año antes del vencimiento)
+                    "applied_date": due_date - timedelta(days=365),
+                    "due_date": due_date,
+                    "status": "overdue" if days_offset < 0 else "due",
+                }
             )
-            
-            if not exists:
-                vac = models.Vaccination(
-                    pet_id=cast(int, pet.id),
-                    vaccine_name=vaccine_name,
-                    applied_date=applied_date,
-                    due_date=due_date,
-                    status=status,
-                )
-                db.add(vac)
-                vacunas_creadas += 1
-        
-        db.commit()
-        print(
-            f"Seed vaccinations: cargadas {vacunas_creadas} vacunas de muestra."
+        new = _insert_missing(
+            db,
+            models.Vaccination,
+            ("pet_id", "vaccine_name", "due_date"),
+            rows,
+            _batch_size(batch_size),
+            filter_col="due_date",
         )
+        report.add("vaccinations", len(new))
+
+        return _commit(db, report)
     finally:
         db.close()
 
 
-def seed_clinical_records_samples(count: int = 30):
+def seed_clinical_records_samples(count: int = 30, batch_size: Optional[int] = None) -> SeedReport:
     """Genera récords clínicos de muestra para las mascotas existentes."""
+    report = SeedReport("Seed clinical records")
     db = SessionLocal()
     try:
-        pets = db.query(models.Pet).all()
-        if not pets:
-            print("No hay mascotas en la base. Ejecutando seed base primero...")
-            seed()
-            pets = db.query(models.Pet).all()
-        
-        if not pets:
+        pet_ids = _pet_ids_or_seed(db)
+        if not pet_ids:
             print("No se pueden crear récords sin mascotas.")
-            return
-        
+            return report.finish()
+
         today = datetime.now().date()
         
         symptoms_list = [
@@ -701,53 +818,236 @@ def seed_clinical_records_samples(count: int = 30):
             None,  # Sin medicamentos
         ]
         
-        random.seed(42)
-        
-        records_creados = 0
-        
-        for i in range(count):
-            pet = random.choice(pets)
-            
+        rng = random.Random(42)
+
+        rows = []
+        for _ in range(count):
+            pet_id = rng.choice(pet_ids)
             # Fecha de visita entre hace 6 meses y hoy
-            days_ago = random.randint(0, 180)
-            visit_date = today - timedelta(days=days_ago)
-            
-            symptoms = random.choice(symptoms_list)
-            diagnosis = random.choice(diagnoses_list)
-            treatment = random.choice(treatments_list)
-            medications = random.choice(medications_list)
-            
-            # Verificar si ya existe un record similar
-            exists = (
-                db.query(models.ClinicalRecord)
-                .filter(
-                    models.ClinicalRecord.pet_id == cast(int, pet.id),
-                    models.ClinicalRecord.visit_date == visit_date,
-                    models.ClinicalRecord.diagnosis == diagnosis,
-                )
-                .first()
+            visit_date = today - timedelta(days=rng.randint(0, 180))
+            rows.append(
+                {
+                    "pet_id": pet_id,
+                    "visit_date": visit_date,
+                    "symptoms": rng.choice(symptoms_list),
+                    "diagnosis": rng.choice(diagnoses_list),
+                    "treatment": rng.choice(treatments_list),
+                    "medications": rng.choice(medications_list),
+                }
             )
-            
-            if not exists:
-                record = models.ClinicalRecord(
-                    pet_id=cast(int, pet.id),
-                    visit_date=visit_date,
-                    symptoms=symptoms,
-                    diagnosis=diagnosis,
-                    treatment=treatment,
-                    medications=medications,
-                )
-                db.add(record)
-                records_creados += 1
-        
-        db.commit()
-        print(
-            f"Seed clinical records: cargados {records_creados} récords clínicos de muestra."
+        # Idempotente por (pet_id, fecha de visita, diagnóstico)
+        new = _insert_missing(
+            db,
+            models.ClinicalRecord,
+            ("pet_id", "visit_date", "diagnosis"),
+            rows,
+            _batch_size(batch_size),
+            filter_col="visit_date",
         )
+        report.add("records", len(new))
+
+        return _commit(db, report)
     finally:
         db.close()
 
 
+# --- motor de carga a escala ---------------------------------------------------
+
+# Ventana de fechas de los turnos generados, relativa al día de referencia
+SCALE_PAST_DAYS = 365
+SCALE_FUTURE_DAYS = 60
+
+_FIRST_NAMES = [
+    "Juan", "María", "Carlos", "Ana", "Luis", "Laura", "Diego", "Sofía",
+    "Martín", "Lucía", "Pablo", "Valentina", "Jorge", "Camila", "Andrés", "Julieta",
+]
+_LAST_NAMES = [
+    "Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "García",
+    "Sánchez", "Romero", "Díaz", "Álvarez", "Torres", "Ruiz", "Flores", "Acosta",
+]
+_PET_NAMES = [
+    "Luna", "Max", "Bella", "Charlie", "Milo", "Nala", "Rocky", "Coco",
+    "Simba", "Lola", "Toby", "Mia", "Lucy", "Leo", "Kira", "Bruno",
+]
+_BREEDS = {
+    "perro": ["mestizo", "Labrador Retriever", "Golden Retriever", "Beagle", "Caniche", "Bulldog"],
+    "gato": ["mestizo", "siamés", "persa", "Maine Coon", "Bengalí", "Ragdoll"],
+}
+
+
+def _rng(random_seed: int, table: str) -> random.Random:
+    # Un generador por tabla: agregar vacunas no cambia los turnos generados
+    return random.Random(f"{random_seed}:{table}")
+
+
+def _scale_owners(
+    random_seed: int, count: int, first_id: int, stamps: Dict[str, Any]
+) -> Iterator[Dict[str, Any]]:
+    rng = _rng(random_seed, "owners")
+    for i in range(count):
+        yield {
+            "id": first_id + i,
+            "name": f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+            "email": f"load{random_seed}_{i:07d}@example.com",
+            "phone": f"+54 11 {rng.randrange(10000):04d}-{rng.randrange(10000):04d}",
+            **stamps,
+        }
+
+
+def _scale_pets(
+    random_seed: int,
+    owners: int,
+    per_owner: int,
+    first_owner_id: int,
+    first_id: int,
+    anchor: date,
+    stamps: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    rng = _rng(random_seed, "pets")
+    for i in range(owners * per_owner):
+        species = rng.choice(("perro", "gato"))
+        yield {
+            "id": first_id + i,
+            "owner_id": first_owner_id + i // per_owner,
+            "name": rng.choice(_PET_NAMES),
+            "species": species,
+            "breed": rng.choice(_BREEDS[species]),
+            "birth_date": anchor - timedelta(days=rng.randrange(60, 15 * 365)),
+            **stamps,
+        }
+
+
+def _scale_appointments(
+    random_seed: int,
+    pets: int,
+    per_pet: int,
+    first_pet_id: int,
+    anchor: date,
+    stamps: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    rng = _rng(random_seed, "appointments")
+    for i in range(pets * per_pet):
+        offset = rng.randint(-SCALE_PAST_DAYS, SCALE_FUTURE_DAYS)
+        when = datetime.combine(
+            anchor + timedelta(days=offset),
+            time(rng.choice(_WORK_HOURS), rng.choice((0, 15, 30, 45))),
+        )
+        # Pasados: mayormente atendidos; desde el día de referencia: scheduled
+        weights = (5, 80, 15) if offset < 0 else (90, 5, 5)
+        yield {
+            "pet_id": first_pet_id + i // per_pet,
+            "appointment_date": when,
+            "reason": rng.choice(_APPOINTMENT_REASONS),
+            "status": rng.choices(_STATUSES, weights=weights, k=1)[0],
+            **stamps,
+        }
+
+
+def _scale_vaccinations(
+    random_seed: int,
+    pets: int,
+    per_pet: int,
+    first_pet_id: int,
+    anchor: date,
+    stamps: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    rng = _rng(random_seed, "vaccinations")
+    for i in range(pets * per_pet):
+        offset = rng.randint(-60, 90)
+        due_date = anchor + timedelta(days=offset)
+        yield {
+            "pet_id": first_pet_id + i // per_pet,
+            "vaccine_name": rng.choice(_VACCINES),
+            "applied_date": due_date - timedelta(days=365),
+            "due_date": due_date,
+            "status": "overdue" if offset < 0 else "due",
+            **stamps,
+        }
+
+
+def _next_id(db: Session, model) -> int:
+    return (db.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _sync_sequence(db: Session, model) -> None:
+    # Postgres: los ids explícitos no avanzan la secuencia del SERIAL
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    table = model.__tablename__
+    db.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT MAX(id) FROM {table}))"
+        )
+    )
+
+
+def seed_scale(
+    owners: int,
+    pets_per_owner: int = 1,
+    appointments_per_pet: int = 1,
+    vaccinations_per_pet: int = 0,
+    random_seed: int = 42,
+    batch_size: Optional[int] = None,
+    anchor: Optional[date] = None,
+    bind: Optional[Engine] = None,
+) -> SeedReport:
+    """Genera volúmenes realistas (p. ej. 1M de dueños/mascotas/turnos) para pruebas de carga.
+
+    - Determinista: con el mismo `random_seed` y `anchor` (día de referencia
+      de las fechas, por defecto hoy) los datos generados son idénticos.
+    - Las filas se generan a medida que se insertan (memoria constante), en
+      INSERT multi-fila de `batch_size` filas y un commit por tabla.
+    - Los ids se asignan a partir del MAX(id) actual para que mascotas y
+      turnos referencien a su padre sin releerlo: supone que nadie más
+      escribe esas tablas mientras corre.
+    - No es idempotente: cada ejecución agrega filas nuevas.
+    """
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    size = _batch_size(batch_size)
+    anchor = anchor or date.today()
+    now = datetime.now(timezone.utc)
+    # Timestamps fijos: evita evaluar los default del modelo fila por fila
+    stamps = {"created_at": now, "updated_at": now}
+    pets = owners * pets_per_owner
+    report = SeedReport(f"Seed scale (seed={random_seed}, anchor={anchor})")
+
+    with Session(bind=bind) as db:
+        first_owner_id = _next_id(db, models.Owner)
+        first_pet_id = _next_id(db, models.Pet)
+
+        rows = _scale_owners(random_seed, owners, first_owner_id, stamps)
+        report.add("owners", _insert_rows(db, models.Owner, rows, size))
+        _sync_sequence(db, models.Owner)
+        db.commit()
+
+        rows = _scale_pets(
+            random_seed, owners, pets_per_owner, first_owner_id, first_pet_id, anchor, stamps
+        )
+        report.add("pets", _insert_rows(db, models.Pet, rows, size))
+        _sync_sequence(db, models.Pet)
+        db.commit()
+
+        if appointments_per_pet > 0:
+            rows = _scale_appointments(
+                random_seed, pets, appointments_per_pet, first_pet_id, anchor, stamps
+            )
+            report.add("appointments", _insert_rows(db, models.Appointment, rows, size))
+            # Un GROUP BY al final sale más barato que un upsert por lote
+            rebuild_rollup(db)
+            db.commit()
+
+        if vaccinations_per_pet > 0:
+            rows = _scale_vaccinations(
+                random_seed, pets, vaccinations_per_pet, first_pet_id, anchor, stamps
+            )
+            report.add("vaccinations", _insert_rows(db, models.Vaccination, rows, size))
+            db.commit()
+
+        return _commit(db, report)
+
+
 def _parse_args():
     parser = argparse.ArgumentParser(description="Seeder idempotente")
     parser.add_argument(
@@ -786,6 +1086,36 @@ def _parse_args():
         default=0,
         help="Número de récords clínicos de muestra a generar.",
     )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=0,
+        help="Pruebas de carga: genera N dueños nuevos (no idempotente, ver seed_scale).",
+    )
+    parser.add_argument(
+        "--pets-per-owner", type=int, default=1, help="Mascotas por dueño con --scale."
+    )
+    parser.add_argument(
+        "--appointments-per-pet", type=int, default=1, help="Turnos por mascota con --scale."
+    )
+    parser.add_argument(
+        "--vaccinations-per-pet", type=int, default=0, help="Vacunas por mascota con --scale."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Semilla del generador de --scale."
+    )
+    parser.add_argument(
+        "--anchor",
+        type=date.fromisoformat,
+        default=None,
+        help="Día de referencia (YYYY-MM-DD) de las fechas de --scale; por defecto hoy.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"Filas por INSERT (por defecto {settings.seed_batch_size}).",
+    )
     return parser.parse_args()
 
 
@@ -793,14 +1123,24 @@ if __name__ == "__main__":
     args = _parse_args()
     seed()
     if args.bulk and args.bulk > 0:
-        seed_bulk(args.bulk)
+        seed_bulk(args.bulk, args.batch_size)
     if args.internet and args.internet > 0:
-        seed_internet(args.internet)
+        seed_internet(args.internet, args.batch_size)
     if args.today_appointments and args.today_appointments > 0:
-        seed_today_appointments(args.today_appointments)
+        seed_today_appointments(args.today_appointments, args.batch_size)
     if args.two_months and args.two_months > 0:
-        seed_two_months_appointments(args.two_months)
+        seed_two_months_appointments(args.two_months, args.batch_size)
     if args.vaccinations and args.vaccinations > 0:
-        seed_vaccinations_samples(args.vaccinations)
+        seed_vaccinations_samples(args.vaccinations, args.batch_size)
     if args.clinical_records and args.clinical_records > 0:
-        seed_clinical_records_samples(args.clinical_records)
+        seed_clinical_records_samples(args.clinical_records, args.batch_size)
+    if args.scale and args.scale > 0:
+        seed_scale(
+            args.scale,
+            pets_per_owner=args.pets_per_owner,
+            appointments_per_pet=args.appointments_per_pet,
+            vaccinations_per_pet=args.vaccinations_per_pet,
+            random_seed=args.seed,
+            batch_size=args.batch_size,
+            anchor=args.anchor,
+        )
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from datetime import date
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+Location = Tuple[float, float]
+Fetcher = Callable[[], List[Dict]]
+AsyncFetcher = Callable[[], Awaitable[List[Dict]]]
+
+logger = logging.getLogger(__name__)
+
+# Resultado de _lookup cuando hay que descargar (None es un resultado válido)
+_MISS = object()
+
+
+def _days_from(forecast: List[Dict], start: date, days: int) -> Optional[List[Dict]]:
+    return [d for d in forecast if d["date"] >= start][:days] or None
+
+
+class ForecastCache:
+    """
+    Cache en memoria de pronósticos diarios, indexado por ubicación y día.
+
+    - TTL configurable: pasado ese tiempo la ubicación se vuelve a descargar.
+    - Single-flight: si varios hilos encuentran el cache vencido a la vez,
+      solo uno llama a la API y el resto espera su resultado.
+    - Snapshot en disco con el último pronóstico válido, que se usa cuando
+      la API no responde.
+    - Cache negativo: una falla se recuerda `negative_ttl_s` segundos con su
+      resultado de respaldo, así los que esperaban el lock (y los siguientes)
+      no repiten el timeout.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float,
+        snapshot_path: Optional[str] = None,
+        negative_ttl_s: float = 30.0,
+    ) -> None:
+        self.ttl_s = ttl_s
+        self.snapshot_path = snapshot_path
+        self.negative_ttl_s = negative_ttl_s
+        # location -> (fetched_at, {día: datos})
+        self._data: Dict[Location, Tuple[float, Dict[date, Dict]]] = {}
+        # location -> (failed_at, snapshot usado como respaldo)
+        self._failures: Dict[Location, Tuple[float, List[Dict]]] = {}
+        self._locks: Dict[Location, threading.Lock] = {}
+        # Los asyncio.Lock pertenecen a un event loop: se indexan por loop
+        self._alocks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.fallbacks = 0
+        self.negative_hits = 0
+
+    def _lock_for(self, location: Location) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(location)
+            if lock is None:
+                lock = self._locks[location] = threading.Lock()
+            return lock
+
+    def _fresh_days(
+        self, location: Location, start: date, days: int
+    ) -> Optional[List[Dict]]:
+        entry = self._data.get(location)
+        if entry is None:
+            return None
+        fetched_at, by_day = entry
+        if time.monotonic() - fetched_at > self.ttl_s:
+            return None
+        out = [by_day[d] for d in sorted(by_day) if d >= start][:days]
+        return out if len(out) >= days else None
+
+    def _lookup(self, location: Location, start: date, days: int):
+        """Días en cache o respaldo de una falla reciente; _MISS si hay que descargar."""
+        cached = self._fresh_days(location, start, days)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        failure = self._failures.get(location)
+        if failure is not None and time.monotonic() - failure[0] <= self.negative_ttl_s:
+            self.negative_hits += 1
+            return _days_from(failure[1], start, days)
+        return _MISS
+
+    def get(
+        self, location: Location, days: int, fetcher: Fetcher
+    ) -> Optional[List[Dict]]:
+        """
+        Devuelve `days` días a partir de hoy. Si el cache no alcanza, llama a
+        `fetcher` (una sola vez por ubicación aunque haya llamadas concurrentes).
+        Si la descarga falla usa el snapshot en disco; si tampoco hay, None.
+        """
+        start = date.today()
+        cached = self._lookup(location, start, days)
+        if cached is not _MISS:
+            return cached
+
+        with self._lock_for(location):
+            # Otro hilo pudo haber completado (o fallado) la descarga mientras
+            # esperábamos
+            cached = self._lookup(location, start, days)
+            if cached is not _MISS:
+                return cached
+
+            self.misses += 1
+            try:
+                forecast = fetcher()
+            except Exception as e:
+                return self._fallback(location, start, days, e)
+            return self._store(location, start, days, forecast)
+
+    async def aget(
+        self, location: Location, days: int, fetcher: AsyncFetcher
+    ) -> Optional[List[Dict]]:
+        """Variante asyncio de get(); la deduplicación es por event loop."""
+        start = date.today()
+        cached = self._lookup(location, start, days)
+        if cached is not _MISS:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        with self._guard:
+            locks = self._alocks.setdefault(loop, {})
+            lock = locks.get(location)
+            if lock is None:
+                lock = locks[location] = asyncio.Lock()
+        async with lock:
+            cached = self._lookup(location, start, days)
+            if cached is not _MISS:
+                return cached
+
+            self.misses += 1
+            # Solo la descarga se espera en el loop; el snapshot en disco se
+            # lee/escribe en un hilo
+            try:
+                forecast = await fetcher()
+            except Exception as e:
+                return await asyncio.to_thread(self._fallback, location, start, days, e)
+            return await asyncio.to_thread(self._store, location, start, days, forecast)
+
+    def _store(
+        self, location: Location, start: date, days: int, forecast: List[Dict]
+    ) -> List[Dict]:
+        self.fetches += 1
+        self.put(location, forecast)
+        self._save_snapshot(location, forecast)
+        return _days_from(forecast, start, days)
+
+    def _fallback(
+        self, location: Location, start: date, days: int, error: Exception
+    ) -> Optional[List[Dict]]:
+        logger.warning("Error obteniendo datos del clima: %s", error)
+        self.fallbacks += 1
+        snapshot = self._load_snapshot(location)
+        self._failures[location] = (time.monotonic(), snapshot)
+        return _days_from(snapshot, start, days)
+
+    def put(self, location: Location, forecast: List[Dict]) -> None:
+        self._data[location] = (
+            time.monotonic(),
+            {d["date"]: d for d in forecast},
+        )
+        self._failures.pop(location, None)
+
+    def version(self, location: Location) -> Optional[str]:
+        """Identifica la descarga vigente de `location` (None si no hay)."""
+        entry = self._data.get(location)
+        if entry is None:
+            return None
+        return f"{entry[0]:.6f}"
+
+    def clear(self) -> None:
+        with self._guard:
+            self._data.clear()
+            self._failures.clear()
+            self._alocks.clear()
+            self.hits = self.misses = self.fetches = self.fallbacks = 0
+            self.negative_hits = 0
+
+    def stats(self) -> Dict:
+        return {
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "fetches": self.fetches,
+            "fallbacks": self.fallbacks,
+            "negative_hits": self.negative_hits,
+            "locations": len(self._data),
+        }
+
+    # --- snapshot en disco -------------------------------------------------
+
+    @staticmethod
+    def _loc_key(location: Location) -> str:
+        return f"{location[0]:.4f},{location[1]:.4f}"
+
+    def _read_snapshot_file(self) -> Dict:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return {}
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_snapshot(self, location: Location, forecast: List[Dict]) -> None:
+        if not self.snapshot_path:
+            return
+        try:
+            data = self._read_snapshot_file()
+            data[self._loc_key(location)] = [
+                {**d, "date": d["date"].isoformat()} for d in forecast
+            ]
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True
+            )
+            tmp = f"{self.snapshot_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.snapshot_path)
+        except OSError as e:
+            logger.warning("No se pudo guardar el snapshot del clima: %s", e)
+
+    def _load_snapshot(self, location: Location) -> List[Dict]:
+        rows = self._read_snapshot_file().get(self._loc_key(location), [])
+        return [{**d, "date": date.fromisoformat(d["date"])} for d in rows]
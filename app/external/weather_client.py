@@ -1,28 +1,161 @@
 from datetime import date, datetime, timedelta
-import requests
+import asyncio
+import threading
+import time
 from typing import Dict, List
 
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.external.weather_cache import ForecastCache
+
+# Coordenadas de Buenos Aires, Argentina
+BUENOS_AIRES_LAT = -34.6037
+BUENOS_AIRES_LON = -58.3816
+BUENOS_AIRES = (BUENOS_AIRES_LAT, BUENOS_AIRES_LON)
+
+# Open-Meteo entrega hasta 16 días; se descarga siempre el máximo para que
+# cualquier consulta posterior (5, 7, 14 días...) salga del cache.
+MAX_FORECAST_DAYS = 16
+
+# API gratuita de Open-Meteo (no requiere API key)
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+forecast_cache = ForecastCache(
+    ttl_s=settings.weather_cache_ttl_s,
+    snapshot_path=settings.weather_snapshot_path,
+    negative_ttl_s=settings.weather_negative_ttl_s,
+)
+
 
 def get_weather_forecast_buenos_aires(days: int = 5) -> List[Dict]:
     """
     Obtiene el pronóstico del tiempo de Buenos Aires desde Open-Meteo API.
-    
+
+    Las respuestas se cachean en memoria (TTL configurable) y se guarda un
+    snapshot en disco que se usa si la API no está disponible.
+
     Args:
         days: Cantidad de días de pronóstico (máximo 16)
-    
+
     Returns:
         Lista de diccionarios con datos del clima por día
     """
-    # Coordenadas de Buenos Aires, Argentina
-    BUENOS_AIRES_LAT = -34.6037
-    BUENOS_AIRES_LON = -58.3816
-    
-    try:
-        # API gratuita de Open-Meteo (no requiere API key)
-        url = "https://api.open-meteo.com/v1/forecast"
-        params = {
-            "latitude": BUENOS_AIRES_LAT,
-            "longitude": BUENOS_AIRES_LON,
+    days = min(days, MAX_FORECAST_DAYS)
+    forecast = forecast_cache.get(
+        BUENOS_AIRES,
+        days,
+        lambda: weather_client.fetch_daily(
+            BUENOS_AIRES_LAT, BUENOS_AIRES_LON, MAX_FORECAST_DAYS
+        ),
+    )
+    if forecast is None:
+        # Sin API ni snapshot: devolver datos simulados realistas
+        return _get_simulated_forecast(days)
+    return forecast
+
+
+def forecast_version() -> str | None:
+    """Versión del pronóstico cacheado de Buenos Aires (para memoizar)."""
+    return forecast_cache.version(BUENOS_AIRES)
+
+
+async def get_weather_forecast_buenos_aires_async(days: int = 5) -> List[Dict]:
+    """Variante asyncio de get_weather_forecast_buenos_aires."""
+    days = min(days, MAX_FORECAST_DAYS)
+    forecast = await forecast_cache.aget(
+        BUENOS_AIRES,
+        days,
+        lambda: weather_client.afetch_daily(
+            BUENOS_AIRES_LAT, BUENOS_AIRES_LON, MAX_FORECAST_DAYS
+        ),
+    )
+    if forecast is None:
+        return _get_simulated_forecast(days)
+    return forecast
+
+
+class CircuitOpenError(RuntimeError):
+    """El circuito está abierto: no se intenta llamar a la API."""
+
+
+class CircuitBreaker:
+    """
+    Corta las llamadas a la API tras `threshold` fallos seguidos. Pasados
+    `reset_s` segundos deja pasar un intento de prueba (half-open): si sale
+    bien se cierra, si falla vuelve a abrirse.
+    """
+
+    def __init__(self, threshold: int = 3, reset_s: float = 60.0) -> None:
+        self.threshold = threshold
+        self.reset_s = reset_s
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_s:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        if self.state == "open":
+            raise CircuitOpenError("API de clima deshabilitada temporalmente")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class WeatherClient:
+    """
+    Cliente de Open-Meteo con pool de conexiones persistente (keep-alive),
+    timeouts y reintentos con backoff exponencial, y circuit breaker.
+
+    Ofrece una variante síncrona (requests.Session) y otra asyncio
+    (httpx.AsyncClient) que comparten configuración y circuit breaker.
+    """
+
+    def __init__(
+        self,
+        base_url: str = OPEN_METEO_URL,
+        timeout_s: float = 10.0,
+        retries: int = 1,
+        backoff_s: float = 0.3,
+        breaker: CircuitBreaker | None = None,
+        pool_size: int = 10,
+    ) -> None:
+        self.base_url = base_url
+        self.timeout_s = timeout_s
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool_size = pool_size
+        # httpx.AsyncClient queda atado al event loop que lo creó
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    @staticmethod
+    def _params(lat: float, lon: float, days: int) -> Dict:
+        return {
+            "latitude": lat,
+            "longitude": lon,
             "daily": [
                 "temperature_2m_max",
                 "temperature_2m_min",
@@ -32,40 +165,105 @@ def get_weather_forecast_buenos_aires(days: int = 5) -> List[Dict]:
                 "relative_humidity_2m_mean",
             ],
             "timezone": "America/Argentina/Buenos_Aires",
-            "forecast_days": min(days, 16),
+            "forecast_days": min(days, MAX_FORECAST_DAYS),
         }
+
+    def fetch_daily(self, lat: float, lon: float, days: int) -> List[Dict]:
+        """Descarga el pronóstico diario; lanza excepción si falla."""
+        self.breaker.before_call()
+        params = self._params(lat, lon, days)
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(
+                    self.base_url, params=params, timeout=self.timeout_s
+                )
+                response.raise_for_status()
+                forecast = _parse_daily(response.json())
+                self.breaker.record_success()
+                return forecast
+            except Exception:
+                if attempt >= self.retries:
+                    self.breaker.record_failure()
+                    raise
+                time.sleep(self.backoff_s * (2**attempt))
+        raise AssertionError("unreachable")
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            limits = httpx.Limits(
+                max_connections=self._pool_size,
+                max_keepalive_connections=self._pool_size,
+            )
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout_s, limits=limits
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    async def afetch_daily(self, lat: float, lon: float, days: int) -> List[Dict]:
+        """Variante asyncio de fetch_daily: no bloquea workers del servidor."""
+        self.breaker.before_call()
+        client = self._get_async_client()
+        params = self._params(lat, lon, days)
+        for attempt in range(self.retries + 1):
+            try:
+                response = await client.get(self.base_url, params=params)
+                response.raise_for_status()
+                forecast = _parse_daily(response.json())
+                self.breaker.record_success()
+                return forecast
+            except Exception:
+                if attempt >= self.retries:
+                    self.breaker.record_failure()
+                    raise
+                await asyncio.sleep(self.backoff_s * (2**attempt))
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        self.session.close()
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+def _parse_daily(data: Dict) -> List[Dict]:
+    """Convierte la respuesta 'daily' de Open-Meteo a una lista por día."""
+    daily_data = data.get("daily", {})
+    dates = daily_data.get("time", [])
+    
+    forecast = []
+    for i in range(len(dates)):
+        temp_max = daily_data.get("temperature_2m_max", [])[i]
+        temp_min = daily_data.get("temperature_2m_min", [])[i]
+        temp_avg = (temp_max + temp_min) / 2 if temp_max and temp_min else 20.0
         
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Procesar los datos diarios
-        daily_data = data.get("daily", {})
-        dates = daily_data.get("time", [])
-        
-        forecast = []
-        for i in range(len(dates)):
-            temp_max = daily_data.get("temperature_2m_max", [])[i]
-            temp_min = daily_data.get("temperature_2m_min", [])[i]
-            temp_avg = (temp_max + temp_min) / 2 if temp_max and temp_min else 20.0
-            
-            forecast.append({
-                "date": datetime.strptime(dates[i], "%Y-%m-%d").date(),
-                "temp_max": temp_max or 25.0,
-                "temp_min": temp_min or 15.0,
-                "temp_avg": temp_avg,
-                "precipitation_probability": daily_data.get("precipitation_probability_max", [])[i] or 0.0,
-                "precipitation_sum": daily_data.get("precipitation_sum", [])[i] or 0.0,
-                "windspeed_max": daily_data.get("windspeed_10m_max", [])[i] or 0.0,
-                "humidity": daily_data.get("relative_humidity_2m_mean", [])[i] or 65.0,
-            })
-        
-        return forecast
-        
-    except Exception as e:
-        # Si falla la API, devolver datos simulados realistas
-        print(f"Error obteniendo datos del clima: {e}")
-        return _get_simulated_forecast(days)
+        forecast.append({
+            "date": datetime.strptime(dates[i], "%Y-%m-%d").date(),
+            "temp_max": temp_max or 25.0,
+            "temp_min": temp_min or 15.0,
+            "temp_avg": temp_avg,
+            "precipitation_probability": daily_data.get("precipitation_probability_max", [])[i] or 0.0,
+            "precipitation_sum": daily_data.get("precipitation_sum", [])[i] or 0.0,
+            "windspeed_max": daily_data.get("windspeed_10m_max", [])[i] or 0.0,
+            "humidity": daily_data.get("relative_humidity_2m_mean", [])[i] or 65.0,
+        })
+    
+    return forecast
+
+
+weather_client = WeatherClient(
+    base_url=settings.weather_api_base or OPEN_METEO_URL,
+    timeout_s=settings.weather_timeout_s,
+    retries=settings.weather_retries,
+    backoff_s=settings.weather_backoff_s,
+    breaker=CircuitBreaker(
+        threshold=settings.weather_breaker_threshold,
+        reset_s=settings.weather_breaker_reset_s,
+    ),
+)
 
 
 def _get_simulated_forecast(days: int = 5) -> List[Dict]:
@@ -105,7 +303,18 @@ def get_weather_features(day: date | None = None) -> dict:
     
     # Obtener pronóstico de 7 días
     forecast = get_weather_forecast_buenos_aires(7)
-    
+    return features_from_forecast(d, forecast)
+
+
+async def get_weather_features_async(day: date | None = None) -> dict:
+    """Variante asyncio de get_weather_features."""
+    d = day or date.today()
+    forecast = await get_weather_forecast_buenos_aires_async(7)
+    return features_from_forecast(d, forecast)
+
+
+def features_from_forecast(d: date, forecast: List[Dict]) -> dict:
+    """Features de un día a partir de un pronóstico ya obtenido."""
     # Buscar el día específico en el pronóstico
     weather_data = None
     for daily in forecast:
@@ -1,7 +1,14 @@
+from app.core.startup import startup_timings
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.db.database import Base, engine
+from app.core.config import settings
+from app.core.templates import STATIC_DIR, CachedStaticFiles
+from app.api.precompressed import warm_pages
+from app.db.database import Base, SessionLocal, engine
+from app.db.migrations import alembic_at_head
+from app.services.attendance import backfill_rollup_if_empty
+from app.services.search import ensure_search_index
 
 # Importar modelos antes de crear las tablas para que SQLAlchemy conozca los mapeos
 from app.db import models as _models  # noqa: F401
@@ -14,6 +21,8 @@ from app.api.routers.records import router as records_router
 from app.api.routers.schedule import router as schedule_router
 from app.api.routers.vaccinations import router as vaccinations_router
 from app.api.routers.reports import router as reports_router
+from app.api.routers.exports import router as exports_router
+from app.api.routers.imports import router as imports_router
 from app.api.routers.ai import router as ai_router
 from app.api.routers.ui import router as ui_router
 from app.api.routers.vet_ui import router as vet_ui_router
@@ -22,6 +31,24 @@ from app.api.routers.vet_gestion import router as vet_gestion_router
 from app.api.routers.home import router as home_router
 from app.api.routers.ai_dashboard import router as ai_dashboard_router
 
+startup_timings.mark("imports")
+
+
+def _ensure_schema() -> str:
+    """Crea las tablas salvo que Alembic ya las gestione (o se pida skip)."""
+    mode = settings.startup_schema
+    if mode == "skip":
+        return "skipped"
+    if mode == "auto" and alembic_at_head(engine):
+        return "alembic_at_head"
+    Base.metadata.create_all(bind=engine)
+    # create_all agrega el rollup de asistencia vacío en bases existentes
+    with SessionLocal() as db:
+        backfill_rollup_if_empty(db)
+    # Tablas de búsqueda (FTS5 / tsvector): fuera de la metadata del ORM
+    ensure_search_index(engine)
+    return "create_all"
+
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Veterinaria Inteligente", version="0.1.0")
@@ -35,8 +62,12 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Crear tablas (desarrollo)
-    Base.metadata.create_all(bind=engine)
+    # Crear tablas (desarrollo); se omite si Alembic ya está en head
+    with startup_timings.phase("db_schema") as info:
+        info["result"] = _ensure_schema()
+
+    # CSS compartido de las vistas HTML (cacheable, ver app.core.templates)
+    app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
 
     # Routers
     app.include_router(home_router, tags=["home"], include_in_schema=False)
@@ -53,6 +84,8 @@ def create_app() -> FastAPI:
         vaccinations_router, prefix="/vaccinations", tags=["vaccinations"]
     )
     app.include_router(reports_router, prefix="/reports", tags=["reports"])
+    app.include_router(exports_router, prefix="/exports", tags=["exports"])
+    app.include_router(imports_router, prefix="/import", tags=["import"])
     app.include_router(ai_router, prefix="/ai", tags=["ai"])
     app.include_router(
         ai_dashboard_router,
@@ -76,6 +109,11 @@ def create_app() -> FastAPI:
         tags=["vet-gestion"],
         include_in_schema=False,
     )
+    startup_timings.mark("routers")
+
+    # Páginas de inicio: HTML constante, renderizado y comprimido una sola vez
+    with startup_timings.phase("landing_pages") as info:
+        info["pages"] = warm_pages()
 
     return app
 
@@ -1,3 +1,8 @@
+from datetime import date
+
+import numpy as np
+
+
 def vectorize(features: dict) -> list[float]:
     return [
         float(features.get("temp_avg", 20.0)),
@@ -6,3 +11,71 @@ def vectorize(features: dict) -> list[float]:
         float(features.get("month", 1)),
         float(features.get("weekday", 0)),
     ]
+
+
+# Orden de columnas de la matriz (idéntico a vectorize)
+FEATURE_COLUMNS = ("temp_avg", "precip_prob", "is_weekend", "month", "weekday")
+
+
+def date_range(start: date, end: date) -> np.ndarray:
+    """Días entre start y end (inclusive) como datetime64[D]."""
+    return np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+
+
+def calendar_columns(days: np.ndarray) -> dict:
+    """Columnas de calendario vectorizadas para un array datetime64[D]."""
+    # 1970-01-01 fue jueves (weekday 3)
+    weekday = (days.astype(np.int64) + 3) % 7
+    return {
+        "weekday": weekday,
+        "is_weekend": (weekday >= 5).astype(np.int64),
+        "month": days.astype("datetime64[M]").astype(np.int64) % 12 + 1,
+        "doy": (days - days.astype("datetime64[Y]")).astype(np.int64) + 1,
+    }
+
+
+def climatology(days: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Clima medio esperado de Buenos Aires (verano en enero) para `days`:
+    (temp_avg, precip_prob). Se usa cuando no hay pronóstico para un día.
+    """
+    doy = calendar_columns(days)["doy"]
+    temp = 17.0 + 7.0 * np.cos(2 * np.pi * (doy - 15) / 365.0)
+    # Media de la Beta(2, 5) usada en synth_weather
+    precip = np.full(len(days), 2.0 / 7.0)
+    return temp, precip
+
+
+def synth_weather(
+    days: np.ndarray, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Climatología sintética con ruido (reproducible por `rng`) para `days`.
+    Devuelve (temp_avg, precip_prob) sin hacer llamadas HTTP.
+    """
+    temp, _ = climatology(days)
+    temp = temp + rng.normal(0.0, 2.0, size=len(days))
+    precip = rng.beta(2.0, 5.0, size=len(days))
+    return temp, precip
+
+
+def build_feature_matrix(
+    days: np.ndarray,
+    temp_avg: np.ndarray | float = 20.0,
+    precip_prob: np.ndarray | float = 0.0,
+) -> np.ndarray:
+    """
+    Matriz de features (una fila por día) con las mismas columnas que
+    vectorize, construida de forma columnar con NumPy.
+    """
+    cal = calendar_columns(days)
+    n = len(days)
+    return np.column_stack(
+        [
+            np.broadcast_to(np.asarray(temp_avg, dtype=float), (n,)),
+            np.broadcast_to(np.asarray(precip_prob, dtype=float), (n,)),
+            cal["is_weekend"],
+            cal["month"],
+            cal["weekday"],
+        ]
+    ).astype(float)
@@ -5,6 +5,7 @@ import unicodedata
 from typing import Tuple, Dict, Any, List
 
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
@@ -17,6 +18,8 @@ from sklearn.metrics import (
 )
 import json
 
+from app.ml.registry import registry
+
 
 MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
 MODEL_PATH = os.path.join(MODEL_DIR, "intent.joblib")
@@ -161,33 +164,70 @@ def _save_metrics_artifacts(
 def save_model(pipe: Pipeline, path: str = MODEL_PATH) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
     joblib.dump(pipe, path)
+    registry.invalidate(path)
 
 
 def load_model(path: str = MODEL_PATH) -> Pipeline:
-    return joblib.load(path)
+    return registry.get(path)
+
+
+def _topk_indices(proba: np.ndarray, k: int) -> np.ndarray:
+    """
+    Índices de las k clases más probables (orden descendente) por fila.
+    Usa argpartition (O(n)) y solo ordena los k candidatos.
+    """
+    n = proba.shape[-1]
+    k = min(max(1, k), n)
+    if k < n:
+        part = np.argpartition(-proba, k - 1, axis=-1)[..., :k]
+    else:
+        part = np.broadcast_to(np.arange(n), proba.shape).copy()
+    vals = np.take_along_axis(proba, part, axis=-1)
+    order = np.argsort(-vals, axis=-1, kind="stable")
+    return np.take_along_axis(part, order, axis=-1)
+
+
+def predict_intent_full(
+    text: str, k: int = 3, path: str = MODEL_PATH
+) -> Tuple[str, float, List[Tuple[str, float]]]:
+    """
+    Predicción completa en una sola pasada: (label, probabilidad, top-k).
+    Calcula el vector de probabilidades una única vez.
+    """
+    return predict_intent_batch([text], k=k, path=path)[0]
 
 
 def predict_intent(text: str, path: str = MODEL_PATH) -> Tuple[str, float]:
-    if not os.path.exists(path):
-        raise FileNotFoundError(path)
-    pipe = load_model(path)
-    proba = pipe.predict_proba([text])[0]
-    idx = proba.argmax()
-    label = pipe.classes_[idx]
-    return str(label), float(proba[idx])
+    label, prob, _top = predict_intent_full(text, k=1, path=path)
+    return label, prob
 
 
 def predict_intent_topk(
     text: str, k: int = 3, path: str = MODEL_PATH
 ) -> List[Tuple[str, float]]:
+    return predict_intent_full(text, k=k, path=path)[2]
+
+
+def predict_intent_batch(
+    texts: List[str], k: int = 3, path: str = MODEL_PATH
+) -> List[Tuple[str, float, List[Tuple[str, float]]]]:
+    """
+    Predice varias frases con un único predict_proba sobre toda la lista.
+    Devuelve (label, probabilidad, top-k) por ítem, en el mismo orden.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(path)
+    if not texts:
+        return []
     pipe = load_model(path)
-    proba = pipe.predict_proba([text])[0]
-    classes = list(pipe.classes_)
-    # top-k indices sorted desc
-    idxs = sorted(range(len(proba)), key=lambda i: proba[i], reverse=True)[: max(1, k)]
-    return [(str(classes[i]), float(proba[i])) for i in idxs]
+    proba = pipe.predict_proba(list(texts))
+    classes = pipe.classes_
+    order = _topk_indices(proba, k)
+    results = []
+    for row, idxs in zip(proba, order):
+        top = [(str(classes[i]), float(row[i])) for i in idxs]
+        results.append((top[0][0], top[0][1], top))
+    return results
 
 
 def train_and_save_default(
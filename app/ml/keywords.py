@@ -132,6 +132,11 @@ def classify_text(text: str) -> Tuple[str, List[str], float]:
     return best_label, best_matches, float(confidence)
 
 
+def classify_texts(texts: List[str]) -> List[Tuple[str, List[str], float]]:
+    """Versión por lotes de classify_text; conserva el orden de entrada."""
+    return [classify_text(t) for t in texts]
+
+
 if __name__ == "__main__":
     examples = [
         "Quiero agendar un turno para mañana",
@@ -1,6 +1,8 @@
 from pathlib import Path
 import joblib
 
+from app.ml.registry import registry
+
 MODEL_DIR = Path(__file__).resolve().parent / "models"
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
 MODEL_PATH = MODEL_DIR / "affluence_model.pkl"
@@ -8,9 +10,10 @@ MODEL_PATH = MODEL_DIR / "affluence_model.pkl"
 
 def save_model(model) -> None:
     joblib.dump(model, MODEL_PATH)
+    registry.invalidate(MODEL_PATH)
 
 
 def load_model():
     if MODEL_PATH.exists():
-        return joblib.load(MODEL_PATH)
+        return registry.get(MODEL_PATH)
     return None
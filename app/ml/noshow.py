@@ -1,13 +1,15 @@
 from __future__ import annotations
-from datetime import date, timedelta
+from datetime import date
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 import joblib
 import numpy as np
 from sklearn.linear_model import LogisticRegression
 
-from app.external.weather_client import get_weather_features
+from app.external.weather_client import features_from_forecast, get_weather_features
+from app.ml.features import calendar_columns, synth_weather
+from app.ml.registry import registry
 
 MODELS_DIR = Path(__file__).resolve().parent / "models"
 MODEL_PATH = MODELS_DIR / "noshow.joblib"
@@ -19,51 +21,99 @@ def _vectorize(
     return np.array([is_weekend, hour, temp_avg, precip_prob], dtype=float)
 
 
-def _synth_data(n_days: int = 200) -> tuple[np.ndarray, np.ndarray]:
-    X, y = [], []
-    start = date.today() - timedelta(days=n_days)
-    for i in range(n_days):
-        d = start + timedelta(days=i)
-        w = get_weather_features(d)
-        for hour in (9, 11, 14, 17, 19):
-            x = _vectorize(d, hour, w["temp_avg"], w["precip_prob"], w["is_weekend"])
-            # Regla sintética: más no-show con lluvia alta, tarde-noche y fines de semana
-            p = 0.1
-            p += 0.4 if w["precip_prob"] > 0.4 else 0
-            p += 0.15 if hour >= 17 else 0
-            p += 0.1 if w["is_weekend"] == 1 else 0
-            p = min(max(p, 0.01), 0.95)
-            y_val = 1 if np.random.rand() < p else 0  # 1 => no-show
-            X.append(x)
-            y.append(y_val)
-    return np.vstack(X), np.array(y)
-
-
-def train_noshow_model() -> None:
+HOURS = (9, 11, 14, 17, 19)
+
+
+def _noshow_rule(precip_prob, hour, is_weekend):
+    """
+    Regla sintética: más no-show con lluvia alta, tarde-noche y fines de
+    semana. Acepta escalares o arrays de NumPy (se aplica broadcasting).
+    """
+    p = (
+        0.1
+        + 0.4 * (np.asarray(precip_prob) > 0.4)
+        + 0.15 * (np.asarray(hour) >= 17)
+        + 0.1 * (np.asarray(is_weekend) == 1)
+    )
+    return np.clip(p, 0.01, 0.95)
+
+
+def _synth_weather(
+    days: np.ndarray, rng: np.random.Generator, forecast: list[dict] | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Clima por día para el rango `days` (datetime64[D]). Usa la climatología
+    sintética de app.ml.features y, si se pasa un pronóstico ya descargado,
+    pisa los días que éste cubra. No hace llamadas HTTP.
+    """
+    temp, precip = synth_weather(days, rng)
+    if forecast:
+        index = {np.datetime64(f["date"], "D"): f for f in forecast}
+        for i in np.flatnonzero(np.isin(days, np.array(list(index)))):
+            f = index[days[i]]
+            temp[i] = f.get("temp_avg", temp[i])
+            precip[i] = f.get("precipitation_probability", precip[i] * 100) / 100.0
+    return temp, precip
+
+
+def _synth_data(
+    n_days: int = 200,
+    seed: int = 42,
+    end: date | None = None,
+    forecast: list[dict] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Genera el dataset sintético (n_days × len(HOURS) filas) de forma
+    vectorizada y reproducible: mismo `seed` y `end` => mismos datos.
+    """
+    rng = np.random.default_rng(seed)
+    end = end or date.today()
+    days = np.datetime64(end, "D") - n_days + np.arange(n_days)
+    temp, precip = _synth_weather(days, rng, forecast)
+    weekend = calendar_columns(days)["is_weekend"].astype(float)
+
+    hours = np.array(HOURS, dtype=float)
+    shape = (n_days, len(hours))
+    X = np.column_stack(
+        [
+            np.broadcast_to(weekend[:, None], shape).ravel(),
+            np.broadcast_to(hours[None, :], shape).ravel(),
+            np.broadcast_to(temp[:, None], shape).ravel(),
+            np.broadcast_to(precip[:, None], shape).ravel(),
+        ]
+    )
+    p = _noshow_rule(X[:, 3], X[:, 1], X[:, 0])
+    y = (rng.random(len(p)) < p).astype(int)  # 1 => no-show
+    return X, y
+
+
+def train_noshow_model(
+    n_days: int = 200, seed: int = 42, forecast: list[dict] | None = None
+) -> None:
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
-    X, y = _synth_data()
+    X, y = _synth_data(n_days=n_days, seed=seed, forecast=forecast)
     clf = LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)
     clf.fit(X, y)
     joblib.dump(clf, MODEL_PATH)
+    registry.invalidate(MODEL_PATH)
 
 
 def load_noshow_model():
     if MODEL_PATH.exists():
-        return joblib.load(MODEL_PATH)
+        return registry.get(MODEL_PATH)
     return None
 
 
-def predict_noshow(day: date, hour: int) -> Tuple[str, float]:
+def predict_noshow(
+    day: date, hour: int, weather: dict | None = None
+) -> Tuple[str, float]:
+    """`weather` permite pasar features ya obtenidas (p. ej. de forma async)."""
     model = load_noshow_model()
-    w = get_weather_features(day)
+    w = weather or get_weather_features(day)
     x = _vectorize(day, hour, w["temp_avg"], w["precip_prob"], w["is_weekend"])
     if model is None:
         # fallback simple por reglas
-        p = 0.1
-        p += 0.4 if w["precip_prob"] > 0.4 else 0
-        p += 0.15 if hour >= 17 else 0
-        p += 0.1 if w["is_weekend"] == 1 else 0
-        p = float(min(max(p, 0.01), 0.95))
+        p = float(_noshow_rule(w["precip_prob"], hour, w["is_weekend"]))
         return ("no-show" if p >= 0.5 else "show"), (p if p >= 0.5 else 1 - p)
 
     proba = float(model.predict_proba([x])[0][1])  # probabilidad de no-show
@@ -72,5 +122,80 @@ def predict_noshow(day: date, hour: int) -> Tuple[str, float]:
     return label, prob
 
 
+# (día, horas, versión de modelo, versión de pronóstico) -> [(hora, label, prob)]
+_grid_memo: Dict[tuple, List[Tuple[int, str, float]]] = {}
+_GRID_MEMO_MAX = 1024
+
+
+def _label_prob(p_noshow: float) -> Tuple[str, float]:
+    label = "no-show" if p_noshow >= 0.5 else "show"
+    return label, (p_noshow if label == "no-show" else 1 - p_noshow)
+
+
+def predict_noshow_grid(
+    days: List[date],
+    hours: List[int],
+    forecast: List[dict],
+    forecast_version: str | None = None,
+) -> Dict[date, List[Tuple[int, str, float]]]:
+    """
+    Riesgo de no-show para cada (día, hora) con una sola matriz de features
+    y un único predict_proba. Memoiza por día, versión del modelo y versión
+    del pronóstico: si ninguno cambió, no se vuelve a calcular.
+    """
+    model_version = registry.version(MODEL_PATH)
+    hours_key = tuple(hours)
+    result: Dict[date, List[Tuple[int, str, float]]] = {}
+    pending = []
+    for d in days:
+        cached = _grid_memo.get((d, hours_key, model_version, forecast_version))
+        if cached is not None:
+            result[d] = cached
+        else:
+            pending.append(d)
+
+    if pending:
+        weather = [features_from_forecast(d, forecast) for d in pending]
+        shape = (len(pending), len(hours))
+        hrs = np.broadcast_to(np.array(hours, dtype=float)[None, :], shape)
+
+        def per_day(key):
+            col = np.array([w[key] for w in weather], dtype=float)
+            return np.broadcast_to(col[:, None], shape)
+
+        X = np.column_stack(
+            [
+                per_day("is_weekend").ravel(),
+                hrs.ravel(),
+                per_day("temp_avg").ravel(),
+                per_day("precip_prob").ravel(),
+            ]
+        )
+        model = load_noshow_model()
+        if model is None:
+            p = _noshow_rule(X[:, 3], X[:, 1], X[:, 0])
+        else:
+            p = model.predict_proba(X)[:, 1]
+        p = p.reshape(shape)
+
+        if len(_grid_memo) + len(pending) > _GRID_MEMO_MAX:
+            _grid_memo.clear()
+        for i, d in enumerate(pending):
+            slots = [(h, *_label_prob(float(p[i, j]))) for j, h in enumerate(hours)]
+            _grid_memo[(d, hours_key, model_version, forecast_version)] = slots
+            result[d] = slots
+    return result
+
+
 if __name__ == "__main__":
-    train_noshow_model()
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Entrena el modelo de no-show")
+    parser.add_argument("--days", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    t0 = time.perf_counter()
+    train_noshow_model(n_days=args.days, seed=args.seed)
+    rows = args.days * len(HOURS)
+    print(f"Modelo entrenado con {rows} filas en {time.perf_counter() - t0:.2f}s")
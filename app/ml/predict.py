@@ -1,7 +1,8 @@
-from typing import Tuple
+from datetime import date
+from typing import Dict, List, Tuple
 import numpy as np
 from app.ml.model import load_model
-from app.ml.features import vectorize
+from app.ml.features import build_feature_matrix, climatology, vectorize
 
 LABELS = {0: "Baja", 1: "Media", 2: "Alta"}
 
@@ -27,3 +28,46 @@ def predict_affluence(features: dict) -> Tuple[str, float]:
     proba = model.predict_proba(x)[0]
     idx = int(np.argmax(proba))
     return LABELS.get(idx, "Media"), float(proba[idx])
+
+
+def _rule_labels(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Versión vectorizada de la regla de respaldo de predict_affluence."""
+    temp, precip, weekend = X[:, 0], X[:, 1], X[:, 2]
+    idx = np.ones(len(X), dtype=int)
+    prob = np.full(len(X), 0.5)
+    low = precip > 0.25
+    high = (weekend == 1) & (temp > 18) & (precip < 0.2)
+    idx[low], prob[low] = 0, 0.6
+    idx[high], prob[high] = 2, 0.7
+    return idx, prob
+
+
+def predict_affluence_range(
+    days: List[date], forecast: List[Dict]
+) -> List[Tuple[date, str, float]]:
+    """
+    Predice la afluencia de varios días con una sola matriz de features y un
+    único predict_proba. Los días sin pronóstico usan la climatología media.
+    """
+    if not days:
+        return []
+    dates = np.array(days, dtype="datetime64[D]")
+    temp, precip = climatology(dates)
+    by_day = {f["date"]: f for f in forecast}
+    for i, d in enumerate(days):
+        f = by_day.get(d)
+        if f is not None:
+            temp[i] = f.get("temp_avg", 20.0)
+            precip[i] = f.get("precipitation_probability", 20.0) / 100.0
+    X = build_feature_matrix(dates, temp, precip)
+
+    model = load_model()
+    if model is None:
+        idx, prob = _rule_labels(X)
+    else:
+        proba = model.predict_proba(X)
+        idx = proba.argmax(axis=1)
+        prob = proba[np.arange(len(X)), idx]
+    return [
+        (d, LABELS.get(int(i), "Media"), float(p)) for d, i, p in zip(days, idx, prob)
+    ]
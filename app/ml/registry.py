@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _joblib_load(path: str) -> Any:
+    # joblib se importa al cargar el primer modelo, no al importar el módulo
+    import joblib
+
+    return joblib.load(path)
+
+
+@dataclass
+class _Entry:
+    model: Any
+    signature: Tuple[int, int]
+    load_time_s: float
+    loaded_at: float
+
+
+class ModelRegistry:
+    """
+    Cache de modelos en memoria compartido por todo el proceso.
+
+    Cada artefacto se carga una sola vez y se guarda por ruta junto con su
+    firma en disco (mtime + tamaño). Si el archivo cambia (p. ej. tras
+    reentrenar), la próxima lectura lo recarga automáticamente.
+    """
+
+    def __init__(self, loader: Optional[Callable[[str], Any]] = None) -> None:
+        self._loader = loader or _joblib_load
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @staticmethod
+    def _key(path: str | Path) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    @staticmethod
+    def _signature(path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, path: str | Path) -> Any:
+        """Devuelve el modelo de `path`; lanza FileNotFoundError si no existe."""
+        key = self._key(path)
+        sig = self._signature(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == sig:
+            self.hits += 1
+            return entry.model
+
+        with self._lock:
+            # Otro hilo pudo haberlo cargado mientras esperábamos el lock
+            entry = self._entries.get(key)
+            sig = self._signature(key)
+            if entry is not None and entry.signature == sig:
+                self.hits += 1
+                return entry.model
+
+            t0 = time.perf_counter()
+            model = self._loader(key)
+            elapsed = time.perf_counter() - t0
+            self.misses += 1
+            if entry is not None:
+                self.reloads += 1
+            self._entries[key] = _Entry(
+                model=model, signature=sig, load_time_s=elapsed, loaded_at=time.time()
+            )
+            return model
+
+    def version(self, path: str | Path) -> str | None:
+        """Versión del artefacto en disco (mtime + tamaño) o None si no existe."""
+        try:
+            mtime_ns, size = self._signature(self._key(path))
+        except FileNotFoundError:
+            return None
+        return f"{mtime_ns}-{size}"
+
+    def invalidate(self, path: str | Path) -> None:
+        with self._lock:
+            self._entries.pop(self._key(path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.reloads = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {
+                key: {
+                    "mtime_ns": e.signature[0],
+                    "size": e.signature[1],
+                    "load_time_ms": round(e.load_time_s * 1000.0, 3),
+                    "loaded_at": e.loaded_at,
+                }
+                for key, e in self._entries.items()
+            }
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "models": models,
+            }
+
+
+registry = ModelRegistry()
+
+
+def get_model(path: str | Path) -> Any:
+    return registry.get(path)
@@ -1,12 +1,14 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple
 
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 import joblib
 
+from app.ml.registry import registry
+
 MODELS_DIR = Path(__file__).resolve().parent / "models"
 SENTIMENT_PATH = MODELS_DIR / "sentiment.joblib"
 
@@ -51,11 +53,12 @@ def train_sentiment_model() -> None:
     )
     pipe.fit(X, y)
     joblib.dump(pipe, SENTIMENT_PATH)
+    registry.invalidate(SENTIMENT_PATH)
 
 
 def load_sentiment_model():
     if SENTIMENT_PATH.exists():
-        return joblib.load(SENTIMENT_PATH)
+        return registry.get(SENTIMENT_PATH)
     return None
 
 
@@ -73,5 +76,21 @@ def predict_sentiment(text: str) -> Tuple[str, float]:
     return label, p_pos if label == "positivo" else 1.0 - p_pos
 
 
+def predict_sentiment_batch(texts: List[str]) -> List[Tuple[str, float]]:
+    if not texts:
+        return []
+    model = load_sentiment_model()
+    if model is None:
+        train_sentiment_model()
+        model = load_sentiment_model()
+
+    # Un solo predict_proba para todo el lote; columna 1 => positivo
+    p_pos = model.predict_proba(list(texts))[:, 1]
+    return [
+        ("positivo", float(p)) if p >= 0.5 else ("negativo", 1.0 - float(p))
+        for p in p_pos
+    ]
+
+
 if __name__ == "__main__":
     train_sentiment_model()
@@ -1,46 +1,152 @@
 from sklearn.ensemble import RandomForestClassifier
 import numpy as np
-from datetime import date, timedelta
-from app.ml.features import vectorize
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.ml.features import (
+    build_feature_matrix,
+    calendar_columns,
+    date_range,
+    synth_weather,
+)
 from app.ml.model import save_model
 
 # Entrenamiento con datos sintéticos para desbloquear el endpoint de IA
 
 
-def synth_data(n_days: int = 365):
-    X, y = [], []
-    start = date.today() - timedelta(days=n_days)
-    for i in range(n_days):
-        d = start + timedelta(days=i)
-        feats = {
-            "date": d,
-            "temp_avg": 10 + 15 * np.sin(2 * np.pi * d.timetuple().tm_yday / 365.0),
-            "precip_prob": 0.3 if d.weekday() in (5, 6) else 0.1,
-            "is_weekend": 1 if d.weekday() >= 5 else 0,
-            "month": d.month,
-            "weekday": d.weekday(),
-        }
-        X.append(vectorize(feats))
-        # Regla simple: fines de semana y buen clima => Alta, lluvia => Baja
-        if (
-            feats["is_weekend"]
-            and feats["temp_avg"] > 18
-            and feats["precip_prob"] < 0.2
-        ):
-            y.append(2)  # Alta
-        elif feats["precip_prob"] > 0.25:
-            y.append(0)  # Baja
-        else:
-            y.append(1)  # Media
-    return np.array(X), np.array(y)
-
-
-def train_and_save():
-    X, y = synth_data()
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
+def _affluence_rule(X: np.ndarray) -> np.ndarray:
+    # Regla simple: fines de semana y buen clima => Alta, lluvia => Baja
+    temp, precip, weekend = X[:, 0], X[:, 1], X[:, 2]
+    y = np.ones(len(X), dtype=int)  # Media
+    y[precip > 0.25] = 0  # Baja
+    y[(weekend == 1) & (temp > 18) & (precip < 0.2)] = 2  # Alta
+    return y
+
+
+def synth_data(n_days: int = 365, end: date | None = None):
+    end = end or date.today() - timedelta(days=1)
+    days = date_range(end - timedelta(days=n_days - 1), end)
+    cal = calendar_columns(days)
+    temp = 10 + 15 * np.sin(2 * np.pi * cal["doy"] / 365.0)
+    precip = np.where(cal["weekday"] >= 5, 0.3, 0.1)
+    X = build_feature_matrix(days, temp, precip)
+    return X, _affluence_rule(X)
+
+
+def daily_appointment_counts(db: Session, start: date, end: date) -> np.ndarray:
+    """
+    Cantidad de turnos por día (una fila por día del rango, 0 si no hubo),
+    calculada con un solo GROUP BY sobre la tabla appointments.
+    """
+    start_dt = datetime(start.year, start.month, start.day)
+    end_dt = datetime(end.year, end.month, end.day) + timedelta(days=1)
+    day_col = func.date(models.Appointment.appointment_date)
+    rows = (
+        db.query(day_col, func.count(models.Appointment.id))
+        .filter(
+            models.Appointment.appointment_date >= start_dt,
+            models.Appointment.appointment_date < end_dt,
+        )
+        .group_by(day_col)
+        .all()
+    )
+    days = date_range(start, end)
+    counts = np.zeros(len(days), dtype=np.int64)
+    if rows:
+        # SQLite devuelve 'YYYY-MM-DD' y Postgres un date: normalizamos
+        idx = np.array([np.datetime64(str(d)[:10], "D") for d, _ in rows])
+        pos = (idx - days[0]).astype(np.int64)
+        counts[pos] = [c for _, c in rows]
+    return counts
+
+
+def labels_from_counts(counts: np.ndarray) -> np.ndarray:
+    """Baja/Media/Alta (0/1/2) según los terciles de turnos diarios."""
+    if len(counts) == 0:
+        return np.zeros(0, dtype=int)
+    low, high = np.quantile(counts, [1 / 3, 2 / 3])
+    return np.digitize(counts, [low, high], right=True).astype(int)
+
+
+def history_data(db: Session, start: date, end: date, seed: int = 42):
+    """
+    Dataset histórico: features por día y etiqueta según la afluencia real
+    registrada en appointments. El clima histórico no está disponible, así
+    que se usa la climatología sintética (reproducible por `seed`).
+    """
+    days = date_range(start, end)
+    temp, precip = synth_weather(days, np.random.default_rng(seed))
+    X = build_feature_matrix(days, temp, precip)
+    y = labels_from_counts(daily_appointment_counts(db, start, end))
+    return X, y
+
+
+def train_and_save(
+    X: np.ndarray | None = None,
+    y: np.ndarray | None = None,
+    n_estimators: int = 100,
+    n_jobs: int | None = None,
+):
+    if X is None or y is None:
+        X, y = synth_data()
+    model = RandomForestClassifier(
+        n_estimators=n_estimators, random_state=42, n_jobs=n_jobs
+    )
     model.fit(X, y)
     save_model(model)
+    return model
+
+
+def benchmark(n_days: int = 365 * 50, n_jobs: int | None = -1) -> dict:
+    """Mide filas/s del builder de features y el tiempo de entrenamiento."""
+    t0 = time.perf_counter()
+    X, y = synth_data(n_days)
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs).fit(X, y)
+    fit_s = time.perf_counter() - t0
+    return {
+        "rows": len(X),
+        "build_s": round(build_s, 4),
+        "rows_per_s": round(len(X) / build_s) if build_s > 0 else None,
+        "fit_s": round(fit_s, 4),
+        "n_jobs": n_jobs,
+    }
 
 
 if __name__ == "__main__":
-    train_and_save()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Entrena el modelo de afluencia")
+    parser.add_argument(
+        "--source",
+        choices=("synthetic", "db"),
+        default="synthetic",
+        help="synthetic: reglas; db: afluencia real de la tabla appointments",
+    )
+    parser.add_argument("--years", type=float, default=1.0)
+    parser.add_argument("--n-jobs", type=int, default=None)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args()
+
+    n_days = max(1, int(365 * args.years))
+    if args.benchmark:
+        print(benchmark(n_days=n_days, n_jobs=args.n_jobs))
+    elif args.source == "db":
+        from app.db.database import SessionLocal
+
+        end = date.today() - timedelta(days=1)
+        db = SessionLocal()
+        try:
+            X, y = history_data(db, end - timedelta(days=n_days - 1), end)
+        finally:
+            db.close()
+        train_and_save(X, y, args.n_estimators, args.n_jobs)
+        print(f"Modelo entrenado con {len(X)} días de historial")
+    else:
+        train_and_save(*synth_data(n_days), args.n_estimators, args.n_jobs)
+        print(f"Modelo entrenado con {n_days} días sintéticos")
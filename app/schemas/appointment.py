@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 
 class AppointmentBase(BaseModel):
@@ -21,6 +21,12 @@ class AppointmentCreate(AppointmentBase):
 
 
 class AppointmentRead(AppointmentBase):
+    # En el modelo la columna se llama appointment_date
+    date: datetime = Field(
+        ...,
+        validation_alias=AliasChoices("date", "appointment_date"),
+        example="2025-11-04T15:00:00",
+    )
     id: int
     status: str
     pet_id: int
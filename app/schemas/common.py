@@ -1,4 +1,5 @@
 from datetime import date
+from typing import List
 from pydantic import BaseModel
 
 
@@ -8,8 +9,23 @@ class AffluencePrediction(BaseModel):
     probability: float
 
 
+class AffluenceRange(BaseModel):
+    start: date
+    end: date
+    items: List[AffluencePrediction]
+
+
 class NoShowPrediction(BaseModel):
     date: date
     hour: int
     label: str  # no-show | show
     probability: float  # probability of no-show
+
+
+class NoShowGrid(BaseModel):
+    start: date
+    days: int
+    hours: List[int]
+    model_version: str | None = None
+    forecast_version: str | None = None
+    items: List[NoShowPrediction]
@@ -10,3 +10,11 @@ class IntentResponse(BaseModel):
     label: str
     probability: float
     top3: List[dict] | None = None
+
+
+class IntentBatchRequest(BaseModel):
+    texts: List[str]
+
+
+class IntentBatchResponse(BaseModel):
+    items: List[IntentResponse]
@@ -10,3 +10,11 @@ class ClassificationResponse(BaseModel):
     label: str
     keywords: List[str]
     confidence: float
+
+
+class MessageBatchRequest(BaseModel):
+    texts: List[str]
+
+
+class ClassificationBatchResponse(BaseModel):
+    items: List[ClassificationResponse]
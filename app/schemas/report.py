@@ -1,10 +1,19 @@
 from datetime import date
+from typing import List
 from pydantic import BaseModel
 
 
+class AttendanceDay(BaseModel):
+    date: date
+    attended: int
+    canceled: int
+    scheduled: int
+
+
 class AttendanceReport(BaseModel):
     start: date
     end: date
     attended: int
     canceled: int
     scheduled: int
+    series: List[AttendanceDay] | None = None
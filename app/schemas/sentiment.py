@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List
 
 
 class SentimentRequest(BaseModel):
@@ -8,3 +9,11 @@ class SentimentRequest(BaseModel):
 class SentimentResponse(BaseModel):
     label: str
     probability: float
+
+
+class SentimentBatchRequest(BaseModel):
+    texts: List[str]
+
+
+class SentimentBatchResponse(BaseModel):
+    items: List[SentimentResponse]
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+
+APPOINTMENT_STATUSES = ("scheduled", "attended", "canceled")
+# El modelo asigna "scheduled" recién en el INSERT
+DEFAULT_STATUS = "scheduled"
+
+Rollup = models.AppointmentDailyStat
+Key = Tuple[date, str]
+
+
+def _empty_totals() -> Dict[str, int]:
+    return {s: 0 for s in APPOINTMENT_STATUSES}
+
+
+def _to_date(value: Any) -> date:
+    # SQLite devuelve 'YYYY-MM-DD' y Postgres un date: normalizamos
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _range_bounds(start: date, end: date) -> Tuple[datetime, datetime]:
+    start_dt = datetime(start.year, start.month, start.day)
+    end_dt = datetime(end.year, end.month, end.day) + timedelta(days=1)
+    return start_dt, end_dt
+
+
+# --- consultas ---------------------------------------------------------------
+
+
+def _live_rows(db: Session, start: date, end: date, by_day: bool) -> List[Tuple]:
+    """GROUP BY [día,] estado directamente sobre appointments."""
+    start_dt, end_dt = _range_bounds(start, end)
+    status = func.coalesce(models.Appointment.status, DEFAULT_STATUS)
+    cols = [status, func.count(models.Appointment.id)]
+    group = [status]
+    if by_day:
+        day = func.date(models.Appointment.appointment_date)
+        cols.insert(0, day)
+        group.insert(0, day)
+    stmt = (
+        select(*cols)
+        .where(
+            models.Appointment.appointment_date >= start_dt,
+            models.Appointment.appointment_date < end_dt,
+        )
+        .group_by(*group)
+    )
+    return db.execute(stmt).all()
+
+
+def _rollup_rows(db: Session, start: date, end: date, by_day: bool) -> List[Tuple]:
+    """Mismo resultado que _live_rows, leyendo el rollup diario."""
+    cols = [Rollup.status, func.sum(Rollup.total)]
+    group = [Rollup.status]
+    if by_day:
+        cols.insert(0, Rollup.day)
+        group.insert(0, Rollup.day)
+    stmt = (
+        select(*cols)
+        .where(Rollup.day >= start, Rollup.day <= end)
+        .group_by(*group)
+    )
+    return db.execute(stmt).all()
+
+
+def _rows(db: Session, start: date, end: date, by_day: bool) -> List[Tuple]:
+    if settings.attendance_rollup:
+        return _rollup_rows(db, start, end, by_day)
+    return _live_rows(db, start, end, by_day)
+
+
+def attendance_totals(db: Session, start: date, end: date) -> Dict[str, int]:
+    """Turnos por estado en [start, end] (una sola consulta)."""
+    totals = _empty_totals()
+    for status, n in _rows(db, start, end, by_day=False):
+        totals[status] = totals.get(status, 0) + int(n or 0)
+    return totals
+
+
+def attendance_series(db: Session, start: date, end: date) -> List[Dict[str, Any]]:
+    """Serie diaria (todos los días del rango, con ceros) para graficar."""
+    by_day: Dict[date, Dict[str, int]] = {}
+    for day, status, n in _rows(db, start, end, by_day=True):
+        totals = by_day.setdefault(_to_date(day), _empty_totals())
+        totals[status] = totals.get(status, 0) + int(n or 0)
+    out = []
+    for i in range((end - start).days + 1):
+        d = start + timedelta(days=i)
+        out.append({"date": d, **by_day.get(d, _empty_totals())})
+    return out
+
+
+# --- mantenimiento del rollup ------------------------------------------------
+
+
+def _apply_deltas(conn: Connection, deltas: Dict[Key, int]) -> None:
+    table = Rollup.__table__
+    insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(
+        conn.dialect.name
+    )
+    for (day, status), delta in deltas.items():
+        if delta == 0:
+            continue
+        if insert is not None:
+            stmt = insert(table).values(day=day, status=status, total=delta)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.day, table.c.status],
+                set_={"total": table.c.total + stmt.excluded.total},
+            )
+            conn.execute(stmt)
+            continue
+        # Otros motores: UPDATE y, si no había fila, INSERT
+        res = conn.execute(
+            table.update()
+            .where(table.c.day == day, table.c.status == status)
+            .values(total=table.c.total + delta)
+        )
+        if res.rowcount == 0:
+            conn.execute(table.insert().values(day=day, status=status, total=delta))
+
+
+def record_new_appointments(db: Session, rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    Suma al rollup turnos insertados con Core (p. ej. importación masiva),
+    que no pasan por los eventos del ORM.
+    """
+    deltas: Dict[Key, int] = defaultdict(int)
+    for row in rows:
+        key = _key(row.get("appointment_date"), row.get("status"))
+        if key:
+            deltas[key] += 1
+    if deltas:
+        _apply_deltas(db.connection(), deltas)
+
+
+def rebuild_rollup(db: Session) -> int:
+    """Recalcula el rollup completo desde appointments; devuelve las filas."""
+    day = func.date(models.Appointment.appointment_date)
+    status = func.coalesce(models.Appointment.status, DEFAULT_STATUS)
+    rows = db.execute(
+        select(day, status, func.count(models.Appointment.id)).group_by(day, status)
+    ).all()
+    db.execute(delete(Rollup))
+    if rows:
+        db.execute(
+            Rollup.__table__.insert(),
+            [{"day": _to_date(d), "status": s, "total": n} for d, s, n in rows],
+        )
+    return len(rows)
+
+
+def backfill_rollup_if_empty(db: Session) -> bool:
+    """
+    Para bases creadas antes del rollup (create_all agrega la tabla vacía):
+    si hay turnos pero el rollup no tiene filas, lo recalcula.
+    """
+    has_rollup = db.execute(select(Rollup.day).limit(1)).first() is not None
+    if has_rollup:
+        return False
+    has_appointments = (
+        db.execute(select(models.Appointment.id).limit(1)).first() is not None
+    )
+    if not has_appointments:
+        return False
+    rebuild_rollup(db)
+    db.commit()
+    return True
+
+
+def _key(appointment_date: Any, status: Any) -> Key | None:
+    if appointment_date is None:
+        return None
+    return _to_date(appointment_date), status or DEFAULT_STATUS
+
+
+@event.listens_for(Session, "before_flush")
+def _track_appointment_changes(session, _flush_context, _instances):
+    """
+    Traduce los turnos nuevos, borrados o con cambios de fecha/estado en
+    deltas (+1/-1) del rollup, dentro de la misma transacción del flush.
+    """
+    deltas: Dict[Key, int] = defaultdict(int)
+    for obj in session.new:
+        if isinstance(obj, models.Appointment):
+            key = _key(obj.appointment_date, obj.status)
+            if key:
+                deltas[key] += 1
+
+    changed = [
+        obj
+        for obj in session.dirty
+        if isinstance(obj, models.Appointment)
+        and (
+            inspect(obj).attrs.appointment_date.history.has_changes()
+            or inspect(obj).attrs.status.history.has_changes()
+        )
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, models.Appointment)]
+    if changed or deleted:
+        conn = session.connection()
+        # Los valores previos se leen de la base: todavía no se hizo el flush
+        # y la historia del atributo no los tiene si el objeto estaba expirado
+        ids = [obj.id for obj in (*changed, *deleted)]
+        old_rows = {
+            row.id: _key(row.appointment_date, row.status)
+            for row in conn.execute(
+                select(
+                    models.Appointment.id,
+                    models.Appointment.appointment_date,
+                    models.Appointment.status,
+                ).where(models.Appointment.id.in_(ids))
+            )
+        }
+        for obj in (*changed, *deleted):
+            old = old_rows.get(obj.id)
+            if old:
+                deltas[old] -= 1
+        for obj in changed:
+            new = _key(obj.appointment_date, obj.status)
+            if new:
+                deltas[new] += 1
+
+    if any(deltas.values()):
+        _apply_deltas(session.connection(), deltas)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rollup diario de asistencia")
+    parser.add_argument("--rebuild", action="store_true", help="recalcular todo")
+    args = parser.parse_args()
+    if args.rebuild:
+        db = SessionLocal()
+        try:
+            n = rebuild_rollup(db)
+            db.commit()
+        finally:
+            db.close()
+        print(f"Rollup recalculado: {n} filas (día × estado)")
+    else:
+        parser.print_help()
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.schemas.appointment import AppointmentCreate
+from app.schemas.owner import OwnerCreate
+from app.schemas.pet import PetCreate
+from app.schemas.vaccination import VaccinationCreate
+from app.services.attendance import APPOINTMENT_STATUSES, record_new_appointments
+from app.services.search import INDEXES, index_missing
+from app.services.stats import stats_service
+
+# Se reportan como máximo estos errores (el resto solo se cuenta)
+MAX_REPORTED_ERRORS = 1000
+
+
+@dataclass
+class ImportSpec:
+    model: Any
+    schema: Type[BaseModel]
+    # Nombre del campo del schema -> columna del modelo, si difieren
+    renames: Dict[str, str] = field(default_factory=dict)
+
+
+SPECS: Dict[str, ImportSpec] = {
+    "owners": ImportSpec(models.Owner, OwnerCreate),
+    "pets": ImportSpec(models.Pet, PetCreate),
+    "appointments": ImportSpec(
+        models.Appointment, AppointmentCreate, {"date": "appointment_date"}
+    ),
+    "vaccinations": ImportSpec(models.Vaccination, VaccinationCreate),
+}
+
+
+@dataclass
+class ImportReport:
+    entity: str
+    inserted: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "entity": self.entity,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+# --- lectura -----------------------------------------------------------------
+
+
+def read_records(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    (número de fila, dict) por cada registro de un CSV con encabezado o de
+    un NDJSON, leyendo de a una línea. Las celdas vacías del CSV son None.
+    Si una línea NDJSON no es JSON válido se entrega el mensaje de error.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for n, row in enumerate(csv.DictReader(text), start=1):
+            yield n, {k: (v if v != "" else None) for k, v in row.items() if k}
+        return
+    n = 0
+    for line in text:
+        if not line.strip():
+            continue
+        n += 1
+        try:
+            yield n, json.loads(line)
+        except ValueError as e:
+            yield n, f"JSON inválido: {e}"
+
+
+def _batches(records: Iterable, size: int) -> Iterator[List]:
+    batch: List = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --- referencias ---------------------------------------------------------------
+
+
+def _resolve_refs(
+    db: Session, entity: str, batch: List[Tuple[int, Any]]
+) -> Dict[int, str]:
+    """
+    Completa owner_id/pet_id a partir de referencias naturales, con una
+    consulta por lote: owner_email para mascotas, y pet_name + owner_email
+    para turnos y vacunas. El email no es único: si una referencia coincide
+    con más de un registro no se elige ninguno y la fila se devuelve como
+    error ({fila: mensaje}).
+    """
+    rows = [(n, r) for n, r in batch if isinstance(r, dict)]
+    ambiguous: Dict[int, str] = {}
+    if entity == "pets":
+        emails = {
+            r["owner_email"]
+            for _, r in rows
+            if not r.get("owner_id") and r.get("owner_email")
+        }
+        if emails:
+            owners: Dict[str, List[int]] = {}
+            for email, owner_id in db.execute(
+                select(models.Owner.email, models.Owner.id).where(
+                    models.Owner.email.in_(emails)
+                )
+            ):
+                owners.setdefault(email, []).append(owner_id)
+            for n, r in rows:
+                matches = owners.get(r.get("owner_email"))
+                if r.get("owner_id") or not matches:
+                    continue
+                if len(matches) > 1:
+                    ambiguous[n] = (
+                        f"owner_email: referencia ambigua ({len(matches)} dueños "
+                        f"con {r['owner_email']})"
+                    )
+                else:
+                    r["owner_id"] = matches[0]
+    elif entity in ("appointments", "vaccinations"):
+        wanted = {
+            (r["owner_email"], r["pet_name"])
+            for _, r in rows
+            if not r.get("pet_id") and r.get("owner_email") and r.get("pet_name")
+        }
+        if wanted:
+            found = db.execute(
+                select(models.Owner.email, models.Pet.name, models.Pet.id)
+                .join(models.Pet.owner)
+                .where(models.Owner.email.in_({e for e, _ in wanted}))
+            ).all()
+            pets: Dict[Tuple[str, str], List[int]] = {}
+            for email, name, pet_id in found:
+                pets.setdefault((email, name), []).append(pet_id)
+            for n, r in rows:
+                key = (r.get("owner_email"), r.get("pet_name"))
+                matches = pets.get(key)
+                if r.get("pet_id") or not matches:
+                    continue
+                if len(matches) > 1:
+                    ambiguous[n] = (
+                        f"pet_name/owner_email: referencia ambigua ({len(matches)} "
+                        f"mascotas '{key[1]}' de {key[0]})"
+                    )
+                else:
+                    r["pet_id"] = matches[0]
+    return ambiguous
+
+
+def _existing_ids(db: Session, model: Any, ids: set) -> set:
+    if not ids:
+        return set()
+    return set(db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+
+
+# --- importación ---------------------------------------------------------------
+
+
+def _validate(
+    db: Session,
+    entity: str,
+    spec: ImportSpec,
+    batch: List[Tuple[int, Any]],
+    report: ImportReport,
+) -> List[Tuple[int, Dict[str, Any]]]:
+    ambiguous = _resolve_refs(db, entity, batch)
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    for n, record in batch:
+        if not isinstance(record, dict):
+            report.error(n, str(record))
+            continue
+        if n in ambiguous:
+            report.error(n, ambiguous[n])
+            continue
+        try:
+            obj = spec.schema.model_validate(record)
+        except ValidationError as e:
+            report.error(
+                n,
+                "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                    for err in e.errors()
+                ),
+            )
+            continue
+        values = {spec.renames.get(k, k): v for k, v in obj.model_dump().items()}
+        if entity == "appointments":
+            status = record.get("status") or "scheduled"
+            if status not in APPOINTMENT_STATUSES:
+                report.error(n, f"status: valor inválido '{status}'")
+                continue
+            values["status"] = status
+        valid.append((n, values))
+
+    # Las referencias tienen que existir (una consulta por lote)
+    fk, parent = {
+        "pets": ("owner_id", models.Owner),
+        "appointments": ("pet_id", models.Pet),
+        "vaccinations": ("pet_id", models.Pet),
+    }.get(entity, (None, None))
+    if fk:
+        existing = _existing_ids(db, parent, {v[fk] for _, v in valid})
+        checked = []
+        for n, values in valid:
+            if values[fk] in existing:
+                checked.append((n, values))
+            else:
+                report.error(n, f"{fk}: no existe {values[fk]}")
+        valid = checked
+    return valid
+
+
+def _insert(
+    db: Session,
+    spec: ImportSpec,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    report: ImportReport,
+) -> List[Dict[str, Any]]:
+    """
+    INSERT multi-fila del lote completo; si la base rechaza el lote se
+    reintenta fila por fila (con savepoint) para reportar solo las que fallan.
+    """
+    mappings = [values for _, values in rows]
+    try:
+        with db.begin_nested():
+            db.execute(insert(spec.model), mappings)
+        return mappings
+    except SQLAlchemyError:
+        pass
+    inserted = []
+    for n, values in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(spec.model), [values])
+            inserted.append(values)
+        except SQLAlchemyError as e:
+            report.error(n, f"base de datos: {getattr(e, 'orig', None) or e}")
+    return inserted
+
+
+def import_records(
+    db: Session,
+    entity: str,
+    records: Iterable[Tuple[int, Any]],
+    batch_size: int = 1000,
+) -> ImportReport:
+    """
+    Valida con los schemas de app/schemas, resuelve referencias e inserta
+    en lotes de `batch_size` filas (un commit por lote). Las filas inválidas
+    se reportan sin abortar el resto del lote.
+    """
+    spec = SPECS[entity]
+    report = ImportReport(entity=entity)
+    for batch in _batches(records, batch_size):
+        valid = _validate(db, entity, spec, batch, report)
+        if not valid:
+            continue
+        inserted = _insert(db, spec, valid, report)
+        if entity == "appointments":
+            # INSERT de Core: el rollup de asistencia se actualiza a mano
+            record_new_appointments(db, inserted)
+        elif entity in INDEXES:
+            # Ídem el índice de búsqueda de dueños y mascotas
+            index_missing(db.connection(), [entity])
+        db.commit()
+        report.inserted += len(inserted)
+    if report.inserted:
+        stats_service.invalidate()
+    return report
+
+
+def import_stream(
+    db: Session, entity: str, stream: IO[bytes], fmt: str, batch_size: int = 1000
+) -> ImportReport:
+    return import_records(db, entity, read_records(stream, fmt), batch_size)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.core.config import settings
+    from app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Importación masiva desde CSV/NDJSON")
+    parser.add_argument("entity", choices=sorted(SPECS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as f:
+            result = import_stream(db, args.entity, f, fmt, args.batch_size)
+    finally:
+        db.close()
+    print(json.dumps(result.as_dict(), ensure_ascii=False, indent=2))
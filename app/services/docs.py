@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import html
+import os
+import re
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DOCS_DIR = ROOT_DIR / "docs"
+
+# Se incrementa al cambiar markdown_to_html: invalida el cache en disco
+RENDERER_VERSION = 1
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_CODE = re.compile(r"`([^`]+)`")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_HEADING = re.compile(r"^(#{1,4}) (.*)$")
+_LIST_ITEM = re.compile(r"^\s*[-*+] (.*)$")
+_TABLE_SEPARATOR = re.compile(r"^\|?[\s:|-]+\|?$")
+# Nombres de documento válidos (sin separadores ni "..")
+_DOC_NAME = re.compile(r"[\w-]+")
+
+
+def _inline(text: str) -> str:
+    """Escapa el texto y aplica negrita, código y enlaces."""
+    out = html.escape(text)
+    out = _CODE.sub(r"<code>\1</code>", out)
+    out = _BOLD.sub(r"<strong>\1</strong>", out)
+    return _LINK.sub(r'<a href="\2">\1</a>', out)
+
+
+def _cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def markdown_to_html(text: str) -> str:
+    """
+    Conversión de un solo paso, línea por línea, del subconjunto de markdown
+    que usan los documentos de docs/: títulos (h1-h4), listas, tablas,
+    bloques de código, separadores y párrafos con negrita/código/enlaces.
+    """
+    lines = text.splitlines()
+    out: List[str] = []
+    in_list = in_table = in_code = False
+
+    def close_blocks() -> None:
+        nonlocal in_list, in_table
+        if in_list:
+            out.append("</ul>")
+            in_list = False
+        if in_table:
+            out.append("</tbody></table>")
+            in_table = False
+
+    for i, line in enumerate(lines):
+        if line.startswith("```"):
+            if in_code:
+                out.append("</code></pre>")
+            else:
+                close_blocks()
+                out.append("<pre><code>")
+            in_code = not in_code
+            continue
+        if in_code:
+            out.append(html.escape(line, quote=False))
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            close_blocks()
+            continue
+
+        heading = _HEADING.match(line)
+        item = _LIST_ITEM.match(line)
+        if heading:
+            close_blocks()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif item:
+            if in_table:
+                close_blocks()
+            if not in_list:
+                out.append("<ul>")
+                in_list = True
+            out.append(f"<li>{_inline(item.group(1).strip())}</li>")
+        elif stripped.startswith("|"):
+            if in_list:
+                close_blocks()
+            if _TABLE_SEPARATOR.match(stripped):
+                continue
+            next_line = lines[i + 1].strip() if i + 1 < len(lines) else ""
+            if not in_table:
+                out.append("<table>")
+                in_table = True
+                if _TABLE_SEPARATOR.match(next_line) and "-" in next_line:
+                    head = "".join(f"<th>{_inline(c)}</th>" for c in _cells(stripped))
+                    out.append(f"<thead><tr>{head}</tr></thead><tbody>")
+                    continue
+                out.append("<tbody>")
+            row = "".join(f"<td>{_inline(c)}</td>" for c in _cells(stripped))
+            out.append(f"<tr>{row}</tr>")
+        elif stripped in ("---", "***", "___"):
+            close_blocks()
+            out.append("<hr>")
+        else:
+            close_blocks()
+            out.append(f"<p>{_inline(stripped)}</p>")
+
+    if in_code:
+        out.append("</code></pre>")
+    close_blocks()
+    return "\n".join(out)
+
+
+Version = Tuple[int, int]
+
+
+class DocsService:
+    """
+    Documentos markdown de docs/ convertidos a HTML una sola vez por versión
+    del archivo (mtime + tamaño). El HTML queda en memoria y en disco
+    (settings.docs_cache_dir), de modo que los demás workers y los reinicios
+    lo leen en lugar de volver a convertir.
+    """
+
+    def __init__(self, docs_dir: Path, cache_dir: Optional[str]) -> None:
+        self.docs_dir = docs_dir
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: Dict[str, Tuple[Version, str]] = {}
+        self._lock = threading.Lock()
+        self.conversions = 0
+
+    def names(self) -> List[str]:
+        return sorted(p.stem for p in self.docs_dir.glob("*.md"))
+
+    def path(self, name: str) -> Path:
+        """
+        Ruta de docs/<name>.md; KeyError si el nombre no es válido. Se arma
+        directamente (sin listar docs/) porque se consulta en cada request.
+        """
+        if not _DOC_NAME.fullmatch(name):
+            raise KeyError(name)
+        return self.docs_dir / f"{name}.md"
+
+    def version(self, name: str) -> Optional[Version]:
+        try:
+            st = self.path(name).stat()
+        except (KeyError, OSError):
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _disk_path(self, name: str, version: Version) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        mtime_ns, size = version
+        return self.cache_dir / f"{name}.{mtime_ns}.{size}.v{RENDERER_VERSION}.html"
+
+    def html(self, name: str) -> str:
+        """HTML del documento (KeyError si no existe)."""
+        version = self.version(name)
+        if version is None:
+            raise KeyError(name)
+        cached = self._memory.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with self._lock:
+            cached = self._memory.get(name)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            body = self._load_or_convert(name, version)
+            self._memory[name] = (version, body)
+            return body
+
+    def _load_or_convert(self, name: str, version: Version) -> str:
+        disk = self._disk_path(name, version)
+        if disk is not None and disk.exists():
+            return disk.read_text(encoding="utf-8")
+        body = markdown_to_html(self.path(name).read_text(encoding="utf-8"))
+        self.conversions += 1
+        if disk is not None:
+            self._store(disk, name, body)
+        return body
+
+    def _store(self, disk: Path, name: str, body: str) -> None:
+        # Escritura atómica (otro worker puede estar leyendo) y limpieza de
+        # versiones anteriores del mismo documento
+        disk.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=disk.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, disk)
+        for old in disk.parent.glob(f"{name}.*.html"):
+            if old != disk:
+                old.unlink(missing_ok=True)
+
+
+docs_service = DocsService(DOCS_DIR, settings.docs_cache_dir)
@@ -0,0 +1,433 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, column, event, func, inspect, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.db import models
+
+# Índice de texto completo de dueños, mascotas y récords clínicos: una tabla
+# FTS5 por entidad en SQLite, o una tabla con tsvector + GIN en Postgres,
+# con la misma clave que la fila original (rowid / id). El texto se guarda
+# normalizado (minúsculas, sin acentos) y cada palabra buscada es un prefijo.
+# En otros motores, o si la base no tiene las tablas, las búsquedas vuelven a
+# los filtros ILIKE '%palabra%' sobre las columnas originales.
+
+SUPPORTED_DIALECTS = ("sqlite", "postgresql")
+# Postgres admite cuatro pesos (A > B > C > D) por lexema
+_PG_WEIGHTS = "ABCD"
+_TOKEN = re.compile(r"[^\W_]+")
+_NOT_DIGIT = re.compile(r"\D")
+# Valores por IN (...) al reindexar o borrar documentos
+_IN_CHUNK = 500
+
+
+def normalize(value: Optional[str]) -> str:
+    """Minúsculas y sin acentos (mismo criterio que _strip_accents en app.ml.intent)."""
+    if not value:
+        return ""
+    nfkd = unicodedata.normalize("NFKD", value.lower())
+    return "".join(c for c in nfkd if not unicodedata.combining(c))
+
+
+def tokens(value: Optional[str]) -> List[str]:
+    return _TOKEN.findall(normalize(value))
+
+
+def _join(*parts: Optional[str]) -> str:
+    return " ".join(normalize(p) for p in parts if p)
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """
+    Tabla de búsqueda de una entidad. `columns` va de la más relevante a la
+    menos (peso de bm25 en SQLite, A-D en Postgres); `source` lee de las
+    tablas originales el id y los campos que `document` convierte en el
+    texto de cada columna. `like` arma, por columna, el filtro ILIKE que se
+    usa cuando el índice no está disponible.
+    """
+
+    table: str
+    model: Any
+    columns: Tuple[str, ...]
+    weights: Tuple[float, ...]
+    source: Callable[[], Select]
+    document: Callable[[Any], Tuple[str, ...]]
+    like: Dict[str, Callable[[str], Any]]
+
+
+INDEXES: Dict[str, SearchIndex] = {
+    "owners": SearchIndex(
+        "owners_fts",
+        models.Owner,
+        ("name", "contact"),
+        (10.0, 2.0),
+        lambda: select(
+            models.Owner.id, models.Owner.name, models.Owner.phone, models.Owner.email
+        ),
+        # El teléfono también va solo con dígitos: "11 4555" encuentra "114555..."
+        lambda row: (
+            _join(row.name),
+            _join(row.phone, _NOT_DIGIT.sub("", row.phone or ""), row.email),
+        ),
+        {
+            "name": lambda p: models.Owner.name.ilike(p),
+            "contact": lambda p: or_(models.Owner.phone.ilike(p), models.Owner.email.ilike(p)),
+        },
+    ),
+    "pets": SearchIndex(
+        "pets_fts",
+        models.Pet,
+        ("name", "species", "owner"),
+        (10.0, 3.0, 2.0),
+        lambda: select(
+            models.Pet.id,
+            models.Pet.name,
+            models.Pet.species,
+            models.Pet.breed,
+            models.Owner.name.label("owner_name"),
+        ).join(models.Owner, models.Pet.owner_id == models.Owner.id),
+        lambda row: (_join(row.name), _join(row.species, row.breed), _join(row.owner_name)),
+        {
+            "name": lambda p: models.Pet.name.ilike(p),
+            "species": lambda p: or_(models.Pet.species.ilike(p), models.Pet.breed.ilike(p)),
+            "owner": lambda p: models.Pet.owner.has(models.Owner.name.ilike(p)),
+        },
+    ),
+    "records": SearchIndex(
+        "records_fts",
+        models.ClinicalRecord,
+        ("diagnosis", "symptoms", "medications", "pet"),
+        (10.0, 5.0, 5.0, 2.0),
+        lambda: select(
+            models.ClinicalRecord.id,
+            models.ClinicalRecord.diagnosis,
+            models.ClinicalRecord.symptoms,
+            models.ClinicalRecord.medications,
+            models.Pet.name.label("pet_name"),
+        ).join(models.Pet, models.ClinicalRecord.pet_id == models.Pet.id),
+        lambda row: (
+            _join(row.diagnosis),
+            _join(row.symptoms),
+            _join(row.medications),
+            _join(row.pet_name),
+        ),
+        {
+            "diagnosis": lambda p: models.ClinicalRecord.diagnosis.ilike(p),
+            "symptoms": lambda p: models.ClinicalRecord.symptoms.ilike(p),
+            "medications": lambda p: models.ClinicalRecord.medications.ilike(p),
+            "pet": lambda p: models.ClinicalRecord.pet.has(models.Pet.name.ilike(p)),
+        },
+    ),
+}
+_KIND_BY_MODEL = {index.model: kind for kind, index in INDEXES.items()}
+
+
+# Tablas que FTS5 crea junto a cada tabla virtual
+_FTS5_SHADOW_SUFFIXES = ("data", "idx", "content", "docsize", "config")
+
+
+def search_table_names() -> Set[str]:
+    """Tablas del índice y sus tablas sombra: no están en la metadata del ORM."""
+    names = set()
+    for index in INDEXES.values():
+        names.add(index.table)
+        names.update(f"{index.table}_{suffix}" for suffix in _FTS5_SHADOW_SUFFIXES)
+    return names
+
+
+def _key(dialect: str) -> str:
+    return "rowid" if dialect == "sqlite" else "id"
+
+
+def _fts_table(index: SearchIndex, dialect: str):
+    return table(index.table, column(_key(dialect)), *(column(c) for c in index.columns))
+
+
+def search_supported(dialect: str) -> bool:
+    return dialect in SUPPORTED_DIALECTS
+
+
+def _check_dialect(dialect: str) -> None:
+    if not search_supported(dialect):
+        raise NotImplementedError(f"Índice de búsqueda no disponible para {dialect}")
+
+
+def index_ddl(index: SearchIndex, dialect: str) -> List[str]:
+    """Sentencias que crean la tabla de búsqueda (también las usa Alembic)."""
+    _check_dialect(dialect)
+    if dialect == "sqlite":
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.table} "
+            f"USING fts5({', '.join(index.columns)}, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        ]
+    columns = ", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in index.columns)
+    vector = " || ".join(
+        f"setweight(to_tsvector('simple', {c}), '{w}')"
+        for c, w in zip(index.columns, _PG_WEIGHTS)
+    )
+    return [
+        f"CREATE TABLE IF NOT EXISTS {index.table} (id INTEGER PRIMARY KEY, {columns}, "
+        f"document tsvector GENERATED ALWAYS AS ({vector}) STORED)",
+        f"CREATE INDEX IF NOT EXISTS ix_{index.table}_document "
+        f"ON {index.table} USING GIN (document)",
+    ]
+
+
+# Engines con las tablas del índice ya verificadas (los hooks no escriben en
+# bases que no las tienen, p.ej. una base temporal creada solo con create_all)
+_READY: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def _ready(conn: Connection) -> bool:
+    if conn.engine in _READY:
+        return True
+    if not search_supported(conn.dialect.name):
+        return False
+    names = set(inspect(conn).get_table_names())
+    if all(index.table in names for index in INDEXES.values()):
+        _READY.add(conn.engine)
+        return True
+    return False
+
+
+# --- escritura ---------------------------------------------------------------
+
+
+def _chunks(ids: Iterable[int]) -> Iterable[List[int]]:
+    ids = list(ids)
+    for start in range(0, len(ids), _IN_CHUNK):
+        yield ids[start : start + _IN_CHUNK]
+
+
+def _delete(conn: Connection, index: SearchIndex, ids: Iterable[int]) -> None:
+    fts = _fts_table(index, conn.dialect.name)
+    key = fts.c[_key(conn.dialect.name)]
+    for chunk in _chunks(ids):
+        conn.execute(fts.delete().where(key.in_(chunk)))
+
+
+def _index_rows(conn: Connection, index: SearchIndex, stmt: Select, batch_size: int = 1000) -> int:
+    """Reemplaza los documentos de las filas que devuelve `stmt` (por lotes)."""
+    dialect = conn.dialect.name
+    fts = _fts_table(index, dialect)
+    key = _key(dialect)
+    n = 0
+    result = conn.execute(stmt.execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        _delete(conn, index, (row.id for row in rows))
+        conn.execute(
+            fts.insert(),
+            [{key: row.id, **dict(zip(index.columns, index.document(row)))} for row in rows],
+        )
+        n += len(rows)
+    return n
+
+
+def reindex(conn: Connection, kind: str, condition=None) -> int:
+    """Vuelve a indexar las filas de `kind` que cumplen `condition` (todas si es None)."""
+    index = INDEXES[kind]
+    stmt = index.source()
+    if condition is not None:
+        stmt = stmt.where(condition)
+    return _index_rows(conn, index, stmt)
+
+
+def index_missing(conn: Connection, kinds: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Indexa las filas que todavía no tienen documento. Para los INSERT de Core
+    (importación masiva, seeders), que no pasan por los eventos del ORM.
+    """
+    if not _ready(conn):
+        return {}
+    key = column(_key(conn.dialect.name))
+    added = {}
+    for kind in kinds or INDEXES:
+        index = INDEXES[kind]
+        indexed = select(key).select_from(table(index.table))
+        added[kind] = _index_rows(
+            conn, index, index.source().where(index.model.id.not_in(indexed))
+        )
+    return added
+
+
+def rebuild_search_index(conn: Connection) -> Dict[str, int]:
+    """Vacía y recalcula el índice completo; devuelve los documentos por entidad."""
+    _check_dialect(conn.dialect.name)
+    counts = {}
+    for kind, index in INDEXES.items():
+        conn.execute(table(index.table).delete())
+        counts[kind] = reindex(conn, kind)
+    return counts
+
+
+def ensure_search_index(engine: Engine) -> Dict[str, int]:
+    """
+    Crea las tablas del índice si faltan y, para bases creadas antes del
+    índice, indexa las entidades cuya tabla de búsqueda está vacía. En
+    motores sin soporte no hace nada (las búsquedas usan ILIKE).
+    """
+    dialect = engine.dialect.name
+    if not search_supported(dialect):
+        return {}
+    added: Dict[str, int] = {}
+    with engine.begin() as conn:
+        for index in INDEXES.values():
+            for statement in index_ddl(index, dialect):
+                conn.execute(text(statement))
+        for kind, index in INDEXES.items():
+            first = select(column(_key(dialect))).select_from(table(index.table)).limit(1)
+            if conn.execute(first).first() is None:
+                added[kind] = reindex(conn, kind)
+    _READY.add(engine)
+    return added
+
+
+def drop_search_index(engine: Engine) -> None:
+    with engine.begin() as conn:
+        for index in INDEXES.values():
+            conn.execute(text(f"DROP TABLE IF EXISTS {index.table}"))
+    _READY.discard(engine)
+
+
+# --- consulta ----------------------------------------------------------------
+
+
+def _fts5_query(terms: Dict[Optional[str], List[str]]) -> str:
+    # Cada palabra entre comillas (sin operadores de FTS5) y como prefijo
+    parts = []
+    for col, words in terms.items():
+        phrase = " ".join('"%s"*' % t for t in words)
+        parts.append(f"{col} : ({phrase})" if col else f"({phrase})")
+    return " AND ".join(parts)
+
+
+def _tsquery(index: SearchIndex, terms: Dict[Optional[str], List[str]]) -> str:
+    weight = dict(zip(index.columns, _PG_WEIGHTS))
+    return " & ".join(
+        f"{t}:*{weight[col]}" if col else f"{t}:*" for col, words in terms.items() for t in words
+    )
+
+
+def _apply_like(stmt: Select, index: SearchIndex, filters: Dict[Optional[str], str]) -> Select:
+    """
+    Búsqueda sin índice: cada palabra tiene que aparecer (ILIKE '%palabra%')
+    en la columna pedida, o en cualquiera si la columna es None. Sin
+    normalizar acentos ni ordenar por relevancia.
+    """
+    conditions = []
+    for col, value in filters.items():
+        likes = [index.like[col]] if col else list(index.like.values())
+        for word in _TOKEN.findall(value):
+            pattern = f"%{word}%"
+            conditions.append(or_(*(like(pattern) for like in likes)))
+    return stmt.where(and_(*conditions))
+
+
+def apply_search(
+    db: Session, stmt: Select, kind: str, filters: Dict[Optional[str], Optional[str]]
+) -> Select:
+    """
+    Restringe `stmt` (un select de la entidad) a las filas cuyo documento
+    coincide con todos los filtros {columna del índice (None: cualquiera):
+    texto} y lo ordena por relevancia. Cada palabra cuenta como prefijo y sin acentos: "gonz"
+    encuentra "González". Sin filtros con palabras devuelve `stmt` tal cual.
+    Si el índice no está disponible (motor sin soporte o base sin las
+    tablas) filtra con ILIKE sobre las columnas originales.
+    """
+    index = INDEXES[kind]
+    filters = {col: value for col, value in filters.items() if tokens(value)}
+    if not filters:
+        return stmt
+    conn = db.connection()
+    if not _ready(conn):
+        return _apply_like(stmt, index, filters)
+    terms = {col: tokens(value) for col, value in filters.items()}
+    if conn.dialect.name == "sqlite":
+        fts = table(index.table, column("rowid"))
+        name = literal_column(index.table)
+        return (
+            stmt.join(fts, fts.c.rowid == index.model.id)
+            .where(name.op("MATCH")(_fts5_query(terms)))
+            .order_by(func.bm25(name, *index.weights))
+        )
+    fts = table(index.table, column("id"), column("document"))
+    query = func.to_tsquery("simple", _tsquery(index, terms))
+    return (
+        stmt.join(fts, fts.c.id == index.model.id)
+        .where(fts.c.document.op("@@")(query))
+        .order_by(func.ts_rank(fts.c.document, query).desc())
+    )
+
+
+# --- sincronización con el ORM -----------------------------------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session, _flush_context):
+    """
+    Reindexa dueños, mascotas y récords creados, modificados o borrados en
+    el flush, dentro de la misma transacción. Renombrar un dueño reindexa sus
+    mascotas y renombrar una mascota, sus récords (el nombre va en el documento).
+    """
+    changed: Dict[str, Set[int]] = {kind: set() for kind in INDEXES}
+    deleted: Dict[str, Set[int]] = {kind: set() for kind in INDEXES}
+    renamed: Dict[str, Set[int]] = {"owners": set(), "pets": set()}
+    for obj in session.new:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind:
+            changed[kind].add(obj.id)
+    for obj in session.dirty:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind and session.is_modified(obj, include_collections=False):
+            changed[kind].add(obj.id)
+            if kind in renamed and inspect(obj).attrs.name.history.has_changes():
+                renamed[kind].add(obj.id)
+    for obj in session.deleted:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind:
+            deleted[kind].add(obj.id)
+    if not any(changed.values()) and not any(deleted.values()):
+        return
+
+    conn = session.connection()
+    if not _ready(conn):
+        return
+    cascades = (
+        ("pets", models.Pet.owner_id, renamed["owners"]),
+        ("records", models.ClinicalRecord.pet_id, renamed["pets"]),
+    )
+    for kind, ids in changed.items():
+        for chunk in _chunks(ids):
+            reindex(conn, kind, INDEXES[kind].model.id.in_(chunk))
+    for kind, fk, ids in cascades:
+        for chunk in _chunks(ids):
+            reindex(conn, kind, fk.in_(chunk))
+    for kind, ids in deleted.items():
+        _delete(conn, INDEXES[kind], ids)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(description="Índice de búsqueda de texto completo")
+    parser.add_argument("--rebuild", action="store_true", help="recalcular todo")
+    args = parser.parse_args()
+    if args.rebuild:
+        ensure_search_index(engine)
+        with engine.begin() as conn:
+            counts = rebuild_search_index(conn)
+        print("Índice recalculado: " + ", ".join(f"{k} {n}" for k, n in counts.items()))
+    else:
+        parser.print_help()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, func, literal, select, true
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+
+# Tablas cuyo conteo se muestra en el panel de administración
+COUNTED_MODELS = {
+    "owners": models.Owner,
+    "pets": models.Pet,
+    "vaccinations": models.Vaccination,
+    "records": models.ClinicalRecord,
+}
+APPOINTMENT_STATUSES = ("scheduled", "attended", "canceled")
+
+
+def _counts_statement():
+    """
+    Una sola sentencia: GROUP BY status sobre appointments más un subquery
+    escalar por tabla. El LEFT JOIN contra una fila constante garantiza al
+    menos una fila aunque no haya turnos.
+    """
+    one = select(literal(1).label("one")).subquery()
+    scalars = [
+        select(func.count()).select_from(model).scalar_subquery().label(name)
+        for name, model in COUNTED_MODELS.items()
+    ]
+    return (
+        select(
+            models.Appointment.status,
+            func.count(models.Appointment.id),
+            *scalars,
+        )
+        .select_from(one)
+        .outerjoin(models.Appointment, true())
+        .group_by(models.Appointment.status)
+    )
+
+
+def compute_counts(db: Session) -> Dict[str, Any]:
+    """Totales por entidad y desglose de turnos por estado (un round trip)."""
+    rows = db.execute(_counts_statement()).all()
+    by_status = {s: 0 for s in APPOINTMENT_STATUSES}
+    counts: Dict[str, Any] = {name: 0 for name in COUNTED_MODELS}
+    total = 0
+    for status, n, *scalars in rows:
+        counts.update(zip(COUNTED_MODELS, scalars))
+        total += n
+        if status is not None:
+            by_status[status] = by_status.get(status, 0) + n
+    counts["appointments"] = total
+    counts["appointments_by_status"] = by_status
+    return counts
+
+
+class StatsService:
+    """
+    Conteos del panel de administración con cache de TTL corto.
+
+    Las pantallas de recepción consultan el panel cada pocos segundos: con el
+    cache, la base recibe como máximo una consulta por TTL. Cualquier commit
+    que toque las tablas contadas invalida el cache (ver _track_writes).
+    """
+
+    def __init__(self, ttl_s: float) -> None:
+        self.ttl_s = ttl_s
+        self._cached: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        cached = self._cached
+        if cached is not None and time.monotonic() - cached[0] <= self.ttl_s:
+            self.hits += 1
+            return cached[1]
+
+        generation = self._generation
+        counts = compute_counts(db)
+        with self._lock:
+            self.misses += 1
+            # Si hubo una escritura mientras contábamos, no se cachea
+            if generation == self._generation:
+                self._cached = (time.monotonic(), counts)
+        return counts
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cached = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ttl_s": self.ttl_s, "hits": self.hits, "misses": self.misses}
+
+
+stats_service = StatsService(ttl_s=settings.stats_cache_ttl_s)
+
+_TRACKED = tuple(COUNTED_MODELS.values()) + (models.Appointment,)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_writes(session, _flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _TRACKED):
+            session.info["stats_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("stats_dirty", False):
+        stats_service.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("stats_dirty", None)
@@ -0,0 +1,423 @@
+"""
+Benchmark de los caminos calientes: API JSON, vistas HTML y endpoints de ML.
+
+Siembra una base a la escala pedida (app.db.seed.seed_scale), levanta un
+stub local de Open-Meteo y mide latencia p50/p95/p99 y throughput por
+escenario. El resultado va a un JSON para comparar corridas:
+
+    python -m benchmarks.run --owners 10000 --requests 300
+    python -m benchmarks.run --reuse-db --compare .bench/baseline.json --max-regression 20
+
+Por defecto la app corre en el mismo proceso (TestClient, sin red). Con
+--base-url se mide un servidor ya levantado, que debe usar la misma base
+(DB_URL) y WEATHER_API_BASE apuntando al stub que se imprime al arrancar.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_DB = ".bench/bench.db"
+DEFAULT_OUT = ".bench/results.json"
+
+
+# --- stub de Open-Meteo -------------------------------------------------------
+
+
+def open_meteo_payload(start: date, days: int) -> Dict[str, Any]:
+    """Respuesta 'daily' con valores fijos y plausibles para Buenos Aires."""
+    dates = [start + timedelta(days=i) for i in range(days)]
+    return {
+        "daily": {
+            "time": [d.isoformat() for d in dates],
+            "temperature_2m_max": [24.0 + i % 5 for i in range(days)],
+            "temperature_2m_min": [14.0 + i % 3 for i in range(days)],
+            "precipitation_probability_max": [(i * 17) % 90 for i in range(days)],
+            "precipitation_sum": [float(i % 4) for i in range(days)],
+            "windspeed_10m_max": [12.0 + i % 6 for i in range(days)],
+            "relative_humidity_2m_mean": [60.0 + i % 10 for i in range(days)],
+        }
+    }
+
+
+class _WeatherHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 (nombre de http.server)
+        query = parse_qs(urlparse(self.path).query)
+        days = int(query.get("forecast_days", ["16"])[0])
+        body = json.dumps(open_meteo_payload(date.today(), days)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class WeatherStub:
+    """Servidor HTTP local con la forma de la API de Open-Meteo."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = ThreadingHTTPServer((host, port), _WeatherHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/forecast"
+
+    def __enter__(self) -> "WeatherStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# --- escenarios ----------------------------------------------------------------
+
+
+@dataclass
+class BenchContext:
+    """Rangos de la base sembrada de los que salen los parámetros."""
+
+    today: date
+    owner_ids: Tuple[int, int]
+
+
+# Método, ruta y kwargs del request (params/json)
+Request = Tuple[str, str, Dict[str, Any]]
+
+_PET_NAMES = ["Luna", "Max", "Bella", "Toby", "Milo", "Kira"]
+_INTENT_TEXTS = [
+    "Quiero sacar un turno para vacunar a mi perro",
+    "Mi gata no come desde ayer y está decaída",
+    "¿Cuánto cuesta la castración?",
+    "Necesito cancelar el turno del viernes",
+    "Mi perro tiene tos hace tres días",
+]
+
+
+def _day(ctx: BenchContext, rng: random.Random, lo: int, hi: int) -> str:
+    return (ctx.today + timedelta(days=rng.randint(lo, hi))).isoformat()
+
+
+def _schedule_day(rng: random.Random, ctx: BenchContext) -> Request:
+    return "GET", "/schedule/day", {"params": {"day": _day(ctx, rng, -30, 30)}}
+
+
+def _appointments_search(rng: random.Random, ctx: BenchContext) -> Request:
+    start = ctx.today + timedelta(days=rng.randint(-60, 30))
+    params = {"from": start.isoformat(), "to": (start + timedelta(days=7)).isoformat()}
+    if rng.random() < 0.5:
+        params["status"] = rng.choice(["scheduled", "attended", "canceled"])
+    return "GET", "/appointments/search", {"params": params}
+
+
+def _pets_search_view(rng: random.Random, ctx: BenchContext) -> Request:
+    params = {"name": rng.choice(_PET_NAMES)}
+    if rng.random() < 0.5:
+        params["species"] = rng.choice(["perro", "gato"])
+    return "GET", "/pets/search/view", {"params": params}
+
+
+def _owner_view(rng: random.Random, ctx: BenchContext) -> Request:
+    return "GET", f"/owners/{rng.randint(*ctx.owner_ids)}/view", {}
+
+
+def _vaccinations_view(rng: random.Random, ctx: BenchContext) -> Request:
+    return "GET", "/vaccinations/view", {"params": {"days": rng.choice([7, 30, 90])}}
+
+
+def _ai_intent(rng: random.Random, ctx: BenchContext) -> Request:
+    return "POST", "/ai/intent", {"json": {"text": rng.choice(_INTENT_TEXTS)}}
+
+
+def _ai_noshow(rng: random.Random, ctx: BenchContext) -> Request:
+    params = {"day": _day(ctx, rng, 0, 6), "hour": rng.choice(range(9, 19))}
+    return "GET", "/ai/noshow", {"params": params}
+
+
+def _ai_predict(rng: random.Random, ctx: BenchContext) -> Request:
+    return "GET", "/ai/predict", {"params": {"day": _day(ctx, rng, 0, 6)}}
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, BenchContext], Request]] = {
+    "schedule_day": _schedule_day,
+    "appointments_search": _appointments_search,
+    "pets_search_view": _pets_search_view,
+    "owner_view": _owner_view,
+    "vaccinations_view": _vaccinations_view,
+    "ai_intent": _ai_intent,
+    "ai_noshow": _ai_noshow,
+    "ai_predict": _ai_predict,
+}
+
+
+# --- medición ------------------------------------------------------------------
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Percentil por rango más cercano (sin interpolar) de una lista ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+def summarize(latencies_ms: List[float], errors: int, wall_s: float) -> Dict[str, Any]:
+    values = sorted(latencies_ms)
+    n = len(values)
+    return {
+        "requests": n,
+        "errors": errors,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "mean_ms": round(sum(values) / n, 3) if n else 0.0,
+        "max_ms": round(values[-1], 3) if n else 0.0,
+        "throughput_rps": round(n / wall_s, 2) if wall_s > 0 else 0.0,
+    }
+
+
+def run_scenario(
+    client: Any,
+    build: Callable[[random.Random, BenchContext], Request],
+    ctx: BenchContext,
+    requests: int,
+    warmup: int = 5,
+    concurrency: int = 1,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Ejecuta `requests` pedidos (más `warmup` que no se miden) con
+    `concurrency` hilos. `client` es un TestClient o un httpx.Client.
+    Los parámetros salen de un generador con semilla: misma secuencia en
+    todas las corridas.
+    """
+    rng = random.Random(seed)
+    planned = [build(rng, ctx) for _ in range(warmup + requests)]
+    for method, path, kwargs in planned[:warmup]:
+        client.request(method, path, **kwargs)
+
+    def one(req: Request) -> Tuple[float, bool]:
+        method, path, kwargs = req
+        t0 = perf_counter()
+        res = client.request(method, path, **kwargs)
+        return (perf_counter() - t0) * 1000.0, res.status_code >= 400
+
+    t0 = perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, planned[warmup:]))
+    else:
+        results = [one(req) for req in planned[warmup:]]
+    wall_s = perf_counter() - t0
+    return summarize(
+        [ms for ms, _ in results], sum(1 for _, failed in results if failed), wall_s
+    )
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], max_regression: Optional[float] = None
+) -> Tuple[List[str], bool]:
+    """Líneas con la variación de p50/p95/throughput y si alguna p95 empeoró de más."""
+    lines = []
+    regressed = False
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            lines.append(f"{name:22s} (sin línea base)")
+            continue
+        deltas = {
+            key: (now[key] - before[key]) / before[key] * 100.0 if before[key] else 0.0
+            for key in ("p50_ms", "p95_ms", "throughput_rps")
+        }
+        flag = ""
+        if max_regression is not None and deltas["p95_ms"] > max_regression:
+            regressed = True
+            flag = "  << REGRESIÓN"
+        lines.append(
+            f"{name:22s} p50 {before['p50_ms']:8.2f} -> {now['p50_ms']:8.2f} ms ({deltas['p50_ms']:+6.1f}%)"
+            f"  p95 {before['p95_ms']:8.2f} -> {now['p95_ms']:8.2f} ms ({deltas['p95_ms']:+6.1f}%)"
+            f"  rps {deltas['throughput_rps']:+6.1f}%{flag}"
+        )
+    return lines, regressed
+
+
+# --- preparación -----------------------------------------------------------------
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _prepare_db(args: argparse.Namespace) -> Tuple[BenchContext, Dict[str, Any]]:
+    """Siembra la base (salvo --reuse-db con datos) y arma el contexto."""
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+
+    from app.db import models
+    from app.db.database import Base, engine
+    from app.db.seed import seed_scale
+    from app.services.stats import compute_counts
+
+    Base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as db:
+        has_data = db.execute(select(models.Owner.id).limit(1)).first() is not None
+    if not (args.reuse_db and has_data):
+        seed_scale(
+            args.owners,
+            pets_per_owner=args.pets_per_owner,
+            appointments_per_pet=args.appointments_per_pet,
+            vaccinations_per_pet=args.vaccinations_per_pet,
+            random_seed=args.seed,
+            anchor=date.today(),
+            bind=engine,
+        )
+    with Session(bind=engine) as db:
+        owners = db.execute(select(func.min(models.Owner.id), func.max(models.Owner.id))).one()
+        counts = compute_counts(db)
+    ctx = BenchContext(today=date.today(), owner_ids=tuple(owners))
+    return ctx, counts
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de latencia y throughput")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Archivo SQLite del benchmark")
+    parser.add_argument("--db-url", default=None, help="URL SQLAlchemy (reemplaza --db)")
+    parser.add_argument("--reuse-db", action="store_true", help="No sembrar si ya hay datos")
+    parser.add_argument("--owners", type=int, default=10000)
+    parser.add_argument("--pets-per-owner", type=int, default=1)
+    parser.add_argument("--appointments-per-pet", type=int, default=3)
+    parser.add_argument("--vaccinations-per-pet", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="Pedidos medidos por escenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--only", action="append", choices=sorted(SCENARIOS), help="Repetible; por defecto todos"
+    )
+    parser.add_argument("--base-url", default=None, help="Servidor ya levantado (si no, en proceso)")
+    parser.add_argument("--stub-port", type=int, default=0, help="Puerto del stub de clima")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--compare", default=None, help="JSON de una corrida anterior")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        help="Con --compare: sale con código 1 si alguna p95 empeora más de este %%",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    db_url = args.db_url
+    if db_url is None:
+        os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+        db_url = f"sqlite:///{args.db}"
+    # La app lee DB_URL al importarse: se fija antes de cualquier import de app.*
+    os.environ["DB_URL"] = db_url
+
+    with WeatherStub(port=args.stub_port) as stub:
+        print(f"Stub de Open-Meteo en {stub.url}")
+        ctx, counts = _prepare_db(args)
+
+        if args.base_url:
+            import httpx
+
+            client = httpx.Client(base_url=args.base_url, timeout=30.0)
+            target = args.base_url
+        else:
+            from fastapi.testclient import TestClient
+
+            from app.external.weather_client import forecast_cache, weather_client
+            from app.main import app
+
+            weather_client.base_url = stub.url
+            # Sin snapshot: no pisar el de desarrollo con datos del stub
+            forecast_cache.snapshot_path = None
+            forecast_cache.clear()
+            # Los 500 cuentan como errores en vez de cortar la corrida
+            client = TestClient(app, raise_server_exceptions=False)
+            target = "in-process"
+
+        names = args.only or list(SCENARIOS)
+        scenarios: Dict[str, Any] = {}
+        with client:
+            for name in names:
+                scenarios[name] = run_scenario(
+                    client,
+                    SCENARIOS[name],
+                    ctx,
+                    args.requests,
+                    warmup=args.warmup,
+                    concurrency=args.concurrency,
+                    seed=args.seed,
+                )
+                s = scenarios[name]
+                print(
+                    f"{name:22s} p50 {s['p50_ms']:8.2f}  p95 {s['p95_ms']:8.2f}  "
+                    f"p99 {s['p99_ms']:8.2f} ms  {s['throughput_rps']:8.1f} req/s  "
+                    f"errores {s['errors']}"
+                )
+
+    results = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": target,
+            "db_url": db_url,
+            "rows": counts,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scenarios": scenarios,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Resultados en {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressed = compare(results, baseline, args.max_regression)
+        print("\n".join(lines))
+        if regressed:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
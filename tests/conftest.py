@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.database import Base, SessionLocal, engine, make_engine
+from app.services.search import ensure_search_index
+from app.services.stats import stats_service
+
+
+class SQLCounter:
+    """Registra las sentencias SQL que se ejecutan sobre el engine de la app (u otro dado)."""
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @contextmanager
+    def count(self, bind: Optional[Engine] = None) -> Iterator[List[str]]:
+        self.statements = []
+        bind = bind or engine
+        event.listen(bind, "before_cursor_execute", self._on_execute)
+        try:
+            yield self.statements
+        finally:
+            event.remove(bind, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture
+def sql_counter() -> SQLCounter:
+    return SQLCounter()
+
+
+@pytest.fixture(scope="module")
+def isolated_db(tmp_path_factory):
+    """
+    Base SQLite temporal para todo el módulo. SessionLocal (y con ella get_db,
+    los seeders y las vistas en streaming) apunta a esta base, así los datos
+    del test no se acumulan en app.db entre corridas.
+    """
+    path = tmp_path_factory.mktemp("db") / "test.db"
+    test_engine = make_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=test_engine)
+    ensure_search_index(test_engine)
+    SessionLocal.configure(bind=test_engine)
+    stats_service.invalidate()
+    try:
+        yield test_engine
+    finally:
+        SessionLocal.configure(bind=engine)
+        stats_service.invalidate()
+        test_engine.dispose()
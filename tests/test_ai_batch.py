@@ -0,0 +1,53 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.ml.intent import train_and_save_default
+from app.ml.sentiment import train_sentiment_model
+
+client = TestClient(app)
+
+
+def setup_module():
+    train_and_save_default()
+    train_sentiment_model()
+
+
+def test_intent_batch_preserves_order():
+    texts = [
+        "Quiero agendar un turno para mañana",
+        "Necesito el refuerzo de la vacuna antirrábica",
+        "Es una emergencia, está sangrando",
+    ]
+    res = client.post("/ai/intent/batch", json={"texts": texts})
+    assert res.status_code == 200
+    items = res.json()["items"]
+    assert [it["label"] for it in items] == ["turnos", "vacunacion", "emergencia"]
+    for it in items:
+        probs = [t["probability"] for t in it["top3"]]
+        assert probs == sorted(probs, reverse=True)
+        assert it["top3"][0]["label"] == it["label"]
+
+
+def test_intent_batch_matches_single():
+    text = "Qué horarios tienen los domingos?"
+    single = client.post("/ai/intent", json={"text": text}).json()
+    batch = client.post("/ai/intent/batch", json={"texts": [text]}).json()
+    assert batch["items"][0]["label"] == single["label"]
+    assert abs(batch["items"][0]["probability"] - single["probability"]) < 1e-9
+
+
+def test_sentiment_and_classify_batch():
+    texts = ["excelente servicio", "pésimo servicio", "otra cosa"]
+    res = client.post("/ai/sentiment/batch", json={"texts": texts})
+    assert res.status_code == 200
+    assert len(res.json()["items"]) == 3
+
+    res = client.post("/ai/classify/batch", json={"texts": texts[:1] + ["turno"]})
+    assert res.status_code == 200
+    assert [it["label"] for it in res.json()["items"]] == ["otros", "turnos"]
+
+
+def test_batch_size_limit(monkeypatch):
+    monkeypatch.setattr(settings, "ai_batch_max_size", 2)
+    res = client.post("/ai/classify/batch", json={"texts": ["a", "b", "c"]})
+    assert res.status_code == 413
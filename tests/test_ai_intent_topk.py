@@ -24,3 +24,20 @@ def test_intent_top3_present_and_sorted():
     assert probs == sorted(probs, reverse=True)
     # La primera etiqueta coincide con la principal
     assert data["top3"][0]["label"] == data["label"]
+
+
+def test_topk_indices_matches_full_sort():
+    import numpy as np
+    from app.ml.intent import _topk_indices
+
+    proba = np.array([[0.1, 0.5, 0.05, 0.3, 0.05], [0.7, 0.1, 0.1, 0.05, 0.05]])
+    assert _topk_indices(proba, 3).tolist() == [[1, 3, 0], [0, 1, 2]]
+    assert _topk_indices(proba[0], 10).tolist() == [1, 3, 0, 2, 4]
+
+
+def test_predict_intent_full_single_pass():
+    from app.ml.intent import predict_intent_full
+
+    label, prob, top = predict_intent_full("Quiero agendar un turno", k=3)
+    assert top[0] == (label, prob)
+    assert len(top) == 3
@@ -18,3 +18,60 @@ def test_noshow_endpoint():
     data = res.json()
     assert data["label"] in ("no-show", "show")
     assert 0.0 <= data["probability"] <= 1.0
+
+
+def test_synth_data_is_vectorized_and_reproducible(monkeypatch):
+    import numpy as np
+    from app.ml import noshow
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("no debe consultar el clima al entrenar")
+
+    monkeypatch.setattr(noshow, "get_weather_features", no_network)
+    end = date(2025, 1, 31)
+    X1, y1 = noshow._synth_data(n_days=30, seed=7, end=end)
+    X2, y2 = noshow._synth_data(n_days=30, seed=7, end=end)
+    assert X1.shape == (30 * len(noshow.HOURS), 4)
+    assert np.array_equal(X1, X2) and np.array_equal(y1, y2)
+    # El rango va del 01/01 al 30/01; el índice 4 es el domingo 05/01
+    assert X1[4 * len(noshow.HOURS), 0] == 1.0
+    assert X1[0, 0] == 0.0
+
+
+def test_synth_data_uses_given_forecast():
+    from app.ml import noshow
+
+    end = date(2025, 1, 31)
+    forecast = [
+        {"date": date(2025, 1, 30), "temp_avg": 31.5, "precipitation_probability": 90}
+    ]
+    X, _ = noshow._synth_data(n_days=30, seed=1, end=end, forecast=forecast)
+    last = X[-1]
+    assert last[2] == 31.5
+    assert abs(last[3] - 0.9) < 1e-9
+
+
+def test_noshow_grid_endpoint():
+    d = date.today().isoformat()
+    res = client.get(f"/ai/noshow/grid?start={d}&days=3&hours=9&hours=18")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["hours"] == [9, 18]
+    assert len(data["items"]) == 6
+    assert [it["hour"] for it in data["items"]] == [9, 18] * 3
+    assert all(0.0 <= it["probability"] <= 1.0 for it in data["items"])
+
+
+def test_noshow_grid_matches_single_prediction_and_memoizes():
+    from app.ml import noshow
+
+    day = date(2025, 1, 4)
+    forecast = [{"date": day, "temp_avg": 24.0, "precipitation_probability": 60.0}]
+    noshow._grid_memo.clear()
+    grid = noshow.predict_noshow_grid([day], [9, 17], forecast, "v1")
+    w = {"temp_avg": 24.0, "precip_prob": 0.6, "is_weekend": 1}
+    for hour, label, prob in grid[day]:
+        assert (label, prob) == noshow.predict_noshow(day, hour, weather=w)
+    assert len(noshow._grid_memo) == 1
+    again = noshow.predict_noshow_grid([day], [9, 17], forecast, "v1")
+    assert again[day] is grid[day]
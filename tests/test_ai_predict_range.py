@@ -0,0 +1,77 @@
+import json
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.ml.predict import predict_affluence, predict_affluence_range
+
+client = TestClient(app)
+
+
+def test_predict_range_days():
+    start = date.today()
+    res = client.get(f"/ai/predict/range?start={start.isoformat()}&days=21")
+    assert res.status_code == 200
+    data = res.json()
+    assert len(data["items"]) == 21
+    assert data["items"][0]["date"] == start.isoformat()
+    assert data["end"] == (start + timedelta(days=20)).isoformat()
+    assert all(it["label"] in ("Baja", "Media", "Alta") for it in data["items"])
+
+
+def test_predict_range_ndjson_and_validation():
+    res = client.get("/ai/predict/range?days=3&format=ndjson")
+    assert res.status_code == 200
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert len(rows) == 3
+
+    res = client.get("/ai/predict/range?start=2025-01-10&end=2025-01-01")
+    assert res.status_code == 422
+
+
+def test_range_matches_single_day_prediction():
+    day = date(2025, 1, 4)
+    forecast = [{"date": day, "temp_avg": 26.0, "precipitation_probability": 10.0}]
+    [(_, label, prob)] = predict_affluence_range([day], forecast)
+    feats = {
+        "temp_avg": 26.0,
+        "precip_prob": 0.1,
+        "is_weekend": 1,
+        "month": 1,
+        "weekday": 5,
+    }
+    assert (label, prob) == predict_affluence(feats)
+
+
+def test_models_run_off_the_event_loop(monkeypatch):
+    import asyncio
+    from app.ml import noshow, predict
+
+    loops = []
+
+    def spy(fn):
+        def wrapper(*args, **kwargs):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(predict, "predict_affluence", spy(predict.predict_affluence))
+    monkeypatch.setattr(predict, "predict_affluence_range", spy(predict.predict_affluence_range))
+    monkeypatch.setattr(noshow, "predict_noshow", spy(noshow.predict_noshow))
+    monkeypatch.setattr(noshow, "predict_noshow_grid", spy(noshow.predict_noshow_grid))
+
+    today = date.today().isoformat()
+    for url in (
+        "/ai/predict",
+        "/ai/predict/range?days=2",
+        f"/ai/noshow?day={today}&hour=10",
+        "/ai/noshow/grid?days=1&hours=10",
+    ):
+        assert client.get(url).status_code == 200, url
+    # Sin event loop en el hilo: corrieron en el threadpool
+    assert loops == [None] * 4
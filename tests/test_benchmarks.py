@@ -0,0 +1,76 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.main import app
+from app.db import models, seed
+from app.db.database import SessionLocal
+from app.external.weather_client import WeatherClient, BUENOS_AIRES
+from benchmarks.run import (
+    SCENARIOS,
+    BenchContext,
+    WeatherStub,
+    compare,
+    percentile,
+    run_scenario,
+    summarize,
+)
+
+client = TestClient(app)
+
+
+def setup_module():
+    seed.seed()
+
+
+def _ctx() -> BenchContext:
+    db = SessionLocal()
+    try:
+        lo, hi = db.execute(select(func.min(models.Owner.id), func.max(models.Owner.id))).one()
+    finally:
+        db.close()
+    return BenchContext(today=date.today(), owner_ids=(lo, hi))
+
+
+def test_percentile_and_summary():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+    s = summarize([3.0, 1.0, 2.0], errors=1, wall_s=0.5)
+    assert s["requests"] == 3 and s["errors"] == 1
+    assert s["p50_ms"] == 2.0 and s["max_ms"] == 3.0
+    assert s["throughput_rps"] == 6.0
+
+
+def test_weather_stub_speaks_open_meteo():
+    with WeatherStub() as stub:
+        wc = WeatherClient(base_url=stub.url, retries=0)
+        try:
+            forecast = wc.fetch_daily(*BUENOS_AIRES, days=16)
+        finally:
+            wc.close()
+    assert len(forecast) == 16
+    assert forecast[0]["date"] == date.today()
+    assert forecast[0]["temp_avg"] == 19.0
+
+
+def test_scenarios_run_without_errors():
+    ctx = _ctx()
+    for name in ("schedule_day", "owner_view", "ai_intent"):
+        result = run_scenario(client, SCENARIOS[name], ctx, requests=5, warmup=1)
+        assert result["requests"] == 5
+        assert result["errors"] == 0, name
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+def test_compare_flags_p95_regressions():
+    base = {"scenarios": {"a": {"p50_ms": 10.0, "p95_ms": 20.0, "throughput_rps": 100.0}}}
+    slower = {"scenarios": {"a": {"p50_ms": 11.0, "p95_ms": 30.0, "throughput_rps": 90.0}}}
+    lines, regressed = compare(slower, base, max_regression=25)
+    assert regressed and "REGRESIÓN" in lines[0]
+    _, regressed = compare(slower, base, max_regression=60)
+    assert not regressed
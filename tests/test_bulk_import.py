@@ -0,0 +1,155 @@
+import io
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.db.database import Base
+from app.db import models
+from app.services.bulk_import import import_stream
+
+client = TestClient(app)
+
+
+def _ndjson(rows):
+    return "\n".join(json.dumps(r) for r in rows).encode("utf-8")
+
+
+def test_bulk_import_owners_pets_appointments_via_api(isolated_db):
+    # Base propia: en app.db una segunda corrida duplicaría los emails y la
+    # referencia quedaría ambigua
+    owners_csv = (
+        "name,email,phone\n"
+        "Bulk Uno,bulk1@example.com,111\n"
+        ",sin-nombre@example.com,\n"
+        "Bulk Dos,bulk2@example.com,\n"
+    ).encode("utf-8")
+    res = client.post(
+        "/import/owners", files={"file": ("owners.csv", owners_csv, "text/csv")}
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["inserted"] == 2
+    assert body["failed"] == 1
+    assert body["errors"][0]["row"] == 2
+
+    pets = [
+        {"name": "Bulky", "species": "Perro", "owner_email": "bulk1@example.com"},
+        {"name": "Huérfano", "species": "Gato", "owner_email": "nadie@example.com"},
+        {"name": "Bolita", "species": "Gato", "owner_email": "bulk2@example.com"},
+    ]
+    res = client.post(
+        "/import/pets",
+        files={"file": ("pets.ndjson", _ndjson(pets), "application/x-ndjson")},
+    )
+    body = res.json()
+    assert (body["inserted"], body["failed"]) == (2, 1)
+    assert "owner_id" in body["errors"][0]["error"]
+
+    appointments = [
+        {
+            "date": "2034-02-01T10:00:00",
+            "reason": "importado",
+            "status": "attended",
+            "pet_name": "Bulky",
+            "owner_email": "bulk1@example.com",
+        },
+        {
+            "date": "2034-02-01T11:00:00",
+            "reason": "importado",
+            "pet_name": "Bolita",
+            "owner_email": "bulk2@example.com",
+        },
+        {"date": "no-es-fecha", "reason": "x", "pet_id": 1},
+    ]
+    res = client.post(
+        "/import/appointments?format=ndjson",
+        files={"file": ("apts.txt", _ndjson(appointments), "text/plain")},
+    )
+    body = res.json()
+    assert (body["inserted"], body["failed"]) == (2, 1)
+
+    # Los INSERT de Core también alimentan el rollup de asistencia
+    report = client.get("/reports/attendance?start=2034-02-01&end=2034-02-01").json()
+    assert report["attended"] == 1 and report["scheduled"] == 1
+
+
+def test_bulk_import_unknown_entity():
+    res = client.post("/import/nope", files={"file": ("x.csv", b"a\n1\n", "text/csv")})
+    assert res.status_code == 404
+
+
+def test_import_stream_batches_and_bad_json():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    lines = [json.dumps({"name": f"Dueño {i}"}) for i in range(25)]
+    lines.insert(10, "{roto")
+    with Session(engine) as db:
+        report = import_stream(
+            db, "owners", io.BytesIO("\n".join(lines).encode()), "ndjson", batch_size=7
+        )
+        assert report.inserted == 25
+        assert report.failed == 1
+        assert report.errors[0]["row"] == 11
+        assert db.query(models.Owner).count() == 25
+
+
+def test_ambiguous_references_are_reported_not_guessed():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        # owners.email no es único: dos dueños comparten el mismo
+        twin_a = models.Owner(name="Gemelo A", email="gemelos@example.com")
+        twin_b = models.Owner(name="Gemelo B", email="gemelos@example.com")
+        solo = models.Owner(name="Solo", email="solo@example.com")
+        db.add_all([
+            twin_a,
+            twin_b,
+            solo,
+            models.Pet(name="Toby", species="Perro", owner=solo),
+            models.Pet(name="Toby", species="Gato", owner=solo),
+        ])
+        db.commit()
+
+        pets = [
+            {"name": "Ambiguo", "species": "Perro", "owner_email": "gemelos@example.com"},
+            {"name": "Claro", "species": "Perro", "owner_email": "solo@example.com"},
+        ]
+        report = import_stream(db, "pets", io.BytesIO(_ndjson(pets)), "ndjson")
+        assert (report.inserted, report.failed) == (1, 1)
+        assert report.errors[0]["row"] == 1
+        assert "referencia ambigua" in report.errors[0]["error"]
+
+        vaccines = [
+            {
+                "vaccine_name": "Antirrábica",
+                "applied_date": "2034-01-01",
+                "due_date": "2035-01-01",
+                "pet_name": "Toby",
+                "owner_email": "solo@example.com",
+            }
+        ]
+        report = import_stream(db, "vaccinations", io.BytesIO(_ndjson(vaccines)), "ndjson")
+        assert report.inserted == 0
+        assert "referencia ambigua" in report.errors[0]["error"]
+        assert db.query(models.Vaccination).count() == 0
+
+
+def test_rejected_batch_is_retried_row_by_row():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE UNIQUE INDEX ux_test_owner_email ON owners (email)")
+    rows = [{"name": f"Único {i}", "email": f"u{i}@example.com"} for i in range(6)]
+    rows[4]["email"] = "u1@example.com"
+    with Session(engine) as db:
+        report = import_stream(db, "owners", io.BytesIO(_ndjson(rows)), "ndjson", batch_size=3)
+        # El segundo lote viola UNIQUE: se reintenta fila por fila y solo falla la 5
+        assert (report.inserted, report.failed) == (5, 1)
+        assert report.errors[0]["row"] == 5
+        assert "UNIQUE" in report.errors[0]["error"]
+        assert sorted(db.scalars(select(models.Owner.name))) == [
+            f"Único {i}" for i in (0, 1, 2, 3, 5)
+        ]
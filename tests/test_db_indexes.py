@@ -0,0 +1,99 @@
+from typing import List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.db.database import Base, SessionLocal
+from app.db.database import engine as app_engine
+from app.db import models
+
+client = TestClient(app)
+
+
+def setup_module():
+    global engine, pet_id
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        pet = models.Pet(
+            name="Plan Mascota", species="Perro", owner=models.Owner(name="Plan Dueño")
+        )
+        db.add(pet)
+        db.commit()
+        pet_id = pet.id
+    finally:
+        db.close()
+
+
+def _plan(query) -> str:
+    """EXPLAIN QUERY PLAN de una query ORM, como texto."""
+    compiled = query.statement.compile(dialect=engine.dialect)
+    params = tuple(compiled.params[k] for k in compiled.positiontup)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return "\n".join(r[-1] for r in rows)
+
+
+def _router_plans(url: str, table: str) -> List[str]:
+    """
+    EXPLAIN QUERY PLAN de los SELECT sobre `table` que emite el endpoint
+    `url`, con las mismas sentencias y parámetros que ejecutó el router.
+    """
+    captured = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and f"FROM {table}" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(app_engine, "before_cursor_execute", on_execute)
+    try:
+        assert client.get(url).status_code == 200
+    finally:
+        event.remove(app_engine, "before_cursor_execute", on_execute)
+    assert captured, f"{url} no consultó {table}"
+    with app_engine.connect() as conn:
+        return [
+            "\n".join(r[-1] for r in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params))
+            for sql, params in captured
+        ]
+
+
+def _assert_uses_index(plan: str, table: str, index: str) -> None:
+    assert f"SCAN {table}\n" not in plan + "\n", plan
+    assert index in plan, plan
+
+
+def test_schedule_day_uses_date_index():
+    for plan in _router_plans("/schedule/day?day=2025-01-06", "appointments"):
+        _assert_uses_index(plan, "appointments", "ix_appointments_date")
+
+
+def test_upcoming_vaccines_use_due_date_index():
+    for plan in _router_plans("/vaccinations/upcoming?days=30&include_total=true", "vaccinations"):
+        _assert_uses_index(plan, "vaccinations", "ix_vaccinations_due_date")
+
+
+def test_pet_history_uses_pet_visit_index():
+    [plan] = _router_plans(f"/records/view?pet_id={pet_id}", "clinical_records")
+    _assert_uses_index(plan, "clinical_records", "ix_clinical_records_pet_visit")
+    # El índice compuesto también resuelve el ORDER BY visit_date DESC
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_appointments_by_status_use_composite_index():
+    with Session(engine) as db:
+        q = (
+            db.query(models.Appointment)
+            .filter(models.Appointment.status == "scheduled")
+            .order_by(models.Appointment.appointment_date.asc())
+        )
+        _assert_uses_index(_plan(q), "appointments", "ix_appointments_status_date")
+
+
+def test_pets_by_owner_use_fk_index():
+    with Session(engine) as db:
+        q = db.query(models.Pet).filter(models.Pet.owner_id == 1)
+        _assert_uses_index(_plan(q), "pets", "ix_pets_owner_id")
@@ -0,0 +1,121 @@
+import os
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.docs import DocsService, markdown_to_html
+
+client = TestClient(app)
+
+SAMPLE = """# Título
+## Sección **clave**
+
+Texto con `código`, [enlace](/ui) y <b>html</b>.
+
+- uno
+- **dos**
+
+| A | B |
+|---|---|
+| 1 | 2 |
+
+```
+x < y
+```
+"""
+
+
+def test_markdown_to_html_subset():
+    out = markdown_to_html(SAMPLE)
+    assert "<h1>Título</h1>" in out
+    assert "<h2>Sección <strong>clave</strong></h2>" in out
+    assert '<code>código</code>, <a href="/ui">enlace</a>' in out
+    assert "&lt;b&gt;html&lt;/b&gt;" in out
+    assert "<ul>\n<li>uno</li>\n<li><strong>dos</strong></li>\n</ul>" in out
+    assert "<thead><tr><th>A</th><th>B</th></tr></thead><tbody>" in out
+    assert "<tr><td>1</td><td>2</td></tr>\n</tbody></table>" in out
+    assert "<pre><code>\nx &lt; y\n</code></pre>" in out
+
+
+def test_docs_service_caches_by_mtime_and_shares_disk(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    doc = docs / "Guia.md"
+    doc.write_text("# Uno\n", encoding="utf-8")
+    cache = tmp_path / "cache"
+
+    first = DocsService(docs, str(cache))
+    assert first.html("Guia") == "<h1>Uno</h1>"
+    assert first.html("Guia") == "<h1>Uno</h1>"
+    assert first.conversions == 1
+
+    # Otro worker con el mismo directorio de cache no vuelve a convertir
+    other = DocsService(docs, str(cache))
+    assert other.html("Guia") == "<h1>Uno</h1>"
+    assert other.conversions == 0
+
+    doc.write_text("# Dos\n", encoding="utf-8")
+    st = doc.stat()
+    os.utime(doc, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert first.html("Guia") == "<h1>Dos</h1>"
+    assert first.conversions == 2
+    assert len(list(cache.glob("Guia.*.html"))) == 1
+
+    assert first.version("../secreto") is None
+    assert first.version("no_existe") is None
+
+
+def test_docs_service_does_not_list_directory_per_request(tmp_path, monkeypatch):
+    (tmp_path / "Guia.md").write_text("# Uno\n", encoding="utf-8")
+    service = DocsService(tmp_path, None)
+
+    def no_glob():
+        raise AssertionError("no debe listar docs/ en cada request")
+
+    monkeypatch.setattr(service, "names", no_glob)
+    assert service.version("Guia") is not None
+    assert service.html("Guia") == "<h1>Uno</h1>"
+    (tmp_path / "Carpeta.md").mkdir()
+    assert service.version("Carpeta") is None
+
+
+def test_presentation_supports_conditional_get():
+    r = client.get("/admin/presentation")
+    assert r.status_code == 200
+    assert "Proyecto IFTS-12 Veterinaria-Inteligente" in r.text
+    assert "<table>" in r.text
+    assert r.headers["cache-control"] == "no-cache"
+    again = client.get("/admin/presentation", headers={"If-None-Match": r.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_other_docs_use_the_same_service():
+    names = client.get("/admin/docs").json()["docs"]
+    assert "Presentacion_Proyecto" in names and "URLS_ACCESO" in names
+    r = client.get("/admin/docs/URLS_ACCESO")
+    assert r.status_code == 200 and "docs/URLS_ACCESO.md" in r.text
+    assert client.get("/admin/docs/no_existe").status_code == 404
+
+
+def test_doc_page_is_registered_once_under_concurrency():
+    from app.api.precompressed import PAGES
+    from app.api.routers import admin
+
+    before = len(PAGES)
+    barrier = threading.Barrier(8)
+    pages = []
+
+    def worker():
+        barrier.wait()
+        pages.append(admin._doc_page("URLS_ACCESO_concurrente"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(p) for p in pages}) == 1
+    assert len(PAGES) == before + 1
+    PAGES.remove(pages[0])
+    del admin._doc_pages["URLS_ACCESO_concurrente"]
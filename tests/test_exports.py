@@ -0,0 +1,74 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db import models
+
+client = TestClient(app)
+
+DAY = datetime(2033, 7, 4, 10)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_data(isolated_db):
+    db = SessionLocal()
+    try:
+        owner = models.Owner(name="Export Dueño", email="export@example.com")
+        pet = models.Pet(name="Export", species="Perro", owner=owner)
+        db.add_all([owner, pet])
+        for i, status in enumerate(["scheduled", "attended", "canceled"] * 3):
+            db.add(
+                models.Appointment(
+                    pet=pet,
+                    appointment_date=DAY.replace(hour=9 + i),
+                    reason=f"export-{i}",
+                    status=status,
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_export_appointments_ndjson_filtered(monkeypatch):
+    # Lotes chicos para forzar varias particiones del cursor
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    day = DAY.date().isoformat()
+    res = client.get(f"/exports/appointments?start={day}&end={day}&status=attended")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [r["reason"] for r in rows] == ["export-1", "export-4", "export-7"]
+    assert rows[0]["appointment_date"].startswith(day)
+
+
+def test_export_csv_has_header_and_rows():
+    res = client.get("/exports/owners?format=csv")
+    assert res.status_code == 200
+    reader = list(csv.reader(io.StringIO(res.text)))
+    assert reader[0][:2] == ["id", "name"]
+    assert any(row[1] == "Export Dueño" for row in reader[1:])
+
+
+def test_export_gzip():
+    day = DAY.date().isoformat()
+    url = f"/exports/appointments?start={day}&end={day}&gzip=true"
+    with client.stream("GET", url) as res:
+        assert res.status_code == 200
+        assert res.headers["content-encoding"] == "gzip"
+        raw = b"".join(res.iter_raw())
+    lines = gzip.decompress(raw).decode("utf-8").splitlines()
+    assert len(lines) == 9
+
+
+def test_export_unknown_entity_and_bad_status_filter():
+    assert client.get("/exports/nope").status_code == 404
+    assert client.get("/exports/owners?status=done").status_code == 422
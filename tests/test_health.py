@@ -1,3 +1,13 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import httpx
+
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -7,3 +17,65 @@ def test_health():
     r = client.get("/health")
     assert r.status_code == 200
     assert r.json().get("status") == "ok"
+
+
+def test_health_startup_phases():
+    client = TestClient(app)
+    r = client.get("/health/startup")
+    assert r.status_code == 200
+    body = r.json()
+    phases = {p["phase"]: p for p in body["phases"]}
+    assert {"imports", "db_schema", "routers"} <= set(phases)
+    assert phases["db_schema"]["result"] in ("create_all", "alembic_at_head", "skipped")
+    assert body["total_ms"] >= 0
+
+
+def test_import_app_does_not_load_ml():
+    # sklearn/pandas se cargan recién en el primer uso de /ai/*
+    code = (
+        "import sys, app.main; "
+        "print(any(m in sys.modules for m in ('sklearn', 'pandas')))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_first_ml_import_does_not_block_event_loop(monkeypatch):
+    from app.api.routers import ai
+
+    real_import = ai.importlib.import_module
+
+    def slow_import(name):
+        if name != "app.ml.predict":
+            return real_import(name)
+        # Simula la primera carga de pandas/sklearn
+        time.sleep(0.5)
+        return SimpleNamespace(predict_affluence=lambda f: ("Media", 0.5))
+
+    async def weather(day=None):
+        return {"date": day or date.today()}
+
+    monkeypatch.delitem(sys.modules, "app.ml.predict", raising=False)
+    monkeypatch.setattr(ai.importlib, "import_module", slow_import)
+    monkeypatch.setattr(ai, "get_weather_features_async", weather)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            first = asyncio.create_task(ac.get("/ai/predict"))
+            await asyncio.sleep(0.1)
+            start = time.perf_counter()
+            health = await ac.get("/health")
+            elapsed = time.perf_counter() - start
+            assert not first.done()
+            return health, elapsed, await first
+
+    health, elapsed, predicted = asyncio.run(scenario())
+    assert health.status_code == 200 and elapsed < 0.3
+    assert predicted.json()["label"] == "Media"
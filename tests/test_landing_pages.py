@@ -0,0 +1,76 @@
+import gzip
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api import precompressed
+from app.api.precompressed import PrecompressedPage, accepted_encodings
+
+client = TestClient(app)
+
+LANDING_URLS = [
+    "/",
+    "/ui/",
+    "/vet/",
+    "/vet/clinica/",
+    "/vet/gestion/",
+    "/ai-dashboard/",
+    "/admin/api_docs_friendly",
+]
+
+
+def test_accept_encoding_parsing():
+    assert accepted_encodings("") == {"identity"}
+    assert accepted_encodings("gzip, deflate, br") >= {"gzip", "br"}
+    assert "br" not in accepted_encodings("gzip, br;q=0")
+    assert accepted_encodings("*") >= {"gzip", "br"}
+
+
+def test_landing_pages_are_compressed_and_validated():
+    for url in LANDING_URLS:
+        r = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200, url
+        assert r.headers["content-encoding"] == "gzip", url
+        assert "Accept-Encoding" in r.headers["vary"]
+        assert r.headers["cache-control"].startswith("public, max-age=")
+        assert "<!doctype html>" in r.text
+        etag = r.headers["etag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+
+        again = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert again.status_code == 304, url
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+
+def test_identity_and_brotli_variants():
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    if precompressed.brotli is not None:
+        br = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+        assert br.headers["content-encoding"] == "br"
+        assert br.text == plain.text
+        assert br.headers["etag"] != plain.headers["etag"]
+    # Cada variante tiene su ETag pero todas validan el mismo contenido
+    stale = client.get("/", headers={"If-None-Match": '"otro"'})
+    assert stale.status_code == 200
+
+
+def test_page_is_built_once_per_key():
+    calls = []
+    state = {"day": 1}
+
+    def build():
+        calls.append(state["day"])
+        return f"<p>{state['day']}</p>"
+
+    page = PrecompressedPage(build, key=lambda: state["day"])
+    try:
+        first = page.get()
+        assert page.get() is first
+        assert gzip.decompress(first.bodies["gzip"]) == b"<p>1</p>"
+        state["day"] = 2
+        assert page.get().digest != first.digest
+        assert calls == [1, 2]
+    finally:
+        precompressed.PAGES.remove(page)
@@ -0,0 +1,42 @@
+import os
+
+import joblib
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.ml.registry import ModelRegistry
+
+client = TestClient(app)
+
+
+def test_registry_loads_once_and_counts_hits(tmp_path):
+    path = tmp_path / "m.joblib"
+    joblib.dump({"v": 1}, path)
+    reg = ModelRegistry()
+    assert reg.get(path) == {"v": 1}
+    assert reg.get(path) == {"v": 1}
+    stats = reg.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert len(stats["models"]) == 1
+
+
+def test_registry_hot_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "m.joblib"
+    joblib.dump({"v": 1}, path)
+    reg = ModelRegistry()
+    first = reg.get(path)
+    joblib.dump({"v": 2, "extra": "x" * 32}, path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = reg.get(path)
+    assert first == {"v": 1}
+    assert second["v"] == 2
+    assert reg.stats()["reloads"] == 1
+
+
+def test_models_status_endpoint():
+    res = client.get("/ai/models")
+    assert res.status_code == 200
+    data = res.json()
+    assert {"hits", "misses", "reloads", "models"} <= set(data.keys())
@@ -0,0 +1,59 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models
+from app.db.database import Base
+from app.ml.features import build_feature_matrix, date_range, vectorize
+from app.ml.train import daily_appointment_counts, history_data, labels_from_counts
+
+
+def test_feature_matrix_matches_vectorize():
+    start, end = date(2024, 12, 28), date(2025, 1, 6)
+    X = build_feature_matrix(date_range(start, end), temp_avg=21.5, precip_prob=0.2)
+    assert X.shape == (10, 5)
+    for i in range(10):
+        d = start + timedelta(days=i)
+        expected = vectorize(
+            {
+                "temp_avg": 21.5,
+                "precip_prob": 0.2,
+                "is_weekend": 1 if d.weekday() >= 5 else 0,
+                "month": d.month,
+                "weekday": d.weekday(),
+            }
+        )
+        assert X[i].tolist() == expected
+
+
+def test_history_labels_from_appointments():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    owner = models.Owner(name="Ana")
+    pet = models.Pet(name="Tom", species="gato", owner=owner)
+    db.add_all([owner, pet])
+    start = date(2025, 3, 1)
+    # 0, 1, 2, ..., 5 turnos por día
+    for i in range(6):
+        for h in range(i):
+            db.add(
+                models.Appointment(
+                    pet=pet,
+                    reason="control",
+                    appointment_date=datetime(2025, 3, 1 + i, 9 + h),
+                )
+            )
+    db.commit()
+
+    end = start + timedelta(days=5)
+    counts = daily_appointment_counts(db, start, end)
+    assert counts.tolist() == [0, 1, 2, 3, 4, 5]
+    X, y = history_data(db, start, end)
+    assert X.shape == (6, 5)
+    assert y.tolist() == labels_from_counts(counts).tolist()
+    assert y[0] == 0 and y[-1] == 2
+    assert np.all(np.diff(y) >= 0)
+    db.close()
@@ -0,0 +1,134 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.pagination import decode_cursor, encode_cursor
+from app.db.database import SessionLocal
+from app.db import models
+
+client = TestClient(app)
+
+# Turnos en un día reservado, varios a la misma hora para probar el desempate
+DAY = datetime(2032, 5, 3, 9)
+N_APPOINTMENTS = 7
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_data(isolated_db):
+    db = SessionLocal()
+    try:
+        owner = models.Owner(name="Cursor Dueño")
+        pet = models.Pet(name="Cursor", species="Gato", owner=owner)
+        db.add_all([owner, pet])
+        for i in range(N_APPOINTMENTS):
+            db.add(
+                models.Appointment(
+                    pet=pet,
+                    appointment_date=DAY + timedelta(hours=i // 2),
+                    reason=f"cursor-{i}",
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _walk(url, direction="next"):
+    """Recorre todas las páginas siguiendo X-Next-Cursor / X-Prev-Cursor."""
+    pages = []
+    while url:
+        res = client.get(url)
+        assert res.status_code == 200
+        pages.append(res.json())
+        cursor = res.headers.get(f"x-{direction}-cursor")
+        url = None
+        if cursor:
+            url = str(res.request.url.copy_set_param("cursor", cursor))
+    return pages
+
+
+def test_cursor_roundtrip():
+    cursor = encode_cursor("next", date(2025, 1, 6), 42)
+    assert decode_cursor(cursor, models.Vaccination.due_date) == (
+        "next",
+        date(2025, 1, 6),
+        42,
+    )
+
+
+def test_invalid_cursor_is_400():
+    res = client.get("/owners/?cursor=no-es-un-cursor")
+    assert res.status_code == 400
+
+
+def test_owners_pages_cover_all_rows_without_duplicates():
+    all_ids = [o["id"] for o in client.get("/owners/?page_size=200").json()]
+    pages = _walk("/owners/?page_size=3")
+    ids = [o["id"] for page in pages for o in page]
+    assert ids == all_ids
+    assert len(ids) == len(set(ids))
+
+
+def test_appointments_are_paginated_by_date_then_id():
+    first = client.get("/appointments/?page_size=2&include_total=true")
+    assert first.status_code == 200
+    assert len(first.json()) <= 2
+    assert int(first.headers["x-total-estimate"]) >= N_APPOINTMENTS
+    assert 'rel="next"' in first.headers["link"]
+
+    pages = _walk("/appointments/?page_size=4")
+    rows = [a for page in pages for a in page]
+    keys = [(a["date"], a["id"]) for a in rows]
+    assert keys == sorted(keys)
+    mine = [a["reason"] for a in rows if a["reason"].startswith("cursor-")]
+    assert mine == [f"cursor-{i}" for i in range(N_APPOINTMENTS)]
+
+
+def test_prev_cursor_returns_previous_page():
+    first = client.get("/appointments/?page_size=3")
+    second = client.get(
+        f"/appointments/?page_size=3&cursor={first.headers['x-next-cursor']}"
+    )
+    back = client.get(
+        f"/appointments/?page_size=3&cursor={second.headers['x-prev-cursor']}"
+    )
+    assert back.json() == first.json()
+    assert "x-prev-cursor" not in back.headers
+
+
+def test_records_and_upcoming_vaccinations_return_lists():
+    res = client.get("/records/?page_size=5&include_total=true")
+    assert res.status_code == 200
+    assert isinstance(res.json(), list)
+    assert "x-total-estimate" in res.headers
+
+    res = client.get("/vaccinations/upcoming?days=365&page_size=1")
+    assert res.status_code == 200
+    assert len(res.json()) <= 1
+
+
+def test_deprecated_page_param_still_offsets():
+    db = SessionLocal()
+    try:
+        db.add_all([models.Owner(name=f"Offset Dueño {i}") for i in range(8)])
+        db.commit()
+    finally:
+        db.close()
+    all_ids = [o["id"] for o in client.get("/owners/?page_size=200").json()]
+    third = client.get("/owners/?page=3&page_size=2")
+    assert third.status_code == 200
+    assert [o["id"] for o in third.json()] == all_ids[4:6]
+    assert third.headers["deprecation"] == "true"
+
+    # Los cursores de la respuesta continúan sin `page`
+    assert "page=" not in third.headers["link"]
+    after = client.get(f"/owners/?page_size=2&cursor={third.headers['x-next-cursor']}")
+    assert [o["id"] for o in after.json()] == all_ids[6:8]
+    assert "deprecation" not in after.headers
+
+    mixed = client.get(f"/owners/?page=2&cursor={third.headers['x-next-cursor']}")
+    assert mixed.status_code == 400
+    for url in ("/pets/?page=2", "/records/?page=2", "/vaccinations/upcoming?page=2"):
+        assert client.get(url).status_code == 200, url
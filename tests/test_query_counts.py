@@ -0,0 +1,83 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.db.database import SessionLocal
+from app.db import models
+from app.services.stats import stats_service
+
+client = TestClient(app)
+
+# Dos conjuntos de datos, cada uno en su propio día y con su prefijo de
+# nombre (no los usa el seed). Cada vista se pide con pocas y con muchas
+# filas: con carga eager la cantidad de sentencias es la misma.
+SMALL = {"day": date(2031, 3, 17), "name": "N1a", "n": 2}
+LARGE = {"day": date(2031, 3, 18), "name": "N1b", "n": 12}
+# Cota fija de sentencias por vista
+MAX_STATEMENTS = 6
+
+
+def _seed(day: date, name: str, n: int) -> None:
+    db = SessionLocal()
+    try:
+        for i in range(n):
+            owner = models.Owner(name=f"{name} Dueño {i}", email=f"{name}-{i}@example.com")
+            pet = models.Pet(name=f"{name} Mascota {i}", species="Perro", owner=owner)
+            db.add_all(
+                [
+                    owner,
+                    pet,
+                    models.Appointment(
+                        pet=pet,
+                        appointment_date=datetime(day.year, day.month, day.day, 9 + i % 8),
+                        reason="control",
+                    ),
+                    models.Vaccination(
+                        pet=pet,
+                        vaccine_name="Antirrábica",
+                        applied_date=date.today() - timedelta(days=300),
+                        due_date=date.today() + timedelta(days=1 + i),
+                    ),
+                ]
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def setup_module():
+    _seed(**SMALL)
+    _seed(**LARGE)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/schedule/daily?date={day}",
+        "/owners/search/view?name={name}",
+        "/pets/view?page_size={n}",
+        "/pets/search/view?name={name}",
+        "/appointments/view-all?page_size={n}",
+        "/appointments/search?from={day}&to={day}",
+        "/appointments/view?date={day}",
+        "/vaccinations/view?days={n}",
+        "/admin/db_details?limit={n}",
+    ],
+)
+def test_html_views_query_count_does_not_grow_with_rows(url, sql_counter):
+    counts = []
+    sizes = []
+    for data in (SMALL, LARGE):
+        # Ambas mediciones con el cache de conteos vacío
+        stats_service.invalidate()
+        with sql_counter.count() as statements:
+            res = client.get(url.format(**data))
+        assert res.status_code == 200, res.text[:300]
+        counts.append(len(statements))
+        sizes.append(len(res.text))
+        assert len(statements) <= MAX_STATEMENTS, "\n".join(statements)
+    # La segunda página tiene más filas, pero las mismas sentencias
+    assert sizes[1] > sizes[0]
+    assert counts[0] == counts[1], counts
@@ -1,7 +1,12 @@
 from fastapi.testclient import TestClient
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 from app.main import app
-from app.db import seed
+from app.core.config import settings
+from app.db import models, seed
+from app.db.database import Base
+from app.services.attendance import attendance_series, attendance_totals, rebuild_rollup
 
 client = TestClient(app)
 
@@ -19,3 +24,65 @@ def test_attendance_report():
     assert res.status_code == 200
     data = res.json()
     assert set(data.keys()) == {"start", "end", "attended", "canceled", "scheduled"}
+
+
+def test_attendance_report_series():
+    start = date.today() - timedelta(days=2)
+    end = date.today() + timedelta(days=2)
+    res = client.get(
+        f"/reports/attendance?start={start.isoformat()}&end={end.isoformat()}&series=true"
+    )
+    assert res.status_code == 200
+    data = res.json()
+    assert len(data["series"]) == 5
+    assert data["series"][0]["date"] == start.isoformat()
+    for key in ("attended", "canceled", "scheduled"):
+        assert sum(day[key] for day in data["series"]) == data[key]
+
+
+def test_attendance_rollup_matches_live_query(monkeypatch):
+    start = date.today() - timedelta(days=30)
+    end = date.today() + timedelta(days=30)
+    url = f"/reports/attendance?start={start.isoformat()}&end={end.isoformat()}&series=true"
+    from_rollup = client.get(url).json()
+    monkeypatch.setattr(settings, "attendance_rollup", False)
+    live = client.get(url).json()
+    assert from_rollup == live
+
+
+def test_attendance_rollup_maintained_incrementally():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    day = date(2025, 3, 10)
+    with Session(engine) as db:
+        owner = models.Owner(name="Rollup")
+        pet = models.Pet(name="Luna", species="Gato", owner=owner)
+        apts = [
+            models.Appointment(
+                pet=pet, appointment_date=datetime(2025, 3, 10, 9 + i), reason="control"
+            )
+            for i in range(3)
+        ]
+        db.add_all([owner, pet, *apts])
+        db.commit()
+
+        apts[0].status = "attended"
+        apts[1].status = "canceled"
+        db.commit()
+        # Reprogramar un turno al día siguiente
+        apts[2].appointment_date = datetime(2025, 3, 11, 10)
+        db.commit()
+
+        assert attendance_totals(db, day, day) == {
+            "scheduled": 0,
+            "attended": 1,
+            "canceled": 1,
+        }
+        db.delete(apts[0])
+        db.commit()
+        incremental = attendance_series(db, day, day + timedelta(days=1))
+        rebuild_rollup(db)
+        db.commit()
+        assert attendance_series(db, day, day + timedelta(days=1)) == incremental
+        assert incremental[1]["scheduled"] == 1
+        assert incremental[0]["attended"] == 0
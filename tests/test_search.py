@@ -0,0 +1,132 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.db.database import Base, SessionLocal
+from app.db import models
+from app.services import search
+from app.services.search import apply_search, index_missing, normalize, tokens
+
+client = TestClient(app)
+
+# Palabras inventadas para no chocar con el seed ni con otros tests
+OWNER = "Zúñiga Quetzalín"
+PET = "Ñandúzor"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_data(isolated_db):
+    db = SessionLocal()
+    try:
+        owner = models.Owner(name=OWNER, phone="+54 11 4321-9876", email="zuniga@example.com")
+        pet = models.Pet(name=PET, species="Gato", owner=owner)
+        # Uno menciona la palabra en el diagnóstico, el otro solo en la medicación
+        db.add_all([
+            owner,
+            pet,
+            models.ClinicalRecord(pet=pet, diagnosis="Xerotitis crónica", symptoms="rascado"),
+            models.ClinicalRecord(pet=pet, diagnosis="Control anual", medications="gotas xerotitis"),
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def _search(kind, model, filters):
+    db = SessionLocal()
+    try:
+        return db.scalars(apply_search(db, select(model), kind, filters)).all()
+    finally:
+        db.close()
+
+
+def test_normalize_and_tokens():
+    assert normalize("Ñandú CRÓNICO") == "nandu cronico"
+    assert tokens("  gonzález-pérez, 11_4321 ") == ["gonzalez", "perez", "11", "4321"]
+    assert tokens('"*) OR (') == ["or"]
+
+
+def test_owner_and_pet_views_match_prefix_without_accents():
+    r = client.get("/owners/search/view?name=zuni%20quetz")
+    assert r.status_code == 200 and OWNER in r.text
+    # El teléfono se indexa también solo con dígitos
+    r = client.get("/owners/search/view?phone=541143")
+    assert OWNER in r.text
+
+    r = client.get("/pets/search/view?name=nanduz&owner=ZUNIGA")
+    assert r.status_code == 200
+    assert PET in r.text and '<div class="count">1</div>' in r.text
+    r = client.get("/pets/search/view?name=nanduz&species=perro")
+    assert '<div class="count">0</div>' in r.text
+
+
+def test_records_search_ranks_diagnosis_first():
+    r = client.get("/records/search?q=xerot")
+    assert r.status_code == 200
+    assert [rec["diagnosis"] for rec in r.json()] == ["Xerotitis crónica", "Control anual"]
+    # Todas las palabras deben aparecer (en cualquier campo, incluida la mascota)
+    r = client.get("/records/search?q=xerotitis%20rasc%20nanduzor")
+    assert [rec["diagnosis"] for rec in r.json()] == ["Xerotitis crónica"]
+    assert client.get("/records/search?q=%22*)").json() == []
+
+
+def test_index_follows_updates_renames_and_deletes():
+    db = SessionLocal()
+    try:
+        owner = models.Owner(name="Temporal Wolframio")
+        pet = models.Pet(name="Bismutina", species="Perro", owner=owner)
+        db.add_all([owner, pet])
+        db.commit()
+        assert [p.id for p in _search("pets", models.Pet, {"owner": "wolfram"})] == [pet.id]
+
+        owner.name = "Temporal Molibdeno"
+        pet.species = "Hurón"
+        db.commit()
+        assert _search("pets", models.Pet, {"owner": "wolfram"}) == []
+        assert [p.id for p in _search("pets", models.Pet, {"owner": "molib", "species": "huron"})] == [pet.id]
+
+        db.delete(pet)
+        db.delete(owner)
+        db.commit()
+        assert _search("owners", models.Owner, {"name": "molibdeno"}) == []
+        assert _search("pets", models.Pet, {"name": "bismutina"}) == []
+    finally:
+        db.close()
+
+
+def test_index_missing_picks_up_core_inserts():
+    db = SessionLocal()
+    try:
+        db.execute(insert(models.Owner), [{"name": "Core Tungstenia"}])
+        db.commit()
+        assert _search("owners", models.Owner, {"name": "tungsten"}) == []
+        assert index_missing(db.connection())["owners"] == 1
+        db.commit()
+        assert [o.name for o in _search("owners", models.Owner, {"name": "tungsten"})] == ["Core Tungstenia"]
+        assert index_missing(db.connection())["owners"] == 0
+    finally:
+        db.close()
+
+
+def test_without_index_searches_fall_back_to_ilike(monkeypatch):
+    # Base sin tablas de búsqueda (create_all solo): no escribe ni consulta el índice
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        owner = models.Owner(name="Ana Gonzalez", phone="11-5555")
+        db.add_all([owner, models.Pet(name="Rulo", species="Perro", breed="Caniche", owner=owner)])
+        db.commit()
+        stmt = apply_search(db, select(models.Pet), "pets", {"owner": "onzal", "species": "canich"})
+        assert [p.name for p in db.scalars(stmt)] == ["Rulo"]
+        stmt = apply_search(db, select(models.Owner), "owners", {"contact": "5555"})
+        assert [o.name for o in db.scalars(stmt)] == ["Ana Gonzalez"]
+
+    # Motor sin soporte (o índice ausente): las vistas siguen respondiendo
+    monkeypatch.setattr(search, "_ready", lambda conn: False)
+    r = client.get("/owners/search/view?name=etzal")
+    assert r.status_code == 200 and OWNER in r.text
+    r = client.get("/records/search?q=erotitis%20cr")
+    assert r.status_code == 200
+    assert [rec["diagnosis"] for rec in r.json()] == ["Xerotitis crónica"]
@@ -0,0 +1,123 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.main import app
+from app.db import models, seed
+from app.db.database import Base, SessionLocal, make_engine
+from app.services.search import apply_search
+
+ANCHOR = date(2026, 1, 15)
+
+
+def _dump(engine, model):
+    # Todo menos los timestamps, que dependen del momento de la corrida
+    cols = [c for c in model.__table__.columns if c.name not in ("created_at", "updated_at")]
+    with engine.connect() as conn:
+        return conn.execute(select(*cols).order_by(*model.__table__.primary_key)).all()
+
+
+def _scale(tmp_path, name, random_seed):
+    engine = make_engine(f"sqlite:///{tmp_path / name}")
+    report = seed.seed_scale(
+        50,
+        pets_per_owner=2,
+        appointments_per_pet=3,
+        vaccinations_per_pet=1,
+        random_seed=random_seed,
+        batch_size=40,
+        anchor=ANCHOR,
+        bind=engine,
+    )
+    return engine, report
+
+
+def test_seed_scale_is_deterministic(tmp_path):
+    a, report = _scale(tmp_path, "a.db", random_seed=7)
+    b, _ = _scale(tmp_path, "b.db", random_seed=7)
+    c, _ = _scale(tmp_path, "c.db", random_seed=8)
+
+    assert report.rows == {
+        "owners": 50,
+        "pets": 100,
+        "appointments": 300,
+        "vaccinations": 100,
+    }
+    assert report.total == 550 and report.rows_per_s > 0
+    tables = (models.Owner, models.Pet, models.Appointment, models.Vaccination)
+    for model in tables:
+        assert _dump(a, model) == _dump(b, model)
+    assert _dump(a, models.Appointment) != _dump(c, models.Appointment)
+
+
+def test_seed_scale_references_and_rollup(tmp_path):
+    engine, _ = _scale(tmp_path, "scale.db", random_seed=1)
+    with engine.connect() as conn:
+        orphans = conn.execute(
+            select(func.count())
+            .select_from(models.Pet)
+            .outerjoin(models.Owner, models.Pet.owner_id == models.Owner.id)
+            .where(models.Owner.id.is_(None))
+        ).scalar()
+        assert orphans == 0
+        pets_per_owner = conn.execute(
+            select(func.count(models.Pet.id)).group_by(models.Pet.owner_id)
+        ).scalars().all()
+        assert set(pets_per_owner) == {2}
+        # Los turnos insertados por Core quedan en el rollup de asistencia
+        rolled = conn.execute(select(func.sum(models.AppointmentDailyStat.total))).scalar()
+        assert rolled == 300
+
+    # Una segunda corrida agrega filas con ids nuevos
+    seed.seed_scale(10, anchor=ANCHOR, bind=engine)
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count(models.Owner.id))).scalar() == 60
+        assert conn.execute(select(func.max(models.Pet.owner_id))).scalar() == 60
+
+
+def test_seed_bulk_is_batched_and_idempotent(tmp_path, sql_counter):
+    engine = make_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    Base.metadata.create_all(bind=engine)
+    with sql_counter.count(engine) as statements:
+        first = seed.seed_bulk(150, bind=engine)
+    # Antes: SELECT + INSERT + commit + refresh por fila (más de 600 sentencias)
+    assert len(statements) < 30
+    assert first.total == 450
+
+    with sql_counter.count(engine) as statements:
+        second = seed.seed_bulk(150, bind=engine)
+    assert len(statements) < 30
+    assert second.total == 0
+
+    with engine.connect() as conn:
+        n = conn.execute(
+            select(func.count(models.Owner.id)).where(
+                models.Owner.email.like("bulk_owner_%@example.com")
+            )
+        ).scalar()
+    assert n == 150
+
+
+def test_admin_reset_db_clears_search_index(isolated_db):
+    db = SessionLocal()
+    try:
+        db.add(models.Owner(name="Juanjo Viejo"))
+        db.commit()
+    finally:
+        db.close()
+
+    assert TestClient(app).post("/__admin/reset-db").status_code == 200
+    # Los INSERT de Core reusan el id 1: sin borrar el índice, heredaría "juanjo"
+    seed.seed_bulk(3)
+
+    db = SessionLocal()
+    try:
+        def emails(name):
+            stmt = apply_search(db, select(models.Owner), "owners", {"name": name})
+            return [o.email for o in db.scalars(stmt)]
+
+        assert emails("juanjo") == []
+        assert emails("owner 001") == ["bulk_owner_001@example.com"]
+    finally:
+        db.close()
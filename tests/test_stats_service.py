@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.db.database import Base, SessionLocal
+from app.db import models
+from app.services.stats import compute_counts, stats_service
+
+client = TestClient(app)
+
+
+def test_compute_counts_empty_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        counts = compute_counts(db)
+    assert counts["owners"] == counts["pets"] == counts["appointments"] == 0
+    assert counts["appointments_by_status"] == {
+        "scheduled": 0,
+        "attended": 0,
+        "canceled": 0,
+    }
+
+
+def test_compute_counts_breakdown_in_one_statement():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        owner = models.Owner(name="Ana")
+        pet = models.Pet(name="Toby", species="Perro", owner=owner)
+        db.add_all([owner, pet])
+        for status in ("scheduled", "scheduled", "attended", "canceled"):
+            db.add(
+                models.Appointment(
+                    pet=pet,
+                    appointment_date=datetime(2025, 1, 6, 10),
+                    reason="control",
+                    status=status,
+                )
+            )
+        db.commit()
+
+        statements = []
+        event.listen(
+            engine, "before_cursor_execute", lambda *a: statements.append(a[2])
+        )
+        counts = compute_counts(db)
+
+    assert len(statements) == 1
+    assert counts["owners"] == 1 and counts["pets"] == 1
+    assert counts["appointments"] == 4
+    assert counts["appointments_by_status"] == {
+        "scheduled": 2,
+        "attended": 1,
+        "canceled": 1,
+    }
+
+
+def test_db_counts_cached_and_invalidated_on_write(sql_counter):
+    stats_service.invalidate()
+    before = client.get("/admin/db_counts").json()
+
+    # Segunda lectura dentro del TTL: sale del cache, sin SQL de conteo
+    with sql_counter.count() as statements:
+        assert client.get("/admin/db_counts").json() == before
+    assert statements == []
+
+    db = SessionLocal()
+    try:
+        db.add(models.Owner(name="Stats Dueño"))
+        db.commit()
+    finally:
+        db.close()
+
+    after = client.get("/admin/db_counts").json()
+    assert after["owners"] == before["owners"] + 1
+
+
+def test_db_counts_form_renders():
+    res = client.get("/admin/db_counts_form")
+    assert res.status_code == 200
+    assert "Estadísticas" in res.text
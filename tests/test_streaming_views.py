@@ -0,0 +1,127 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, select
+
+from app.main import app
+from app.core.config import settings
+from app.core.templates import render_chunks
+from app.db.database import SessionLocal, stream_scalars
+from app.db import models
+
+client = TestClient(app)
+
+# Días reservados para estos tests (no los usa el seed)
+DAY = date(2033, 8, 1)
+NEXT_DAY = DAY + timedelta(days=1)
+N_ROWS = 7
+EVIL = "<script>alert(1)</script>"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_data(isolated_db):
+    db = SessionLocal()
+    try:
+        owner = models.Owner(name=f"Stream {EVIL}", email="stream@example.com")
+        pet = models.Pet(name="Stream Mascota", species="Perro", owner=owner)
+        db.add_all([owner, pet])
+        for i in range(N_ROWS):
+            day = DAY if i < 4 else NEXT_DAY
+            db.add(
+                models.Appointment(
+                    pet=pet,
+                    appointment_date=datetime(day.year, day.month, day.day, 9 + i),
+                    reason=f"stream {i}",
+                    status="attended" if i % 2 else "scheduled",
+                )
+            )
+        db.add(
+            models.Vaccination(
+                pet=pet,
+                vaccine_name="Stream Vencida",
+                applied_date=date.today() - timedelta(days=400),
+                due_date=date.today() - timedelta(days=3),
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _small_batches(monkeypatch):
+    # Lotes y bloques chicos: varias particiones y varios envíos por página
+    monkeypatch.setattr(settings, "html_stream_batch_size", 2)
+    monkeypatch.setattr(settings, "html_stream_chunk_size", 512)
+
+
+def test_stream_scalars_reads_in_detached_batches():
+    stmt = (
+        select(models.Appointment)
+        .where(models.Appointment.reason.like("stream %"))
+        .order_by(models.Appointment.id)
+    )
+    rows = list(stream_scalars(stmt, 2))
+    assert [a.reason for a in rows] == [f"stream {i}" for i in range(N_ROWS)]
+    # Cada lote se saca de la sesión antes de leer el siguiente
+    assert all(inspect(a).detached for a in rows)
+
+
+def test_header_is_sent_before_rows_are_read():
+    pulled = []
+
+    def rows():
+        pulled.append(True)
+        yield from ()
+
+    chunks = render_chunks(
+        "vaccinations/list.html",
+        title="Vacunas",
+        subtitle="",
+        color="#dc3545",
+        gradient="#dc3545",
+        total=0,
+        list_label="vencidas",
+        empty=("✅", "Sin vacunas"),
+        vaccinations=rows(),
+    )
+    first = next(chunks)
+    assert b"<h2>0</h2>" in first
+    assert not pulled
+    rest = b"".join(chunks)
+    assert pulled and b"Sin vacunas" in rest and rest.endswith(b"</html>")
+
+
+def test_appointment_search_groups_streamed_rows(monkeypatch):
+    _small_batches(monkeypatch)
+    r = client.get(f"/appointments/search?from={DAY.isoformat()}&to={NEXT_DAY.isoformat()}")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/html")
+    assert r.text.count('<div class="appointment-card') == N_ROWS
+    assert r.text.count('<div class="date-group">') == 2
+    assert "<span>4 turnos</span>" in r.text and "<span>3 turnos</span>" in r.text
+    assert '<div class="count">7</div>' in r.text
+    assert r.text.count("<div") == r.text.count("</div>")
+    assert EVIL not in r.text
+
+
+def test_appointment_view_streams_all_rows(monkeypatch):
+    _small_batches(monkeypatch)
+    r = client.get(f"/appointments/view?date={DAY.isoformat()}&status=attended")
+    assert r.status_code == 200
+    assert "<h2>2</h2>" in r.text
+    assert r.text.count('<div class="appointment-card">') == 2
+    assert "✓ Atendido" in r.text and "--gradient:" in r.text
+
+
+def test_overdue_vaccinations_and_pet_search(monkeypatch):
+    _small_batches(monkeypatch)
+    r = client.get("/vaccinations/view?type=overdue")
+    assert r.status_code == 200
+    assert "Stream Vencida" in r.text and "VENCIDA hace 3 días" in r.text
+    assert EVIL not in r.text and "&lt;script&gt;" in r.text
+
+    r = client.get("/pets/search/view?name=Stream")
+    assert r.status_code == 200
+    assert '<div class="count">1</div>' in r.text
+    assert "🐕" in r.text and "<style>" not in r.text
@@ -0,0 +1,88 @@
+import re
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.templates import env
+from app.db.database import SessionLocal
+from app.db import models
+
+client = TestClient(app)
+
+# Día reservado para estos tests (no lo usa el seed)
+DAY = date(2032, 5, 10)
+EVIL = "<script>alert(1)</script>"
+
+
+def setup_module():
+    db = SessionLocal()
+    try:
+        owner = models.Owner(name=f"Tpl {EVIL}", email="tpl-owner@example.com")
+        pet = models.Pet(name="Tpl Mascota", species="gato", owner=owner)
+        db.add_all(
+            [
+                owner,
+                pet,
+                models.Appointment(
+                    pet=pet,
+                    appointment_date=datetime(DAY.year, DAY.month, DAY.day, 11, 30),
+                    reason=EVIL,
+                    status="attended",
+                ),
+            ]
+        )
+        db.commit()
+        global OWNER_ID, PET_ID
+        OWNER_ID, PET_ID = owner.id, pet.id
+    finally:
+        db.close()
+
+
+def _views():
+    return [
+        f"/schedule/daily?date={DAY.isoformat()}",
+        f"/owners/{OWNER_ID}/view",
+        f"/pets/{PET_ID}/view",
+        f"/appointments/search?from={DAY.isoformat()}&to={DAY.isoformat()}",
+        "/admin/db_details?limit=50",
+    ]
+
+
+def test_views_render_from_templates_and_escape_data():
+    for url in _views():
+        r = client.get(url)
+        assert r.status_code == 200, url
+        assert r.headers["content-type"].startswith("text/html")
+        # El CSS ya no va inline: se referencia desde /static
+        assert "<style>" not in r.text, url
+        assert "/static/css/base.css?v=" in r.text, url
+        assert EVIL not in r.text, url
+        assert "&lt;script&gt;" in r.text, url
+
+
+def test_schedule_daily_content():
+    r = client.get(f"/schedule/daily?date={DAY.isoformat()}")
+    assert "📅 Agenda del Día - 10/05/2032" in r.text
+    assert 'class="appointment-card attended"' in r.text
+    assert "🕐 11:30" in r.text and "Tpl Mascota" in r.text
+
+
+def test_static_css_is_cacheable():
+    html = client.get(f"/owners/{OWNER_ID}/view").text
+    urls = re.findall(r'href="(/static/css/[^"]+)"', html)
+    assert len(urls) == 2
+    for url in urls:
+        r = client.get(url)
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/css")
+        assert "max-age=" in r.headers["cache-control"]
+        assert "immutable" in r.headers["cache-control"]
+        etag = r.headers["etag"]
+        again = client.get(url, headers={"If-None-Match": etag})
+        assert again.status_code == 304
+
+
+def test_templates_are_compiled_once():
+    first = env.get_template("owners/view.html")
+    assert env.get_template("owners/view.html") is first
@@ -0,0 +1,115 @@
+import threading
+import time
+from datetime import date, timedelta
+
+from app.external.weather_cache import ForecastCache
+
+LOC = (-34.6037, -58.3816)
+
+
+def _forecast(n=16):
+    today = date.today()
+    return [{"date": today + timedelta(days=i), "temp_avg": 20.0 + i} for i in range(n)]
+
+
+def test_cache_hits_within_ttl():
+    calls = []
+    cache = ForecastCache(ttl_s=60)
+
+    def fetcher():
+        calls.append(1)
+        return _forecast()
+
+    first = cache.get(LOC, 7, fetcher)
+    second = cache.get(LOC, 5, fetcher)
+    assert len(first) == 7 and len(second) == 5
+    assert second[0]["date"] == date.today()
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_expires_after_ttl():
+    calls = []
+    cache = ForecastCache(ttl_s=0)
+
+    def fetcher():
+        calls.append(1)
+        return _forecast()
+
+    cache.get(LOC, 3, fetcher)
+    time.sleep(0.01)
+    cache.get(LOC, 3, fetcher)
+    assert len(calls) == 2
+
+
+def test_single_flight_concurrent_misses():
+    calls = []
+    cache = ForecastCache(ttl_s=60)
+
+    def slow_fetcher():
+        calls.append(1)
+        time.sleep(0.1)
+        return _forecast()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(LOC, 7, slow_fetcher)))
+        for _ in range(12)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(results) == 12 and all(len(r) == 7 for r in results)
+
+
+def test_snapshot_used_when_api_down(tmp_path):
+    path = str(tmp_path / "snap.json")
+    ok = ForecastCache(ttl_s=60, snapshot_path=path)
+    ok.get(LOC, 7, _forecast)
+
+    def broken():
+        raise RuntimeError("api caída")
+
+    # Proceso nuevo (sin memoria) con la API caída: sale del snapshot
+    offline = ForecastCache(ttl_s=60, snapshot_path=path)
+    res = offline.get(LOC, 7, broken)
+    assert [d["temp_avg"] for d in res] == [20.0 + i for i in range(7)]
+    assert offline.stats()["fallbacks"] == 1
+
+    empty = ForecastCache(ttl_s=60, snapshot_path=str(tmp_path / "none.json"))
+    assert empty.get(LOC, 7, broken) is None
+
+
+def test_failure_is_remembered_for_queued_callers(tmp_path):
+    path = str(tmp_path / "snap.json")
+    ForecastCache(ttl_s=60, snapshot_path=path).get(LOC, 7, _forecast)
+    calls = []
+
+    def slow_broken():
+        calls.append(1)
+        time.sleep(0.1)
+        raise TimeoutError("timeout")
+
+    # Los que esperaban el lock reciben el respaldo sin volver a descargar
+    cache = ForecastCache(ttl_s=60, snapshot_path=path, negative_ttl_s=60)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(LOC, 7, slow_broken)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(results) == 8 and all(len(r) == 7 for r in results)
+    assert cache.stats()["negative_hits"] == 7
+
+    # Vencido el TTL negativo se vuelve a intentar; un éxito lo borra
+    cache.negative_ttl_s = 0
+    time.sleep(0.01)
+    assert len(cache.get(LOC, 3, _forecast)) == 3
+    cache.negative_ttl_s = 60
+    assert cache.get(LOC, 3, slow_broken) is not None and len(calls) == 1
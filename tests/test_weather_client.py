@@ -0,0 +1,118 @@
+import asyncio
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.external.weather_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    WeatherClient,
+)
+
+
+def _payload(n=3):
+    days = [(date.today() + timedelta(days=i)).isoformat() for i in range(n)]
+    return {
+        "daily": {
+            "time": days,
+            "temperature_2m_max": [25.0] * n,
+            "temperature_2m_min": [15.0] * n,
+            "precipitation_probability_max": [30.0] * n,
+            "precipitation_sum": [1.0] * n,
+            "windspeed_10m_max": [12.0] * n,
+            "relative_humidity_2m_mean": [60.0] * n,
+        }
+    }
+
+
+@pytest.fixture
+def stub_server():
+    """Servidor HTTP local que imita a Open-Meteo."""
+    state = {"fail": 0, "requests": 0, "peers": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            state["requests"] += 1
+            state["peers"].add(self.client_address)
+            if state["fail"] > 0:
+                state["fail"] -= 1
+                body, code = b"{}", 503
+            else:
+                body, code = json.dumps(_payload()).encode(), 200
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_client_reuses_connection(stub_server):
+    client = WeatherClient(base_url=stub_server["url"], timeout_s=2)
+    first = client.fetch_daily(-34.6, -58.4, 3)
+    client.fetch_daily(-34.6, -58.4, 3)
+    assert len(first) == 3
+    assert first[0]["date"] == date.today()
+    assert first[0]["temp_avg"] == 20.0
+    # keep-alive: las dos peticiones salen por la misma conexión
+    assert stub_server["requests"] == 2
+    assert len(stub_server["peers"]) == 1
+    client.close()
+
+
+def test_async_client(stub_server):
+    client = WeatherClient(base_url=stub_server["url"], timeout_s=2)
+
+    async def run():
+        try:
+            return await client.afetch_daily(-34.6, -58.4, 3)
+        finally:
+            await client.aclose()
+
+    forecast = asyncio.run(run())
+    assert [d["precipitation_probability"] for d in forecast] == [30.0] * 3
+
+
+def test_retries_with_backoff(stub_server):
+    stub_server["fail"] = 1
+    client = WeatherClient(base_url=stub_server["url"], retries=1, backoff_s=0.01)
+    assert len(client.fetch_daily(-34.6, -58.4, 3)) == 3
+    assert stub_server["requests"] == 2
+    assert client.breaker.state == "closed"
+
+
+def test_circuit_breaker_opens_after_failures(stub_server):
+    stub_server["fail"] = 100
+    breaker = CircuitBreaker(threshold=2, reset_s=60)
+    client = WeatherClient(
+        base_url=stub_server["url"], retries=0, backoff_s=0, breaker=breaker
+    )
+    for _ in range(2):
+        with pytest.raises(Exception):
+            client.fetch_daily(-34.6, -58.4, 3)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        client.fetch_daily(-34.6, -58.4, 3)
+    # Con el circuito abierto no se llama al servidor
+    assert stub_server["requests"] == 2
+
+    # Pasado el reset (half-open) un intento exitoso lo cierra
+    breaker.reset_s = 0
+    stub_server["fail"] = 0
+    client.fetch_daily(-34.6, -58.4, 3)
+    assert breaker.state == "closed"